@@ -0,0 +1,437 @@
+import argparse
+import json
+import mmap
+import multiprocessing as mp
+import os
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+
+import config
+from board import Board, STARTING_FEN
+from bitboard import BitBoard
+from pgn import iter_pgn_texts, parse_game, move_from_san, game_to_pgn, chunks
+
+# Κλαση σκακιερας για την αναπαραγωγη των παρτιδων
+BOARD = BitBoard if config.board_backend == "bitboard" else Board
+
+# --------------------------------------------------------------------- #
+#  Αρχειο παρτιδων σε δυαδικη μορφη, με τρια αρχεια:
+#   <αρχειο>      επικεφαλιδα και μετα οι παρτιδες η μια μετα την αλλη. Καθε
+#                 παρτιδα: επικεφαλιδα (GAME), tags σε JSON, οι κινησεις ως
+#                 uint16 (οπως η encode_move) και μια packed θεση (checkpoint)
+#                 καθε interval μισες κινησεις
+#   <αρχειο>.idx  η θεση (offset) καθε παρτιδας στο αρχειο, uint64
+#   <αρχειο>.pos  ολες οι θεσεις ολων των παρτιδων σε λιγα τμηματα (segments),
+#                 το καθενα ταξινομημενο κατα κλειδι Zobrist: πληθος και μετα
+#                 κλειδια, παρτιδες και μισες κινησεις σε τρεις συνεχομενους
+#                 πινακες (για δυαδικη αναζητηση με NumPy)
+#  Ολα διαβαζονται με mmap: το ανοιγμα δεν εξαρταται απο το μεγεθος, η
+#  παρτιδα n βρισκεται σε O(1) και μια θεση σε O(log^2 N)
+# --------------------------------------------------------------------- #
+MAGIC = b"CHGAM"
+INDEX_MAGIC = b"CHGIX"
+POSITIONS_MAGIC = b"CHGPS"
+VERSION = 1
+HEADER = struct.Struct("<5sBH8x") # magic, εκδοση, interval των checkpoints
+INDEX_HEADER = struct.Struct("<5sB10x") # magic, εκδοση
+POSITIONS_HEADER = struct.Struct("<5sB10x") # magic, εκδοση
+SEGMENT = struct.Struct("<Q") # πληθος θεσεων του τμηματος
+OFFSET = struct.Struct("<Q")
+
+GAME = struct.Struct("<IBH36sH") # μισες κινησεις, αποτελεσμα, μετρητης 50 κινησεων, αρχικη θεση (packed), μηκος tags
+CHECKPOINT = struct.Struct("<36sH") # packed θεση, μετρητης 50 κινησεων
+RESULTS = ("*", "1-0", "0-1", "1/2-1/2")
+MAX_INDEXED_PLY = 0xFFFF # Οι μισες κινησεις στο .pos ειναι uint16
+
+
+class ArchivedGame(NamedTuple):
+    index: int
+    result: str
+    tags: dict[str, str]
+    start: bytes # Αρχικη θεση (Board.pack)
+    halfmove: int # Μετρητης 50 κινησεων της αρχικης θεσης
+    moves: np.ndarray # uint16, αντιγραφο (ωστε το αρχειο να κλεινει οσο υπαρχει)
+    checkpoints: int # Offset του πρωτου checkpoint στο αρχειο
+
+
+def _check_header(data: bytes, magic: bytes, path: str):
+    if data[:5] != magic or data[5] != VERSION:
+        raise ValueError(f"Μη εγκυρο αρχειο παρτιδων: {path}")
+
+
+# Η εγγραφη μιας παρτιδας και τα κλειδια Zobrist ολων των θεσεων της (μαζι με την αρχικη)
+def encode_game(start_fen: str, moves: list[int], result: str = "*", tags: Optional[dict] = None,
+                interval: Optional[int] = None) -> tuple[bytes, np.ndarray]:
+    interval = interval or config.archive_checkpoint_interval
+    board = BOARD.from_fen(start_fen)
+    start, halfmove = board.pack(), board.halfmove
+    keys = np.empty(len(moves) + 1, dtype=np.uint64)
+    keys[0] = board.key
+    checkpoints = []
+    for ply, move in enumerate(moves, 1):
+        board.push(move)
+        keys[ply] = board.key
+        if ply % interval == 0:
+            checkpoints.append(CHECKPOINT.pack(board.pack(), board.halfmove))
+    tag_bytes = json.dumps(tags, ensure_ascii=False).encode() if tags else b""
+    header = GAME.pack(len(moves), RESULTS.index(result) if result in RESULTS else 0, halfmove, start, len(tag_bytes))
+    return header + tag_bytes + np.asarray(moves, dtype="<u2").tobytes() + b"".join(checkpoints), keys
+
+
+# --------------------------------------------------------------------- #
+#  Εγγραφη (append-only). Οι θεσεις των νεων παρτιδων προστιθενται στο
+#  close ως ενα νεο τμημα του .pos
+# --------------------------------------------------------------------- #
+class GameArchiveWriter:
+    def __init__(self, path: str, interval: Optional[int] = None, index_positions: bool = True):
+        self.path = str(path)
+        self.index_positions = index_positions
+        self.file = open(self.path, "ab")
+        if self.file.tell() == 0:
+            self.interval = interval or config.archive_checkpoint_interval
+            self.file.write(HEADER.pack(MAGIC, VERSION, self.interval))
+        else:
+            with open(self.path, "rb") as f:
+                data = f.read(HEADER.size)
+            _check_header(data, MAGIC, self.path)
+            self.interval = HEADER.unpack(data)[2]
+
+        self.index = open(self.path + ".idx", "ab")
+        if self.index.tell() == 0:
+            self.index.write(INDEX_HEADER.pack(INDEX_MAGIC, VERSION))
+        else:
+            # Μια μισογραμμενη εγγραφη στο τελος (π.χ. απο διακοπη) αγνοειται
+            extra = (self.index.tell() - INDEX_HEADER.size) % OFFSET.size
+            if extra:
+                self.index.truncate(self.index.tell() - extra)
+        self.count = (self.index.tell() - INDEX_HEADER.size) // OFFSET.size
+        self.keys, self.games, self.plies = [], [], [] # Θεσεις των νεων παρτιδων (για το .pos)
+
+    # Προσθηκη εγγραφης (απο την encode_game). Επιστρεφει τον αριθμο της παρτιδας
+    def add(self, record: bytes, keys: np.ndarray) -> int:
+        number = self.count
+        self.index.write(OFFSET.pack(self.file.tell()))
+        self.file.write(record)
+        if self.index_positions:
+            keys = keys[:MAX_INDEXED_PLY + 1]
+            self.keys.append(keys)
+            self.games.append(np.full(len(keys), number, dtype=np.uint32))
+            self.plies.append(np.arange(len(keys), dtype=np.uint16))
+        self.count += 1
+        return number
+
+    def append_moves(self, start_fen: str, moves: list[int], result: str = "*", tags: Optional[dict] = None) -> int:
+        return self.add(*encode_game(start_fen, moves, result, tags, self.interval))
+
+    # Η παρτιδα της board (απο την αρχη της στοιβας αναιρεσης)
+    def append(self, board: Board, result: str = "*", tags: Optional[dict] = None) -> int:
+        fen, moves = board.snapshot()
+        return self.append_moves(fen, moves, result, tags)
+
+    def close(self):
+        self.file.close()
+        self.index.close()
+        if self.keys:
+            _append_positions(self.path + ".pos", self.keys, self.games, self.plies)
+            self.keys, self.games, self.plies = [], [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Μεγεθος ενος τμηματος του .pos σε bytes (στρογγυλεμενο σε 8, ωστε τα κλειδια να ειναι ευθυγραμμισμενα)
+def _segment_size(count: int) -> int:
+    return SEGMENT.size + (14 * count + 7) // 8 * 8
+
+# Τα ολοκληρα τμηματα του .pos: [(offset, πληθος), ...]. Ενα μισογραμμενο τμημα στο τελος αγνοειται
+def _segments(file) -> list[tuple[int, int]]:
+    size = os.fstat(file.fileno()).st_size
+    segments, offset = [], POSITIONS_HEADER.size
+    while offset + SEGMENT.size <= size:
+        file.seek(offset)
+        count = SEGMENT.unpack(file.read(SEGMENT.size))[0]
+        if offset + _segment_size(count) > size:
+            break
+        segments.append((offset, count))
+        offset += _segment_size(count)
+    return segments
+
+# (κλειδια, παρτιδες, μισες κινησεις) του τμηματος που ξεκιναει στο offset
+def _segment_arrays(data, offset: int, count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    offset += SEGMENT.size
+    return (np.frombuffer(data, dtype="<u8", count=count, offset=offset),
+            np.frombuffer(data, dtype="<u4", count=count, offset=offset + 8 * count),
+            np.frombuffer(data, dtype="<u2", count=count, offset=offset + 12 * count))
+
+# Γραφει τις νεες θεσεις στο τελος του .pos ως ενα ταξινομημενο τμημα. Τα τελευταια τμηματα που δεν ειναι
+# μεγαλυτερα απο το νεο ενωνονται μαζι του (οπως τα κρατουμενα ενος δυαδικου μετρητη): το close γραφει μονο
+# την ουρα του αρχειου, καθε θεση ξαναγραφεται O(log N) φορες συνολικα και τα τμηματα μενουν O(log N)
+def _append_positions(path: str, keys: list[np.ndarray], games: list[np.ndarray], plies: list[np.ndarray]):
+    with open(path, "a+b") as f:
+        if f.tell() == 0:
+            f.write(POSITIONS_HEADER.pack(POSITIONS_MAGIC, VERSION))
+            segments = []
+        else:
+            f.seek(0)
+            _check_header(f.read(POSITIONS_HEADER.size), POSITIONS_MAGIC, path)
+            segments = _segments(f)
+        end = segments[-1][0] + _segment_size(segments[-1][1]) if segments else POSITIONS_HEADER.size
+        count = sum(map(len, keys))
+        while segments and segments[-1][1] <= count:
+            offset, size = segments.pop()
+            f.seek(offset)
+            old = _segment_arrays(f.read(_segment_size(size)), 0, size)
+            # Τα παλια τμηματα μπαινουν μπροστα, ωστε οι ισες θεσεις να μενουν σε σειρα παρτιδας
+            keys, games, plies = [old[0]] + keys, [old[1]] + games, [old[2]] + plies
+            count += size
+            end = offset
+        keys, games, plies = np.concatenate(keys), np.concatenate(games), np.concatenate(plies)
+        # Το timsort του NumPy ενωνει τις ηδη ταξινομημενες σειρες (k-way merge)
+        order = np.argsort(keys, kind="stable")
+        f.truncate(end)
+        f.write(SEGMENT.pack(count))
+        f.write(keys[order].astype("<u8").tobytes())
+        f.write(games[order].astype("<u4").tobytes())
+        f.write(plies[order].astype("<u2").tobytes())
+        f.write(bytes(-14 * count % 8))
+
+
+# --------------------------------------------------------------------- #
+#  Μετατροπη PGN σε αρχειο παρτιδων (σε πολλες διεργασιες, οπως το book.py)
+# --------------------------------------------------------------------- #
+# Εγγραφες για ενα κομματι παρτιδων. Μια παρτιδα με μη νομιμη κινηση κραταει τις κινησεις πριν απο αυτη
+def _encode_chunk(texts: list[str], interval: int) -> list[tuple[bytes, np.ndarray, bool]]:
+    records = []
+    for text in texts:
+        game = parse_game(text)
+        try:
+            board = BOARD.from_fen(game.start_fen)
+        except ValueError:
+            records.append((None, None, False))
+            continue
+        moves, complete = [], True
+        for san in game.moves:
+            try:
+                move = move_from_san(board, san)
+            except ValueError:
+                complete = False
+                break
+            board.push(move)
+            moves.append(move)
+        tags = {name: value for name, value in game.headers.items() if name != "Result"}
+        records.append((*encode_game(game.start_fen, moves, game.result, tags, interval), complete))
+    return records
+
+# Επιστρεφει (παρτιδες που γραφτηκαν, παρτιδες με λαθος)
+def import_pgn(texts: Iterable[str], path: str, workers: Optional[int] = None, chunk_size: int = 500) -> tuple[int, int]:
+    workers = workers or config.search_workers
+    written = errors = 0
+    with GameArchiveWriter(path) as writer:
+        def add(records):
+            nonlocal written, errors
+            for record, keys, complete in records:
+                if record is not None:
+                    writer.add(record, keys)
+                    written += 1
+                errors += not complete
+
+        if workers == 1:
+            for chunk in chunks(texts, chunk_size):
+                add(_encode_chunk(chunk, writer.interval))
+        else:
+            with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn")) as pool:
+                pending = deque()
+                for chunk in chunks(texts, chunk_size):
+                    pending.append(pool.submit(_encode_chunk, chunk, writer.interval))
+                    if len(pending) >= workers * 2:
+                        add(pending.popleft().result())
+                while pending:
+                    add(pending.popleft().result())
+    return written, errors
+
+
+# --------------------------------------------------------------------- #
+#  Αναγνωση με mmap
+# --------------------------------------------------------------------- #
+def _map(path: str, header: struct.Struct, magic: bytes):
+    file = open(path, "rb")
+    if os.fstat(file.fileno()).st_size < header.size:
+        file.close()
+        raise ValueError(f"Μη εγκυρο αρχειο παρτιδων: {path}")
+    data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    _check_header(data[:header.size], magic, path)
+    return file, data
+
+
+# Το .pos: τμηματα (κλειδι, παρτιδα, μιση κινηση) ταξινομημενα κατα κλειδι
+class PositionIndex:
+    def __init__(self, path: str):
+        self.file, self.map = _map(path, POSITIONS_HEADER, POSITIONS_MAGIC)
+        self.segments = [_segment_arrays(self.map, offset, count) for offset, count in _segments(self.file)]
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys, _, _ in self.segments)
+
+    # Ολες οι εμφανισεις της θεσης με κλειδι key: [(παρτιδα, μιση κινηση), ...] σε σειρα παρτιδας
+    def find(self, key: int) -> list[tuple[int, int]]:
+        key = np.uint64(key)
+        found = []
+        for keys, games, plies in self.segments:
+            low, high = np.searchsorted(keys, key, "left"), np.searchsorted(keys, key, "right")
+            found.extend(zip(games[low:high].tolist(), plies[low:high].tolist()))
+        return found
+
+    def close(self):
+        # Οι πινακες δειχνουν στο mmap: πρεπει να φυγουν πριν κλεισει
+        self.segments = None
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GameArchive:
+    def __init__(self, path: str):
+        self.path = str(path)
+        self.file, self.map = _map(self.path, HEADER, MAGIC)
+        self.interval = HEADER.unpack_from(self.map)[2]
+        self.index_file, self.index_map = _map(self.path + ".idx", INDEX_HEADER, INDEX_MAGIC)
+        count = (len(self.index_map) - INDEX_HEADER.size) // OFFSET.size
+        self.offsets = np.frombuffer(self.index_map, dtype="<u8", count=count, offset=INDEX_HEADER.size)
+        self.positions = PositionIndex(self.path + ".pos") if os.path.exists(self.path + ".pos") else None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def game(self, n: int) -> ArchivedGame:
+        if n < 0:
+            n += len(self)
+        if not 0 <= n < len(self):
+            raise IndexError(n)
+        offset = int(self.offsets[n])
+        plies, result, halfmove, start, tags_length = GAME.unpack_from(self.map, offset)
+        offset += GAME.size
+        tags = json.loads(self.map[offset:offset + tags_length]) if tags_length else {}
+        offset += tags_length
+        # Αντιγραφο: μια οψη πανω στο mmap θα εμποδιζε το close (BufferError) οσο ζει το ArchivedGame
+        moves = np.frombuffer(self.map, dtype="<u2", count=plies, offset=offset).copy()
+        return ArchivedGame(n, RESULTS[result], tags, start, halfmove, moves, offset + 2 * plies)
+
+    def moves(self, n: int) -> list[int]:
+        return self.game(n).moves.tolist()
+
+    # Η θεση μετα απο ply μισες κινησεις της παρτιδας n (ply=None: η τελικη θεση). Ξεκιναει απο το
+    # πλησιεστερο checkpoint, αρα παιζει το πολυ interval - 1 κινησεις. Η στοιβα αναιρεσης (και οι
+    # επαναληψεις) ξεκινανε απο εκει· για ολη την παρτιδα βλ. replay
+    def board(self, n: int, ply: Optional[int] = None) -> Board:
+        game = self.game(n)
+        plies = len(game.moves)
+        ply = plies if ply is None else ply + plies + 1 if ply < 0 else ply
+        if not 0 <= ply <= plies:
+            raise IndexError(ply)
+        checkpoint = ply // self.interval
+        if checkpoint:
+            data, halfmove = CHECKPOINT.unpack_from(self.map, game.checkpoints + (checkpoint - 1) * CHECKPOINT.size)
+        else:
+            data, halfmove = game.start, game.halfmove
+        board = BOARD.unpack(data)
+        board.halfmove = halfmove
+        for move in game.moves[checkpoint * self.interval:ply].tolist():
+            board.push(move)
+        return board
+
+    # Η παρτιδα απο την αρχη της, με ολη τη στοιβα αναιρεσης (για PGN, GUI)
+    def replay(self, n: int) -> Board:
+        game = self.game(n)
+        board = BOARD.unpack(game.start)
+        board.halfmove = game.halfmove
+        for move in game.moves.tolist():
+            board.push(move)
+        return board
+
+    def pgn(self, n: int) -> str:
+        game = self.game(n)
+        return game_to_pgn(self.replay(n), game.tags or None, None if game.result == "*" else game.result)
+
+    # Παρτιδες και μισες κινησεις οπου εμφανιζεται η θεση (Board ή κλειδι Zobrist)
+    def find(self, position: Union[Board, int]) -> list[tuple[int, int]]:
+        if self.positions is None:
+            return []
+        return self.positions.find(position.key if isinstance(position, Board) else position)
+
+    def close(self):
+        self.offsets = None
+        if self.positions:
+            self.positions.close()
+        self.index_map.close()
+        self.index_file.close()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --------------------------------------------------------------------- #
+#  python archive.py import games.pgn games.chga [--workers 4]
+#  python archive.py show games.chga 12 [--ply 30] [--pgn]
+#  python archive.py find games.chga [--fen ...]
+# --------------------------------------------------------------------- #
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Αρχειο παρτιδων με ευρετηρια")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="Προσθηκη των παρτιδων ενος αρχειου PGN")
+    p.add_argument("pgn")
+    p.add_argument("archive")
+    p.add_argument("--workers", type=int, default=config.search_workers)
+
+    p = sub.add_parser("show", help="Θεση (FEN) ή PGN μιας παρτιδας")
+    p.add_argument("archive")
+    p.add_argument("game", type=int, help="Αριθμος παρτιδας (απο 0)")
+    p.add_argument("--ply", type=int, help="Μισες κινησεις απο την αρχη (αλλιως η τελικη θεση)")
+    p.add_argument("--pgn", action="store_true")
+
+    p = sub.add_parser("find", help="Παρτιδες οπου εμφανιζεται μια θεση")
+    p.add_argument("archive")
+    p.add_argument("--fen", default=STARTING_FEN)
+    p.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args(argv)
+    if args.command == "import":
+        start = time.perf_counter()
+        written, errors = import_pgn(iter_pgn_texts(args.pgn), args.archive, args.workers)
+        print(f"{written} παρτιδες στο {args.archive} ({errors} με μη νομιμη κινηση) σε {time.perf_counter() - start:.1f}s")
+        return 0
+
+    start = time.perf_counter()
+    with GameArchive(args.archive) as archive:
+        if args.command == "show":
+            print(archive.pgn(args.game) if args.pgn else archive.board(args.game, args.ply).fen())
+        else:
+            found = archive.find(BOARD.from_fen(args.fen).key)
+            for game, ply in found[:args.limit]:
+                print(f"παρτιδα {game}, μιση κινηση {ply}")
+            print(f"{len(found)} εμφανισεις σε {len(archive)} παρτιδες")
+        print(f"({1000 * (time.perf_counter() - start):.1f} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
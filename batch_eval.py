@@ -0,0 +1,170 @@
+import numpy as np
+
+from board import (Board, Color, PieceType, PIECE_KINDS, PIECE_INDEX,
+                   KNIGHT_DELTAS, DIAGONAL_DIRECTIONS, STRAIGHT_DIRECTIONS)
+from evaluation import (MOBILITY_WEIGHTS, KING_SHIELD_BONUS, KING_ZONE_PENALTY, KING_ZONE_ATTACKERS,
+                        piece_square_value)
+
+# --------------------------------------------------------------------- #
+#  Αξιολογηση πολλων θεσεων μαζι με NumPy.
+#  Καθε θεση ειναι μια γραμμη ενος πινακα (N, 64) με κωδικους κομματιων:
+#  0 = αδειο, 1-12 = PIECE_INDEX + 1 (λευκα 1-6, μαυρα 7-12).
+#  Οι οροι ειναι οι ιδιοι με την evaluation.evaluate και τα αποτελεσματα
+#  συμπιπτουν ακριβως.
+# --------------------------------------------------------------------- #
+EMPTY = 0
+OFF_BOARD = 13 # Κωδικος για τετραγωνα εκτος σκακιερας (στη στηλη 64 του πινακα με περιθωριο)
+
+# Ποσες θεσεις επεξεργαζονται μαζι (περιοριζει τη μνημη των ενδιαμεσων πινακων)
+CHUNK_SIZE = 4096
+
+def _code(color: Color, kind: PieceType) -> int:
+    return PIECE_INDEX[(color, kind)] + 1
+
+
+# --------------------------------------------------------------------- #
+#  Προυπολογισμενοι πινακες
+# --------------------------------------------------------------------- #
+# Υλικο + θεση για καθε κωδικο και τετραγωνο, με προσημο (+ λευκα, - μαυρα)
+MATERIAL_PST = np.zeros((14, 64), dtype=np.int32)
+for _color, _sign in ((Color.WHITE, 1), (Color.BLACK, -1)):
+    for _kind in PIECE_KINDS:
+        for _s in range(64):
+            MATERIAL_PST[_code(_color, _kind), _s] = _sign * piece_square_value(_color, _kind, _s // 8, _s % 8)
+
+# Βαρος κινητικοτητας για καθε κωδικο (με προσημο)
+MOBILITY = np.zeros(14, dtype=np.int32)
+for _kind, _weight in MOBILITY_WEIGHTS.items():
+    MOBILITY[_code(Color.WHITE, _kind)] = _weight
+    MOBILITY[_code(Color.BLACK, _kind)] = -_weight
+
+# Για καθε τετραγωνο: τα τετραγωνα-στοχοι ενος βηματος (64 = εκτος σκακιερας)
+def _step_table(deltas) -> np.ndarray:
+    table = np.full((64, len(deltas)), 64, dtype=np.intp)
+    for s in range(64):
+        r, c = divmod(s, 8)
+        for i, (delta_row, delta_col) in enumerate(deltas):
+            if 0 <= r + delta_row <= 7 and 0 <= c + delta_col <= 7:
+                table[s, i] = (r + delta_row) * 8 + c + delta_col
+    return table
+
+# Για καθε κατευθυνση: (64, 7) τετραγωνα της ακτινας με τη σειρα, συμπληρωμενα με 64
+def _ray_table(delta_row: int, delta_col: int) -> np.ndarray:
+    return _step_table([(delta_row * k, delta_col * k) for k in range(1, 8)])
+
+KNIGHT_TARGETS = _step_table(KNIGHT_DELTAS)
+# (64, 8, 7): οι 4 διαγωνιες και μετα οι 4 ευθειες κατευθυνσεις
+RAYS = np.stack([_ray_table(*d) for d in DIAGONAL_DIRECTIONS + STRAIGHT_DIRECTIONS], axis=1)
+
+# Ποιες κατευθυνσεις χρησιμοποιει καθε κωδικος και ποιοι κωδικοι ειναι ιπποι
+DIRECTIONS = np.zeros((14, 8), dtype=bool)
+IS_KNIGHT = np.zeros(14, dtype=bool)
+for _color in (Color.WHITE, Color.BLACK):
+    DIRECTIONS[_code(_color, PieceType.BISHOP), :4] = True
+    DIRECTIONS[_code(_color, PieceType.ROOK), 4:] = True
+    DIRECTIONS[_code(_color, PieceType.QUEEN), :] = True
+    IS_KNIGHT[_code(_color, PieceType.KNIGHT)] = True
+
+# Δικοι κωδικοι για καθε χρωμα (γραμμη 0 λευκα, 1 μαυρα)
+OWN = np.zeros((2, 14), dtype=bool)
+OWN[0, 1:7] = True
+OWN[1, 7:13] = True
+
+# Τα 3 τετραγωνα μπροστα απο τον βασιλια για καθε χρωμα (64 = εκτος σκακιερας)
+KING_SHIELD = {
+    Color.WHITE: _step_table([(-1, -1), (-1, 0), (-1, 1)]),
+    Color.BLACK: _step_table([(1, -1), (1, 0), (1, 1)]),
+}
+
+# Ζωνη βασιλια: τετραγωνα σε αποσταση ως 2 (μαζι με το ιδιο το τετραγωνο)
+KING_ZONE = np.zeros((64, 64), dtype=bool)
+for _s in range(64):
+    for _t in range(64):
+        KING_ZONE[_s, _t] = max(abs(_s // 8 - _t // 8), abs(_s % 8 - _t % 8)) <= 2
+
+
+# --------------------------------------------------------------------- #
+#  Μετατροπη σκακιερων σε πινακες
+# --------------------------------------------------------------------- #
+# Επιστρεφει (κωδικοι (N, 64) int8, ποιος παιζει (N,) bool: True = μαυρα)
+def encode_boards(boards: list[Board]) -> tuple[np.ndarray, np.ndarray]:
+    codes = np.zeros((len(boards), 64), dtype=np.int8)
+    black_to_move = np.zeros(len(boards), dtype=bool)
+    for i, board in enumerate(boards):
+        row = codes[i]
+        for r in range(8):
+            for c, piece in enumerate(board.sq[r]):
+                if piece:
+                    row[r * 8 + c] = PIECE_INDEX[(piece.color, piece.kind)] + 1
+        black_to_move[i] = board.turn is Color.BLACK
+    return codes, black_to_move
+
+# Τα 12 επιπεδα (N, 12, 64) ενος πινακα κωδικων: ενα ανα χρωμα-τυπο
+def planes(codes: np.ndarray) -> np.ndarray:
+    return codes[:, None, :] == np.arange(1, 13, dtype=np.int8)[None, :, None]
+
+
+# --------------------------------------------------------------------- #
+#  Οροι αξιολογησης (ολοι απο την πλευρα των λευκων, σχημα (N,))
+# --------------------------------------------------------------------- #
+def material_pst(codes: np.ndarray) -> np.ndarray:
+    return MATERIAL_PST[codes, np.arange(64)].sum(axis=1)
+
+# Κινητικοτητα: υπολογιζεται μονο για τα τετραγωνα που εχουν ιππο, αξιωματικο, πυργο ή βασιλισσα.
+# Για καθε τετοιο κομματι μαζευονται τα τετραγωνα-στοχοι του (ακτινες ή βηματα ιππου) σε ενα πινακα
+# και μετρανε οσα φτανονται (ολα τα προηγουμενα της ακτινας αδεια) και δεν εχουν δικο του κομματι
+def mobility(codes: np.ndarray) -> np.ndarray:
+    padded = np.concatenate([codes, np.full((len(codes), 1), OFF_BOARD, dtype=codes.dtype)], axis=1)
+    positions, squares = np.nonzero(MOBILITY[codes])
+    pieces = codes[positions, squares]
+    own = OWN[(pieces > 6).astype(np.intp)] # (M, 14): ποιοι κωδικοι ειναι δικοι του καθε κομματιου
+
+    # Ιπποι
+    seen = padded[positions[:, None], KNIGHT_TARGETS[squares]] # (M, 8)
+    free = (seen != OFF_BOARD) & ~np.take_along_axis(own, seen.astype(np.intp), axis=1)
+    counts = np.where(IS_KNIGHT[pieces], free.sum(axis=1), 0)
+
+    # Κομματια που γλιστρανε: (M, 8 κατευθυνσεις, 7 βηματα)
+    seen = padded[positions[:, None, None], RAYS[squares]]
+    blocked = np.logical_or.accumulate(seen != EMPTY, axis=2)
+    reachable = np.ones_like(blocked)
+    reachable[:, :, 1:] = ~blocked[:, :, :-1]
+    own_seen = np.take_along_axis(own, seen.reshape(len(seen), -1).astype(np.intp), axis=1).reshape(seen.shape)
+    free = reachable & (seen != OFF_BOARD) & ~own_seen
+    counts += (free.sum(axis=2) * DIRECTIONS[pieces]).sum(axis=1)
+
+    return np.bincount(positions, weights=MOBILITY[pieces] * counts, minlength=len(codes)).astype(np.int32)
+
+# Ασφαλεια βασιλια ενος χρωματος απο τη δικη του πλευρα (0 αν δεν υπαρχει βασιλιας)
+def king_safety(codes: np.ndarray, color: Color) -> np.ndarray:
+    king_code = _code(color, PieceType.KING)
+    is_king = codes == king_code
+    has_king = is_king.any(axis=1)
+    king_square = is_king.argmax(axis=1)
+    rows = np.arange(len(codes))
+
+    padded = np.concatenate([codes, np.full((len(codes), 1), OFF_BOARD, dtype=codes.dtype)], axis=1)
+    shield = padded[rows[:, None], KING_SHIELD[color][king_square]] == _code(color, PieceType.PAWN)
+
+    attackers = np.isin(codes, [_code(color.opposite, kind) for kind in KING_ZONE_ATTACKERS])
+    near = (attackers & KING_ZONE[king_square]).sum(axis=1)
+
+    score = KING_SHIELD_BONUS * shield.sum(axis=1) - KING_ZONE_PENALTY * near
+    return np.where(has_king, score, 0)
+
+
+# --------------------------------------------------------------------- #
+#  Συνολικη αξιολογηση (ιδια με evaluation.evaluate): απο την πλευρα
+#  του παικτη που παιζει, σχημα (N,) int32
+# --------------------------------------------------------------------- #
+def evaluate_codes(codes: np.ndarray, black_to_move: np.ndarray) -> np.ndarray:
+    scores = np.empty(len(codes), dtype=np.int32)
+    for start in range(0, len(codes), CHUNK_SIZE):
+        chunk = codes[start:start + CHUNK_SIZE]
+        white = (material_pst(chunk) + mobility(chunk)
+                 + king_safety(chunk, Color.WHITE) - king_safety(chunk, Color.BLACK))
+        scores[start:start + CHUNK_SIZE] = np.where(black_to_move[start:start + CHUNK_SIZE], -white, white)
+    return scores
+
+def evaluate_batch(boards: list[Board]) -> np.ndarray:
+    return evaluate_codes(*encode_boards(boards))
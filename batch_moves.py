@@ -0,0 +1,191 @@
+import numpy as np
+
+from board import Board, KING_DELTAS
+from batch_eval import (EMPTY, OFF_BOARD, CHUNK_SIZE, KNIGHT_TARGETS, RAYS, DIRECTIONS, IS_KNIGHT, OWN,
+                        encode_boards, _step_table)
+
+# --------------------------------------------------------------------- #
+#  Νομιμες κινησεις πολλων θεσεων μαζι με NumPy.
+#  Οι θεσεις ειναι οι ιδιοι πινακες (N, 64) κωδικων με το batch_eval.
+#  Για καθε θεση και τετραγωνο-αφετηρια επιστρεφεται ενα uint64 με ενα
+#  bit ανα προορισμο (bit t = τετραγωνο t), μαζι με το πληθος των
+#  νομιμων κινησεων καθε θεσης. Οι κανονες ειναι οι ιδιοι με την
+#  Board.generate_legal_moves (σαχ, καρφωματα, χωρις ροκε/en passant/
+#  προαγωγη/διπλο βημα) και τα αποτελεσματα συμπιπτουν ακριβως.
+# --------------------------------------------------------------------- #
+ALL = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Ενα bit ανα τετραγωνο (το 64 = εκτος σκακιερας δεν εχει bit)
+BIT = np.zeros(65, dtype=np.uint64)
+BIT[:64] = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64))
+
+# OR των bits ενος πινακα τετραγωνων στον τελευταιο αξονα
+def _or_bits(squares: np.ndarray) -> np.ndarray:
+    return np.bitwise_or.reduce(BIT[squares], axis=-1)
+
+
+# --------------------------------------------------------------------- #
+#  Προυπολογισμενοι πινακες
+# --------------------------------------------------------------------- #
+KNIGHT_BITS = _or_bits(KNIGHT_TARGETS)
+KING_BITS = _or_bits(_step_table(KING_DELTAS))
+
+# Πιονια (γραμμη 0 λευκα που ανεβαινουν, 1 μαυρα που κατεβαινουν): τα δυο διαγωνια τετραγωνα που απειλουν
+# και το τετραγωνο μπροστα τους (64 = εκτος σκακιερας)
+PAWN_ATTACK_BITS = np.stack([_or_bits(_step_table([(-1, -1), (-1, 1)])), _or_bits(_step_table([(1, -1), (1, 1)]))])
+PAWN_PUSH = np.stack([_step_table([(-1, 0)])[:, 0], _step_table([(1, 0)])[:, 0]])
+
+# (64, 8, 7): τα bits της ακτινας μεχρι και το βημα i (για τους αποκλεισμους σαχ και τις γραμμες καρφωματος)
+RAY_BITS = np.bitwise_or.accumulate(BIT[RAYS], axis=2)
+
+IS_PAWN = np.zeros(14, dtype=bool)
+IS_PAWN[[1, 7]] = True
+IS_KING = np.zeros(14, dtype=bool)
+IS_KING[[6, 12]] = True
+IS_SLIDER = DIRECTIONS.any(axis=1)
+
+
+# --------------------------------------------------------------------- #
+#  Βοηθητικα
+# --------------------------------------------------------------------- #
+# Πληθος bits καθε uint64 (SWAR, ιδιο αποτελεσμα με το int.bit_count)
+def popcount(bits: np.ndarray) -> np.ndarray:
+    bits = bits - ((bits >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    bits = (bits & np.uint64(0x3333333333333333)) + ((bits >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    bits = (bits + (bits >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((bits * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int32)
+
+# (N, 64) bool -> (N,) uint64
+def _pack(mask: np.ndarray) -> np.ndarray:
+    return np.packbits(mask, axis=1, bitorder="little").view("<u8")[:, 0].astype(np.uint64)
+
+# OR των bits καθε θεσης (οι positions ειναι ταξινομημενες, οπως τις δινει το np.nonzero)
+def _per_position(positions: np.ndarray, bits: np.ndarray, count: int) -> np.ndarray:
+    result = np.zeros(count, dtype=np.uint64)
+    if len(positions):
+        starts = np.flatnonzero(np.r_[True, positions[1:] != positions[:-1]])
+        result[positions[starts]] = np.bitwise_or.reduceat(bits, starts)
+    return result
+
+# Τα τετραγωνα που απειλει καθε κομματι (M,) uint64. Οι ακτινες σταματουν στο πρωτο κομματι (μαζι με αυτο),
+# οποιου χρωματος κι αν ειναι· τα δικα του κομματια αφαιρουνται αργοτερα απο τους προορισμους
+def _attacks(padded: np.ndarray, positions: np.ndarray, squares: np.ndarray, pieces: np.ndarray) -> np.ndarray:
+    attacks = np.where(IS_KNIGHT[pieces], KNIGHT_BITS[squares], np.uint64(0))
+    attacks |= np.where(IS_KING[pieces], KING_BITS[squares], np.uint64(0))
+    attacks |= np.where(IS_PAWN[pieces], PAWN_ATTACK_BITS[(pieces > 6).astype(np.intp), squares], np.uint64(0))
+
+    sliders = np.flatnonzero(IS_SLIDER[pieces])
+    if len(sliders):
+        slider_squares = squares[sliders]
+        seen = padded[positions[sliders, None, None], RAYS[slider_squares]] # (S, 8, 7)
+        # Το πρωτο μη αδειο τετραγωνο καθε ακτινας (το OFF_BOARD μετραει, αλλα δεν εχει bit)
+        blocked = seen != EMPTY
+        last = np.where(blocked.any(axis=2), blocked.argmax(axis=2), 6)
+        rays = RAY_BITS[slider_squares[:, None], np.arange(8), last]
+        rays = np.where(DIRECTIONS[pieces[sliders]], rays, np.uint64(0))
+        attacks[sliders] |= np.bitwise_or.reduce(rays, axis=1)
+    return attacks
+
+
+# --------------------------------------------------------------------- #
+#  Νομιμες κινησεις
+# --------------------------------------------------------------------- #
+def _legal_chunk(codes: np.ndarray, black_to_move: np.ndarray) -> np.ndarray:
+    count = len(codes)
+    rows = np.arange(count)
+    side = black_to_move.astype(np.intp) # 0 λευκα, 1 μαυρα
+    codes = codes.astype(np.intp)
+    padded = np.concatenate([codes, np.full((count, 1), OFF_BOARD, dtype=np.intp)], axis=1)
+
+    own = OWN[side[:, None], codes]
+    enemy = OWN[1 - side[:, None], codes]
+    own_bits, enemy_bits = _pack(own), _pack(enemy)
+
+    is_king = codes == np.where(black_to_move, 12, 6)[:, None]
+    has_king = is_king.any(axis=1)
+    king = is_king.argmax(axis=1)
+
+    # Ψευδο-νομιμοι προορισμοι των δικων κομματιων
+    positions, squares = np.nonzero(own)
+    pieces = codes[positions, squares]
+    attacks = _attacks(padded, positions, squares, pieces)
+    targets = attacks & ~own_bits[positions]
+    pawns = IS_PAWN[pieces]
+    push = PAWN_PUSH[side[positions], squares]
+    pushes = np.where(padded[positions, push] == EMPTY, BIT[push], np.uint64(0))
+    targets = np.where(pawns, (attacks & enemy_bits[positions]) | pushes, targets)
+
+    # Τετραγωνα που απειλει ο αντιπαλος με τον βασιλια μας εκτος σκακιερας (ωστε οι ακτινες να περνουν απο τη θεση του)
+    without_king = padded.copy()
+    without_king[rows[has_king], king[has_king]] = EMPTY
+    enemy_positions, enemy_squares = np.nonzero(enemy)
+    threatened = _per_position(enemy_positions, _attacks(without_king, enemy_positions, enemy_squares,
+                                                         codes[enemy_positions, enemy_squares]), count)
+
+    # Ακτινες απο τον βασιλια: το πρωτο κομματι ειναι επιτιθεμενος (αντιπαλος αξιωματικος/πυργος/βασιλισσα
+    # της κατευθυνσης) ή, αν ειναι δικο μας και το δευτερο ειναι τετοιος επιτιθεμενος, καρφωμενο
+    seen = padded[rows[:, None, None], RAYS[king]] # (N, 8, 7)
+    occupied = (seen != EMPTY) & (seen != OFF_BOARD)
+    first = occupied.argmax(axis=2)
+    has_first = occupied.any(axis=2) & has_king[:, None]
+    first_code = np.take_along_axis(seen, first[:, :, None], axis=2)[:, :, 0]
+    behind = occupied & (np.arange(7) > first[:, :, None])
+    second = behind.argmax(axis=2)
+    second_code = np.take_along_axis(seen, second[:, :, None], axis=2)[:, :, 0]
+    directions = np.arange(8)
+    enemy_side = (1 - side)[:, None]
+
+    checking = has_first & OWN[enemy_side, first_code] & DIRECTIONS[first_code, directions]
+    pinning = (has_first & OWN[side[:, None], first_code] & behind.any(axis=2)
+               & OWN[enemy_side, second_code] & DIRECTIONS[second_code, directions])
+
+    # Σαχ απο ιππους, πιονια (και βασιλια, οπως μετραει και η attackers_of σε ακυρες θεσεις): ενα αντιπαλο
+    # πιονι απειλει τον βασιλια απο τα τετραγωνα που θα απειλουσε ενα δικο μας πιονι στη θεση του βασιλια
+    knights = _pack(IS_KNIGHT[codes] & enemy)
+    enemy_pawns = _pack(IS_PAWN[codes] & enemy)
+    enemy_king = _pack(IS_KING[codes] & enemy)
+    leapers = ((KNIGHT_BITS[king] & knights) | (PAWN_ATTACK_BITS[side, king] & enemy_pawns)
+               | (KING_BITS[king] & enemy_king))
+    leapers = np.where(has_king, leapers, np.uint64(0))
+    blocks = np.where(checking, RAY_BITS[king[:, None], directions, first], np.uint64(0))
+    checks = checking.sum(axis=1) + popcount(leapers)
+
+    # Απλο σαχ: μονο φαγωμα του επιτιθεμενου ή παρεμβολη· διπλο σαχ: μονο ο βασιλιας
+    evasions = np.where(checks == 0, ALL, np.where(checks == 1, np.bitwise_or.reduce(blocks, axis=1) | leapers,
+                                                   np.uint64(0)))
+
+    # Καρφωμενο κομματι: μονο πανω στην ακτινα βασιλια - επιτιθεμενου
+    lines = np.full((count, 64), ALL, dtype=np.uint64)
+    pin_positions, pin_directions = np.nonzero(pinning)
+    pinned = RAYS[king[pin_positions], pin_directions, first[pin_positions, pin_directions]]
+    lines[pin_positions, pinned] = RAY_BITS[king[pin_positions], pin_directions, 6]
+
+    kings = IS_KING[pieces]
+    legal = np.where(kings, targets & ~threatened[positions],
+                     targets & evasions[positions] & lines[positions, squares])
+
+    masks = np.zeros((count, 64), dtype=np.uint64)
+    masks[positions, squares] = legal
+    return masks
+
+# Επιστρεφει (bits προορισμων (N, 64) uint64 ανα θεση και αφετηρια, πληθος νομιμων κινησεων (N,) int32)
+def legal_masks(codes: np.ndarray, black_to_move: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    masks = np.empty((len(codes), 64), dtype=np.uint64)
+    for start in range(0, len(codes), CHUNK_SIZE):
+        masks[start:start + CHUNK_SIZE] = _legal_chunk(codes[start:start + CHUNK_SIZE],
+                                                       black_to_move[start:start + CHUNK_SIZE])
+    return masks, popcount(masks).sum(axis=1, dtype=np.int32)
+
+def legal_masks_batch(boards: list[Board]) -> tuple[np.ndarray, np.ndarray]:
+    return legal_masks(*encode_boards(boards))
+
+# Οι κινησεις μιας γραμμης (64,) του legal_masks ως ακεραιοι (βλ. board.encode_move)
+def moves_from_masks(masks: np.ndarray) -> list[int]:
+    moves = []
+    for source in np.flatnonzero(masks):
+        bits = int(masks[source])
+        while bits:
+            low = bits & -bits
+            moves.append(int(source) | (low.bit_length() - 1) << 6)
+            bits ^= low
+    return moves
@@ -0,0 +1,368 @@
+from board import Board, Color, PieceType, Piece, PIECE_INDEX
+
+# --------------------------------------------------------------------- #
+#  Bitboards: καθε τετραγωνο ειναι ενα bit ενος ακεραιου 64 bit
+#  (bit = γραμμη*8 + στηλη, η γραμμη 0 ειναι η πλευρα των μαυρων)
+# --------------------------------------------------------------------- #
+FULL = (1 << 64) - 1
+
+# Μετατροπη τετραγωνου (γραμμη, στηλη) σε δεικτη bit
+def square_index(row: int, col: int) -> int:
+    return row * 8 + col
+
+# Επιστρεφει τους δεικτες ολων των ενεργων bits ενος bitboard
+def iter_bits(bb: int):
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+# (γραμμη, στηλη) καθε τετραγωνου, ετοιμα ωστε να μη φτιαχνεται νεο tuple με divmod σε καθε κινηση
+SQUARES = [divmod(s, 8) for s in range(64)]
+
+# Τα τετραγωνα (γραμμη, στηλη) των ενεργων bits, χωρις generator (το πιο ζεστο σημειο της legal_moves)
+def bit_squares(bb: int) -> list[tuple[int, int]]:
+    squares = []
+    while bb:
+        low = bb & -bb
+        squares.append(SQUARES[low.bit_length() - 1])
+        bb ^= low
+    return squares
+
+
+# --------------------------------------------------------------------- #
+#  Προυπολογισμενοι πινακες επιθεσεων
+# --------------------------------------------------------------------- #
+# Πινακας επιθεσεων για κομματια που "πηδανε" (ιππος, βασιλιας, πιονι)
+def _leaper_table(deltas) -> list[int]:
+    table = []
+    for s in range(64):
+        r, c = divmod(s, 8)
+        mask = 0
+        for delta_row, delta_col in deltas:
+            new_row, new_col = r + delta_row, c + delta_col
+            if 0 <= new_row <= 7 and 0 <= new_col <= 7:
+                mask |= 1 << square_index(new_row, new_col)
+        table.append(mask)
+    return table
+
+KNIGHT_ATTACKS = _leaper_table([(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_ATTACKS = _leaper_table([(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)])
+
+# Τετραγωνα που απειλει ενα πιονι καθε χρωματος απο καθε θεση. Οι πινακες ανα χρωμα ειναι λιστες με
+# δεικτη το "color is Color.BLACK" (0 λευκα, 1 μαυρα): το hash ενος Enum ειναι κληση σε Python και
+# θα κοστιζε περισσοτερο απο την ιδια την πραξη με τα bits
+PAWN_ATTACKS = [_leaper_table([(-1, -1), (-1, 1)]), _leaper_table([(1, -1), (1, 1)])]
+
+# Το τετραγωνο μπροστα απο καθε πιονι (ενα βημα, 0 στην τελευταια γραμμη)
+PAWN_PUSHES = [_leaper_table([(-1, 0)]), _leaper_table([(1, 0)])]
+
+BISHOP_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+ROOK_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Ακτινες (χωρις το αρχικο τετραγωνο) για καθε κατευθυνση και τετραγωνο
+def _ray_table(delta_row: int, delta_col: int) -> list[int]:
+    table = []
+    for s in range(64):
+        r, c = divmod(s, 8)
+        mask = 0
+        new_row, new_col = r + delta_row, c + delta_col
+        while 0 <= new_row <= 7 and 0 <= new_col <= 7:
+            mask |= 1 << square_index(new_row, new_col)
+            new_row += delta_row
+            new_col += delta_col
+        table.append(mask)
+    return table
+
+RAYS = {direction: _ray_table(*direction) for direction in BISHOP_DIRECTIONS + ROOK_DIRECTIONS}
+
+# Τα τετραγωνα αναμεσα σε δυο τετραγωνα της ιδιας γραμμης, στηλης ή διαγωνιου (0 αν δεν ευθυγραμμιζονται)
+def _between_table() -> list[list[int]]:
+    table = [[0] * 64 for _ in range(64)]
+    for s in range(64):
+        r, c = divmod(s, 8)
+        for delta_row, delta_col in BISHOP_DIRECTIONS + ROOK_DIRECTIONS:
+            between = 0
+            new_row, new_col = r + delta_row, c + delta_col
+            while 0 <= new_row <= 7 and 0 <= new_col <= 7:
+                t = square_index(new_row, new_col)
+                table[s][t] = between
+                between |= 1 << t
+                new_row += delta_row
+                new_col += delta_col
+    return table
+
+BETWEEN = _between_table()
+
+# Για καθε τετραγωνο: λιστα (ακτινα, πινακας ακτινων, αυξανεται ο δεικτης;) ανα κατευθυνση
+def _slider_table(directions) -> list[list[tuple[int, list[int], bool]]]:
+    return [
+        [(RAYS[d][s], RAYS[d], d[0] * 8 + d[1] > 0) for d in directions]
+        for s in range(64)
+    ]
+
+BISHOP_RAYS = _slider_table(BISHOP_DIRECTIONS)
+ROOK_RAYS = _slider_table(ROOK_DIRECTIONS)
+
+# Επιθεσεις ενος κομματιου που "γλιστραει" δεδομενης της καταληψης της σκακιερας
+def slider_attacks(rays, occupied: int) -> int:
+    attacks = 0
+    for ray, table, increasing in rays:
+        blockers = ray & occupied
+        if blockers:
+            # Το πρωτο εμποδιο ειναι το χαμηλοτερο ή το υψηλοτερο bit αναλογα με την κατευθυνση
+            first = (blockers & -blockers).bit_length() - 1 if increasing else blockers.bit_length() - 1
+            ray ^= table[first]
+        attacks |= ray
+    return attacks
+
+# Τα τετραγωνα που μπορουν να σταματησουν τις ακτινες ενος τετραγωνου (χωρις το τελευταιο καθε ακτινας,
+# που δεν κρυβει τιποτα πισω του)
+def _blocker_mask(rays) -> int:
+    mask = 0
+    for ray, _, increasing in rays:
+        if ray:
+            mask |= ray ^ (1 << (ray.bit_length() - 1) if increasing else ray & -ray)
+    return mask
+
+BISHOP_MASKS = [_blocker_mask(rays) for rays in BISHOP_RAYS]
+
+# Ακτινες σε αδεια σκακιερα (για τα καρφωματα: ποιοι αντιπαλοι θα εβλεπαν τον βασιλια χωρις εμποδια)
+BISHOP_LINES = [slider_attacks(rays, 0) for rays in BISHOP_RAYS]
+ROOK_LINES = [slider_attacks(rays, 0) for rays in ROOK_RAYS]
+ROOK_MASKS = [_blocker_mask(rays) for rays in ROOK_RAYS]
+
+# Cache ανα τετραγωνο: εμποδια πανω στις ακτινες -> επιθεσεις. Γεμιζει οσο παιζεται και εχει το πολυ
+# 2^9 (αξιωματικος) ή 2^12 (πυργος) εγγραφες ανα τετραγωνο, ενα ειδος "magic bitboards" με dict
+BISHOP_CACHE: list[dict[int, int]] = [{} for _ in range(64)]
+ROOK_CACHE: list[dict[int, int]] = [{} for _ in range(64)]
+
+def bishop_attacks(s: int, occupied: int) -> int:
+    blockers = occupied & BISHOP_MASKS[s]
+    attacks = BISHOP_CACHE[s].get(blockers)
+    if attacks is None:
+        attacks = BISHOP_CACHE[s][blockers] = slider_attacks(BISHOP_RAYS[s], blockers)
+    return attacks
+
+def rook_attacks(s: int, occupied: int) -> int:
+    blockers = occupied & ROOK_MASKS[s]
+    attacks = ROOK_CACHE[s].get(blockers)
+    if attacks is None:
+        attacks = ROOK_CACHE[s][blockers] = slider_attacks(ROOK_RAYS[s], blockers)
+    return attacks
+
+
+# --------------------------------------------------------------------- #
+#  BitBoard κλαση: ιδια διεπαφη με την Board, αλλα οι σαρωσεις γινονται
+#  με πραξεις πανω σε 12 bitboards (ενα ανα χρωμα-τυπο) και μασκες καταληψης
+# --------------------------------------------------------------------- #
+class BitBoard(Board):
+    def __init__(self, setup: bool = True):
+        # Ενα bitboard για καθε συνδυασμο χρωματος-τυπου (δεικτες απο PIECE_INDEX)
+        self.bb: list[int] = [0] * 12
+
+        # Μασκες καταληψης ανα χρωμα (0 λευκα, 1 μαυρα) και συνολικα
+        self.occ: list[int] = [0, 0]
+        self.occ_all: int = 0
+
+        super().__init__(setup)
+
+    # --------------------------------------------------------------------- #
+    #  Συγχρονισμος bitboards με τις αλλαγες της σκακιερας
+    # --------------------------------------------------------------------- #
+    def _toggle(self, piece: Piece):
+        bit = 1 << (piece.row * 8 + piece.col)
+        self.bb[PIECE_INDEX[(piece.color, piece.kind)]] ^= bit
+        self.occ[piece.color is Color.BLACK] ^= bit
+        self.occ_all ^= bit
+
+    def _place(self, piece: Piece):
+        super()._place(piece)
+        self._toggle(piece)
+
+    def _remove(self, piece: Piece):
+        self._toggle(piece)
+        super()._remove(piece)
+
+    # Και τα δυο bits (αφετηρια, προορισμος) αλλαζουν με μια πραξη ανα bitboard
+    def _relocate(self, piece: Piece, row: int, col: int):
+        bits = 1 << (piece.row * 8 + piece.col) | 1 << (row * 8 + col)
+        self.bb[PIECE_INDEX[(piece.color, piece.kind)]] ^= bits
+        self.occ[piece.color is Color.BLACK] ^= bits
+        self.occ_all ^= bits
+        super()._relocate(piece, row, col)
+
+    # --------------------------------------------------------------------- #
+    #  Επιθεσεις
+    # --------------------------------------------------------------------- #
+    # Ελεγχει αν το τετραγωνο s απειλειται απο το χρωμα by.
+    # Τα occupied/keep επιτρεπουν ελεγχο μετα απο υποθετικη κινηση χωρις να αλλαξει η σκακιερα
+    # (keep: μασκα που αφαιρει ενα πιονι του επιτιθεμενου που "φαγωθηκε")
+    def _attacked(self, s: int, by: Color, occupied: int, keep: int = FULL) -> bool:
+        bb = self.bb
+        black = by is Color.BLACK
+        base = 6 if black else 0 # PIECE_INDEX του πιονιου του by (τα υπολοιπα ακολουθουν με τη σειρα PIECE_KINDS)
+        if KNIGHT_ATTACKS[s] & bb[base + 1] & keep:
+            return True
+        if KING_ATTACKS[s] & bb[base + 5] & keep:
+            return True
+        # Ενα πιονι του by απειλει το s αν βρισκεται εκει που θα απειλουσε ενα πιονι του αλλου χρωματος απο το s
+        if PAWN_ATTACKS[not black][s] & bb[base] & keep:
+            return True
+        queens = bb[base + 4]
+        diagonal = (bb[base + 2] | queens) & keep
+        if diagonal and bishop_attacks(s, occupied) & diagonal:
+            return True
+        straight = (bb[base + 3] | queens) & keep
+        if straight and rook_attacks(s, occupied) & straight:
+            return True
+        return False
+
+    # Bitboard με ολα τα κομματια του by που απειλουν το τετραγωνο s
+    def _attackers_mask(self, s: int, by: Color, occupied: int) -> int:
+        bb = self.bb
+        black = by is Color.BLACK
+        base = 6 if black else 0
+        queens = bb[base + 4]
+        return (
+            (KNIGHT_ATTACKS[s] & bb[base + 1])
+            | (KING_ATTACKS[s] & bb[base + 5])
+            | (PAWN_ATTACKS[not black][s] & bb[base])
+            | (bishop_attacks(s, occupied) & (bb[base + 2] | queens))
+            | (rook_attacks(s, occupied) & (bb[base + 3] | queens))
+        )
+
+    # Ψευδο-νομιμοι προορισμοι ενος πιονιου ως bitboard (ιδιοι κανονες με την Board.legal_moves)
+    def _targets(self, piece: Piece) -> int:
+        s = piece.row * 8 + piece.col
+        kind = piece.kind
+
+        black = piece.color is Color.BLACK
+
+        if kind is PieceType.PAWN:
+            return (PAWN_ATTACKS[black][s] & self.occ[not black]) | (PAWN_PUSHES[black][s] & ~self.occ_all)
+        if kind is PieceType.KNIGHT:
+            return KNIGHT_ATTACKS[s] & ~self.occ[black]
+        if kind is PieceType.KING:
+            return KING_ATTACKS[s] & ~self.occ[black]
+        if kind is PieceType.BISHOP:
+            return bishop_attacks(s, self.occ_all) & ~self.occ[black]
+        if kind is PieceType.ROOK:
+            return rook_attacks(s, self.occ_all) & ~self.occ[black]
+        return (bishop_attacks(s, self.occ_all) | rook_attacks(s, self.occ_all)) & ~self.occ[black]
+
+    # Ελεγχει αν η κινηση from_s -> to_s αφηνει τον βασιλια του color ασφαλη (χωρις να αλλαξει η σκακιερα)
+    def _safe_after(self, piece: Piece, from_s: int, to_s: int) -> bool:
+        to_bit = 1 << to_s
+        occupied = (self.occ_all & ~(1 << from_s)) | to_bit
+        if piece.kind == PieceType.KING:
+            king_s = to_s
+        else:
+            king = self.bb[11 if piece.color is Color.BLACK else 5]
+            if not king:
+                return True
+            king_s = king.bit_length() - 1
+        return not self._attacked(king_s, piece.color.opposite, occupied, FULL ^ to_bit)
+
+    def _king_move_safe(self, king: Piece, row: int, col: int) -> bool:
+        return self._safe_after(king, square_index(king.row, king.col), square_index(row, col))
+
+    # --------------------------------------------------------------------- #
+    #  Διεπαφη Board
+    # --------------------------------------------------------------------- #
+    def legal_moves(self, piece: Piece) -> list[tuple[int, int]]:
+        # Ιδιο με το bit_squares, γραμμενο εδω για να γλιτωσουμε μια κληση συναρτησης ανα κομματι
+        targets = self._targets(piece)
+        squares = []
+        while targets:
+            low = targets & -targets
+            squares.append(SQUARES[low.bit_length() - 1])
+            targets ^= low
+        return squares
+
+    def attackers_of(self, square: tuple[int, int], color: Color) -> list[tuple[int, int]]:
+        return bit_squares(self._attackers_mask(square_index(*square), color, self.occ_all))
+
+    def is_square_attacked(self, square: tuple[int, int], color: Color) -> bool:
+        return self._attacked(square_index(*square), color, self.occ_all)
+
+    def king_in_check(self, color: Color) -> bool:
+        king = self.bb[11 if color is Color.BLACK else 5]
+
+        # Σφαλμα στο στησιμο της σκακιερας (αν δεν βρεθει ο βασιλιας στην σκακερια)
+        if not king:
+            return False
+        return self._attacked(king.bit_length() - 1, color.opposite, self.occ_all)
+
+    # --------------------------------------------------------------------- #
+    #  Ολες οι νομιμες κινησεις ενος παικτη με μασκες: οι επιτιθεμενοι του
+    #  βασιλια απο την _attackers_mask, τα σαχ περιοριζουν τους προορισμους
+    #  στον επιτιθεμενο και στα τετραγωνα αναμεσα (BETWEEN), και τα
+    #  καρφωματα βρισκονται "βλεποντας μεσα" απο τα δικα μας κομματια με τις
+    #  ακτινες του βασιλια σε αδεια σκακιερα. Ιδια σειρα κινησεων με πριν
+    #  (πρωτα ο βασιλιας, μετα τα κομματια και οι προορισμοι κατα αυξοντα δεικτη)
+    # --------------------------------------------------------------------- #
+    def generate_legal_moves(self, color: Color) -> list[int]:
+        black = color is Color.BLACK
+        bb, sq = self.bb, self.sq
+        king_bit = bb[11 if black else 5]
+
+        # Χωρις βασιλια (σφαλμα στο στησιμο) καθε ψευδο-νομιμη κινηση θεωρειται νομιμη
+        if not king_bit:
+            return super().generate_legal_moves(color)
+
+        moves = []
+        enemy = color.opposite
+        occupied = self.occ_all
+        own = self.occ[black]
+        king_s = king_bit.bit_length() - 1
+
+        # Κινησεις του βασιλια: ο προορισμος δεν πρεπει να απειλειται με τον βασιλια εκτος σκακιερας
+        without_king = occupied ^ king_bit
+        targets = KING_ATTACKS[king_s] & ~own
+        while targets:
+            low = targets & -targets
+            t = low.bit_length() - 1
+            if not self._attacked(t, enemy, without_king | low, FULL ^ low):
+                moves.append(king_s | t << 6)
+            targets ^= low
+
+        # Διπλο σαχ: μονο ο βασιλιας· απλο σαχ: φαγωμα του επιτιθεμενου ή παρεμβολη
+        checkers = self._attackers_mask(king_s, enemy, occupied)
+        if checkers & (checkers - 1):
+            return moves
+        evasions = checkers | BETWEEN[king_s][checkers.bit_length() - 1] if checkers else FULL
+
+        # Καρφωματα: αντιπαλοι αξιωματικοι/πυργοι/βασιλισσες στις ακτινες του βασιλια με ενα μονο
+        # κομμα (δικο μας) αναμεσα. Το καρφωμενο κινειται μονο μεχρι και τον επιτιθεμενο
+        base = 0 if black else 6
+        queens = bb[base + 4]
+        pins = {}
+        pinners = (BISHOP_LINES[king_s] & (bb[base + 2] | queens)) | (ROOK_LINES[king_s] & (bb[base + 3] | queens))
+        while pinners:
+            low = pinners & -pinners
+            line = BETWEEN[king_s][low.bit_length() - 1]
+            blockers = line & occupied
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pins[blockers.bit_length() - 1] = line | low
+            pinners ^= low
+
+        pieces = own ^ king_bit
+        while pieces:
+            low = pieces & -pieces
+            s = low.bit_length() - 1
+            targets = self._targets(sq[s >> 3][s & 7]) & evasions & pins.get(s, FULL)
+            while targets:
+                target = targets & -targets
+                moves.append(s | (target.bit_length() - 1) << 6)
+                targets ^= target
+            pieces ^= low
+        return moves
+
+    def has_legal_moves(self, color: Color) -> bool:
+        for s in iter_bits(self.occ[color is Color.BLACK]):
+            piece = self.sq[s >> 3][s & 7]
+            for t in iter_bits(self._targets(piece)):
+                if self._safe_after(piece, s, t):
+                    return True
+        return False
@@ -1,6 +1,9 @@
+import struct
 from enum import Enum
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, NamedTuple
+from zobrist import PIECE_KEYS, TURN_KEY, CASTLING_KEYS, EN_PASSANT_KEYS
+from psqt import MATERIAL, SQUARE_VALUES, PHASE
 
 # --------------------------------------------------------------------- #
 #  Ορισμος Χρωματων
@@ -8,6 +11,11 @@ from typing import Optional, List
 class Color(Enum):
     WHITE = "w"
     BLACK = "b"
+
+    # Τα μελη ενος Enum ειναι μοναδικα, οποτε αρκει το hash ταυτοτητας (σε C). Το προεπιλεγμενο hash του
+    # Enum ειναι κληση σε Python και κοστιζε περισσοτερο απο την ιδια τη δουλεια σε καθε PIECE_INDEX[(χρωμα,
+    # τυπος)] των _place/_remove/_relocate (ιδιαιτερα στην BitBoard που συγχρονιζει και τα bitboards)
+    __hash__ = object.__hash__
  
     # Επιστρεφει το αντιθετο χρωμα (για εναλλαγη σειρας παικτων)
     @property
@@ -26,11 +34,13 @@ class PieceType(Enum):
     QUEEN  = "Q" # Βασιλισσα
     KING   = "K" # Βασιλιας
 
+    __hash__ = object.__hash__ # Βλ. Color
+
 
 # --------------------------------------------------------------------- #
 #  Δομη για καθε Πιονι
 # --------------------------------------------------------------------- #
-@dataclass
+@dataclass(slots=True)
 class Piece:
     color: Color # Χρώμα του πιονιου
     kind: PieceType # Τυπος του πιονιου
@@ -39,11 +49,134 @@ class Piece:
     moved: bool = False # Ελεγχει αν εχει μετακινηθει
 
 
+# --------------------------------------------------------------------- #
+#  Αριθμητικος κωδικας (0-11) για καθε συνδυασμο χρωματος και τυπου
+#  (χρησιμοποιειται απο τα bitboards και οπου χρειαζεται συμπαγης κωδικοποιηση)
+# --------------------------------------------------------------------- #
+PIECE_KINDS = (PieceType.PAWN, PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN, PieceType.KING)
+PIECE_INDEX = {
+    (color, kind): offset + i
+    for color, offset in ((Color.WHITE, 0), (Color.BLACK, 6))
+    for i, kind in enumerate(PIECE_KINDS)
+}
+
+
+# --------------------------------------------------------------------- #
+#  Packed θεση (36 bytes):
+#  bytes 0-31: ενα nibble ανα τετραγωνο (0 = αδειο, 1-12 = PIECE_INDEX + 1),
+#              το τετραγωνο 2i στα χαμηλα 4 bits του byte i, το 2i+1 στα υψηλα
+#  byte 32:    bit 0 = παιζουν τα μαυρα, bits 1-4 = δικαιωματα ροκε
+#  byte 33:    τετραγωνο en passant (255 = κανενα)
+#  bytes 34-35: αριθμος κινησης (little endian)
+# --------------------------------------------------------------------- #
+PACKED_TRAILER = struct.Struct("<BBH")
+PACKED_SIZE = 32 + PACKED_TRAILER.size
+NO_EN_PASSANT = 255
+PACKED_PIECES = {index + 1: key for key, index in PIECE_INDEX.items()}
+
+
+# --------------------------------------------------------------------- #
+#  Κωδικοποιηση κινησεων σε ακεραιο
+#  bits 0-5: αφετηρια, bits 6-11: προορισμος (τετραγωνο = γραμμη*8 + στηλη)
+# --------------------------------------------------------------------- #
+def encode_move(source_row: int, source_col: int, destination_row: int, destination_col: int) -> int:
+    return (source_row * 8 + source_col) | (destination_row * 8 + destination_col) << 6
+
+# Επιστρεφει (source_row, source_col, destination_row, destination_col)
+def decode_move(move: int) -> tuple[int, int, int, int]:
+    source, destination = move & 63, move >> 6
+    return source >> 3, source & 7, destination >> 3, destination & 7
+
+# Ονομα τετραγωνου (π.χ. γραμμη 6, στηλη 4 -> "e2")
+def square_name(row: int, col: int) -> str:
+    return "abcdefgh"[col] + "87654321"[row]
+
+# Θεση απο ονομα τετραγωνου (π.χ. "e2" -> (6, 4))
+def parse_square(name: str) -> tuple[int, int]:
+    if len(name) != 2 or name[0] not in "abcdefgh" or name[1] not in "12345678":
+        raise ValueError(f"Μη εγκυρο τετραγωνο: {name!r}")
+    return 8 - int(name[1]), "abcdefgh".index(name[0])
+
+# Κινηση σε μορφη UCI (π.χ. "e2e3")
+def move_to_uci(move: int) -> str:
+    source_row, source_col, destination_row, destination_col = decode_move(move)
+    return square_name(source_row, source_col) + square_name(destination_row, destination_col)
+
+# Κινηση απο μορφη UCI
+def move_from_uci(text: str) -> int:
+    return encode_move(*parse_square(text[:2]), *parse_square(text[2:4]))
+
+
+# --------------------------------------------------------------------- #
+#  Εγγραφη αναιρεσης (μια για καθε κινηση στη στοιβα της Board)
+# --------------------------------------------------------------------- #
+class Undo(NamedTuple):
+    move: int # Η κινηση που εκτελεστηκε
+    captured: Optional[Piece] # Το πιονι που φαγωθηκε (ή None)
+    moved: bool # Η τιμη του moved του πιονιου πριν την κινηση
+    turn: Color # Η σειρα πριν την κινηση
+    castling: int # Δικαιωματα ροκε πριν την κινηση
+    en_passant: Optional[tuple[int, int]] # Τετραγωνο en passant πριν την κινηση
+    halfmove: int # Μετρητης 50 κινησεων πριν την κινηση
+    terminal: Optional[tuple[bool, bool, bool]] # Σαχ/ματ/πατ της θεσης πριν την κινηση, αν ειχε υπολογιστει
+
+
+# --------------------------------------------------------------------- #
+#  Κατασταση παρτιδας σε μια θεση (βλ. Board.status)
+# --------------------------------------------------------------------- #
+class Status(NamedTuple):
+    check: bool # Ο παικτης που παιζει ειναι σε σαχ
+    mate: bool
+    stalemate: bool
+    repetitions: int # Ποσες φορες εχει εμφανιστει η θεση στην παρτιδα (μαζι με την τρεχουσα)
+    halfmove: int # Μισες κινησεις απο το τελευταιο φαγωμα ή κινηση πιονιου
+
+    @property
+    def threefold(self) -> bool:
+        return self.repetitions >= 3
+
+    @property
+    def fifty_moves(self) -> bool:
+        return self.halfmove >= 100
+
+    @property
+    def over(self) -> bool:
+        return self.mate or self.stalemate or self.threefold or self.fifty_moves
+
+
+# --------------------------------------------------------------------- #
+#  FEN (Forsyth-Edwards Notation)
+# --------------------------------------------------------------------- #
+STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Γραμμα FEN για καθε τυπο πιονιου (κεφαλαια για τα λευκα, πεζα για τα μαυρα)
+FEN_KINDS = {kind.value: kind for kind in PieceType}
+
+# Bits δικαιωματων ροκε με τη σειρα που εμφανιζονται στο FEN
+CASTLING_FLAGS = (("K", 1), ("Q", 2), ("k", 4), ("q", 8))
+
+# Δικαιωματα ροκε που χανονται οταν μια κινηση ξεκιναει ή καταληγει σε καθε τετραγωνο: ο βασιλιας ή ο
+# πυργος φευγει απο την αρχικη του θεση, ή ο πυργος τρωγεται εκει (e1 = 60, h1 = 63, a1 = 56, e8 = 4, ...)
+CASTLING_LOSS = [0] * 64
+CASTLING_LOSS[60], CASTLING_LOSS[63], CASTLING_LOSS[56] = 1 | 2, 1, 2
+CASTLING_LOSS[4], CASTLING_LOSS[7], CASTLING_LOSS[0] = 4 | 8, 4, 8
+
+
+# --------------------------------------------------------------------- #
+#  Κατευθυνσεις κινησης (χρησιμοποιουνται απο τον ελεγχο επιθεσεων)
+# --------------------------------------------------------------------- #
+KNIGHT_DELTAS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+KING_DELTAS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+DIAGONAL_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+STRAIGHT_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
 # --------------------------------------------------------------------- #
 #  Board κλαση (διαχειριζεται την λογικη)
 # --------------------------------------------------------------------- #
 class Board:
-    def __init__(self):
+    # setup=False: αδεια σκακιερα (π.χ. οταν η θεση θα φορτωθει αμεσως απο FEN ή packed μορφη)
+    def __init__(self, setup: bool = True):
 
         # Πινακας 8x8 που περιεχει είτε πιονια ειτε None (κενη θεση)
         self.sq: List[List[Optional[Piece]]] = [[None]*8 for _ in range(8)]
@@ -51,8 +184,48 @@ class Board:
         # Κραταει την σειρα του παιχτη (ξεκιναει παντα ο λευκος)
         self.turn: Color = Color.WHITE
 
+        # Θεσεις των βασιλιαδων (ενημερωνονται σε καθε αλλαγη της σκακιερας)
+        self.kings: dict[Color, tuple[int, int]] = {}
+
+        # Δικαιωματα ροκε και τετραγωνο en passant (οι τρεχοντες κανονες δεν τα χρησιμοποιουν ακομη,
+        # αλλα αποθηκευονται σε καθε εγγραφη αναιρεσης)
+        self.castling: int = 0
+        self.en_passant: Optional[tuple[int, int]] = None
+
+        # Στοιβα αναιρεσης (μια εγγραφη Undo για καθε κινηση που εχει γινει)
+        self.history: List[Undo] = []
+
+        # Αριθμος πληρους κινησης (αυξανεται μετα απο καθε κινηση των μαυρων)
+        self.fullmove: int = 1
+
+        # Κλειδι Zobrist της θεσης (ενημερωνεται σταδιακα σε καθε κινηση και αναιρεση)
+        self.key: int = 0
+
+        # Πληθος κομματιων στη σκακιερα (π.χ. για να ξερει η μηχανη ποτε να ρωτησει τα tablebases)
+        self.piece_count: int = 0
+
+        # Οροι αξιολογησης που ενημερωνονται σταδιακα στις _place/_remove/_relocate (αρα και σε καθε
+        # push/pop), ωστε η αξιολογηση να μη σαρωνει τα 64 τετραγωνα: υλικο και πινακες θεσεων απο την
+        # πλευρα των λευκων (λευκα - μαυρα, βλ. psqt.py) και φαση παρτιδας (0 - psqt.PHASE_TOTAL)
+        self.material: int = 0
+        self.psqt: int = 0
+        self.phase: int = 0
+
+        # Τα κομματια καθε χρωματος ανα τετραγωνο (γραμμη*8 + στηλη), για βροχους μονο πανω στα κομματια
+        self.pieces: dict[Color, dict[int, Piece]] = {Color.WHITE: {}, Color.BLACK: {}}
+
+        # Μισες κινησεις απο το τελευταιο φαγωμα ή κινηση πιονιου (κανονας 50 κινησεων)
+        self.halfmove: int = 0
+
+        # Σαχ/ματ/πατ της τρεχουσας θεσης (None μεχρι να χρειαστει, βλ. status)
+        self.terminal: Optional[tuple[bool, bool, bool]] = None
+
         # Τοποθετει τα πιονια στην αρχικη τους θεση
-        self.setup_starting()
+        if setup:
+            self.setup_starting()
+
+        # Ποσες φορες εχει εμφανιστει καθε θεση (κλειδι Zobrist) στην παρτιδα, για την τριπλη επαναληψη
+        self.repetitions: dict[int, int] = {self.key: 1}
 
     # --------------------------------------------------------------------- #
     #  Τοποθετει τα πιονια στη σωστη αρχικη θεση στη σκακιερα
@@ -72,11 +245,222 @@ class Board:
             self._place(Piece(Color.WHITE, PieceType.PAWN, 6, col))
             self._place(Piece(Color.BLACK, PieceType.PAWN, 1, col))
 
+        # Ολα τα δικαιωματα ροκε, οπως στο STARTING_FEN (ωστε το κλειδι να ειναι ιδιο με της from_fen)
+        castling = sum(bit for _, bit in CASTLING_FLAGS)
+        self.key ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[castling]
+        self.castling = castling
+
+    # --------------------------------------------------------------------- #
+    #  Φορτωση / εξαγωγη θεσης σε FEN
+    # --------------------------------------------------------------------- #
+    @classmethod
+    def from_fen(cls, fen: str) -> "Board":
+        board = cls(setup=False)
+        board.set_fen(fen)
+        return board
+
+    # Αντικαθιστα την τρεχουσα θεση με αυτη του FEN (η στοιβα αναιρεσης αδειαζει)
+    def set_fen(self, fen: str):
+        fields = fen.split()
+        rows = fields[0].split("/") if fields else []
+        if len(rows) != 8:
+            raise ValueError(f"Μη εγκυρο FEN: {fen!r}")
+
+        # Διαβαζουμε πρωτα ολα τα πιονια ωστε ενα λαθος FEN να μην αφησει μισογεματη σκακιερα
+        pieces = []
+        for row, text in enumerate(rows):
+            col = 0
+            for ch in text:
+                if ch.isdigit():
+                    col += int(ch)
+                elif ch.upper() in FEN_KINDS and col < 8:
+                    color = Color.WHITE if ch.isupper() else Color.BLACK
+                    pieces.append(Piece(color, FEN_KINDS[ch.upper()], row, col))
+                    col += 1
+                else:
+                    raise ValueError(f"Μη εγκυρο FEN: {fen!r}")
+            if col != 8:
+                raise ValueError(f"Μη εγκυρο FEN: {fen!r}")
+
+        turn = fields[1] if len(fields) > 1 else "w"
+        if turn not in ("w", "b"):
+            raise ValueError(f"Μη εγκυρο FEN: {fen!r}")
+        castling = fields[2] if len(fields) > 2 else "-"
+        en_passant = fields[3] if len(fields) > 3 else "-"
+
+        self._set_position(
+            pieces,
+            Color(turn),
+            sum(bit for flag, bit in CASTLING_FLAGS if flag in castling),
+            None if en_passant == "-" else parse_square(en_passant),
+            int(fields[5]) if len(fields) > 5 else 1,
+            int(fields[4]) if len(fields) > 4 else 0,
+        )
+
+    # Καθαριζει τη σκακιερα και στηνει τη νεα θεση (κοινο για FEN και packed μορφη)
+    def _set_position(self, pieces: list[Piece], turn: Color, castling: int,
+                      en_passant: Optional[tuple[int, int]], fullmove: int, halfmove: int = 0):
+        for own in self.pieces.values():
+            for piece in list(own.values()):
+                self._remove(piece)
+        for piece in pieces:
+            self._place(piece)
+
+        self.turn = turn
+        self.castling = castling
+        self.en_passant = en_passant
+        self.fullmove = fullmove
+        self.halfmove = halfmove
+        self.history = []
+        self.key = self.compute_key()
+        self.repetitions = {self.key: 1}
+        self.terminal = None
+
+    # Υπολογιζει το κλειδι Zobrist απο την αρχη (η Board το κραταει ενημερωμενο στο self.key)
+    def compute_key(self) -> int:
+        key = 0
+        for row in self.sq:
+            for piece in row:
+                if piece:
+                    key ^= PIECE_KEYS[PIECE_INDEX[(piece.color, piece.kind)]][piece.row * 8 + piece.col]
+        if self.turn is Color.BLACK:
+            key ^= TURN_KEY
+        key ^= CASTLING_KEYS[self.castling]
+        if self.en_passant:
+            key ^= EN_PASSANT_KEYS[self.en_passant[1]]
+        return key
+
+    # Επιστρεφει την τρεχουσα θεση σε μορφη FEN
+    def fen(self) -> str:
+        rows = []
+        for r in range(8):
+            text, empty = "", 0
+            for c in range(8):
+                piece = self.sq[r][c]
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    text += str(empty)
+                    empty = 0
+                letter = piece.kind.value
+                text += letter if piece.color is Color.WHITE else letter.lower()
+            if empty:
+                text += str(empty)
+            rows.append(text)
+
+        castling = "".join(flag for flag, bit in CASTLING_FLAGS if self.castling & bit) or "-"
+        en_passant = square_name(*self.en_passant) if self.en_passant else "-"
+        return f"{'/'.join(rows)} {self.turn.value} {castling} {en_passant} {self.halfmove} {self.fullmove}"
+
+    # --------------------------------------------------------------------- #
+    #  Packed μορφη σταθερου μηκους (PACKED_SIZE bytes), για αποθηκευση
+    #  εκατομμυριων θεσεων (βλ. position_store.py)
+    # --------------------------------------------------------------------- #
+    def pack(self) -> bytes:
+        codes = [0] * 64
+        for row in self.sq:
+            for piece in row:
+                if piece:
+                    codes[piece.row * 8 + piece.col] = PIECE_INDEX[(piece.color, piece.kind)] + 1
+        squares = bytes(codes[i] | codes[i + 1] << 4 for i in range(0, 64, 2))
+        flags = (self.turn is Color.BLACK) | self.castling << 1
+        en_passant = self.en_passant[0] * 8 + self.en_passant[1] if self.en_passant else NO_EN_PASSANT
+        return squares + PACKED_TRAILER.pack(flags, en_passant, self.fullmove)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "Board":
+        board = cls(setup=False)
+        board.set_packed(data)
+        return board
+
+    def set_packed(self, data: bytes):
+        if len(data) != PACKED_SIZE:
+            raise ValueError(f"Μη εγκυρο μηκος packed θεσης: {len(data)}")
+        pieces = []
+        for i in range(32):
+            byte = data[i]
+            if byte:
+                low, high = byte & 15, byte >> 4
+                if low:
+                    pieces.append(Piece(*PACKED_PIECES[low], i >> 2, (i & 3) * 2))
+                if high:
+                    pieces.append(Piece(*PACKED_PIECES[high], i >> 2, (i & 3) * 2 + 1))
+        flags, en_passant, fullmove = PACKED_TRAILER.unpack_from(data, 32)
+        self._set_position(
+            pieces,
+            Color.BLACK if flags & 1 else Color.WHITE,
+            flags >> 1 & 15,
+            divmod(en_passant, 8) if en_passant != NO_EN_PASSANT else None,
+            fullmove,
+        )
+
+    # --------------------------------------------------------------------- #
+    #  Συμπαγης μορφη για αποστολη σε αλλη διεργασια:
+    #  FEN της θεσης πριν την πρωτη κινηση + οι κινησεις (ακεραιοι) που εχουν γινει
+    # --------------------------------------------------------------------- #
+    def snapshot(self) -> tuple[str, list[int]]:
+        moves = [undo.move for undo in self.history]
+        for _ in moves:
+            self.pop()
+        fen = self.fen()
+        for move in moves:
+            self.push(move)
+        return fen, moves
+
+    @classmethod
+    def from_snapshot(cls, snapshot: tuple[str, list[int]]) -> "Board":
+        fen, moves = snapshot
+        board = cls.from_fen(fen)
+        for move in moves:
+            board.push(move)
+        return board
+
     # --------------------------------------------------------------------- #
     #  Τοποθετηση πιονιου σε συγκεκριμενη θεση
     # --------------------------------------------------------------------- #
     def _place(self, piece: Piece):
+        index, s = PIECE_INDEX[(piece.color, piece.kind)], piece.row * 8 + piece.col
         self.sq[piece.row][piece.col] = piece
+        self.key ^= PIECE_KEYS[index][s]
+        self.piece_count += 1
+        self.material += MATERIAL[index]
+        self.psqt += SQUARE_VALUES[index][s]
+        self.phase += PHASE[index]
+        self.pieces[piece.color][s] = piece
+        if piece.kind is PieceType.KING:
+            self.kings[piece.color] = (piece.row, piece.col)
+
+    # Αφαιρεση πιονιου απο τη θεση του (π.χ. οταν τρωγεται)
+    def _remove(self, piece: Piece):
+        index, s = PIECE_INDEX[(piece.color, piece.kind)], piece.row * 8 + piece.col
+        self.sq[piece.row][piece.col] = None
+        self.key ^= PIECE_KEYS[index][s]
+        self.piece_count -= 1
+        self.material -= MATERIAL[index]
+        self.psqt -= SQUARE_VALUES[index][s]
+        self.phase -= PHASE[index]
+        del self.pieces[piece.color][s]
+        if piece.kind is PieceType.KING and self.kings.get(piece.color) == (piece.row, piece.col):
+            del self.kings[piece.color]
+
+    # Μεταφορα πιονιου σε αδεια θεση (ενημερωνει και τις συντεταγμενες του)
+    def _relocate(self, piece: Piece, row: int, col: int):
+        index, source, destination = PIECE_INDEX[(piece.color, piece.kind)], piece.row * 8 + piece.col, row * 8 + col
+        keys, values = PIECE_KEYS[index], SQUARE_VALUES[index]
+        self.key ^= keys[source] ^ keys[destination]
+        self.psqt += values[destination] - values[source]
+        pieces = self.pieces[piece.color]
+        del pieces[source]
+        pieces[destination] = piece
+        self.sq[piece.row][piece.col] = None
+        piece.row, piece.col = row, col
+        self.sq[row][col] = piece
+        if piece.kind is PieceType.KING:
+            self.kings[piece.color] = (row, col)
+
+    # Ολες οι αλλαγες της σκακιερας περνανε απο τις _place/_remove/_relocate,
+    # ωστε εναλλακτικες αναπαραστασεις (π.χ. bitboard.BitBoard) να μενουν συγχρονισμενες
 
     # Επιστρεφει την συγκεκριμενη θεση του πιονιου (ή None αν ειναι αδεια)
     def piece_at(self, row: int, col: int) -> Optional[Piece]:
@@ -104,37 +488,89 @@ class Board:
         if (destination_row, destination_col) not in legal:
             return False
         
-        # Αποθηκευουμε τι υπαρχει στον προορισμο της κινησης (μπορει να ειναι πιονι του αντιπαλου ή κενο)
-        captured = self.piece_at(destination_row, destination_col)
-
-        # Αφαιρουμε προσωρινα το κομματι απο την αρχικη του θεση
-        self.sq[source_row][source_col] = None
-
-        # Τοποθετουμε το πιονι στη νεα του θεση
-        self.sq[destination_row][destination_col] = piece
-
-        # Αποθηκευουμε την παλια θεση του πιονιου (για πιθανο undo)
-        old_row, old_col = piece.row, piece.col
-
-        # Ενημερωνουμε τις συντεταγμενες του πιονιου ωστε να δειχνουν τη νεα του θεση
-        piece.row, piece.col = destination_row, destination_col
+        # Εκτελουμε την κινηση (καταγραφεται στη στοιβα αναιρεσης)
+        self.push(encode_move(source_row, source_col, destination_row, destination_col))
 
         # Ελεγχει αν η κινηση αφηνει τον βασιλια σε σαχ, αν ναι η κινηση θεωρειται παρανομη και ακυρωνεται
         if self.king_in_check(piece.color):
-            # Επαναφερουμε το πιονι στην αρχικη του θεση
-            self.sq[source_row][source_col] = piece
+            self.pop()
+            return False
+        return True
 
-            # Επαναφερουμε αυτο που υπηρχε στον προορισμο
-            self.sq[destination_row][destination_col] = captured
+    # --------------------------------------------------------------------- #
+    #  Εκτελεση / αναιρεση κινησης χωρις ελεγχο νομιμοτητας (για αναζητηση, perft, αναιρεση στο GUI)
+    # --------------------------------------------------------------------- #
+    def push(self, move: int):
+        source, destination = move & 63, move >> 6
+        piece = self.sq[source >> 3][source & 7]
+        captured = self.sq[destination >> 3][destination & 7]
+
+        # Καταγραφουμε οτι χρειαζεται για να αναιρεθει η κινηση
+        self.history.append(Undo(move, captured, piece.moved, self.turn, self.castling, self.en_passant,
+                                 self.halfmove, self.terminal))
+
+        # Αφαιρουμε το πιονι του αντιπαλου (αν υπαρχει) και μεταφερουμε το πιονι στη νεα του θεση
+        if captured:
+            self._remove(captured)
+        self._relocate(piece, destination >> 3, destination & 7)
+
+        # Κινηση βασιλια ή πυργου απο την αρχικη του θεση (ή φαγωμα πυργου εκει) χανει τα αντιστοιχα
+        # δικαιωματα ροκε· η pop τα επαναφερει απο την εγγραφη αναιρεσης
+        lost = self.castling & (CASTLING_LOSS[source] | CASTLING_LOSS[destination])
+        if lost:
+            self.key ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[self.castling ^ lost]
+            self.castling ^= lost
+
+        # Το τετραγωνο en passant ισχυει μονο για μια κινηση
+        if self.en_passant:
+            self.key ^= EN_PASSANT_KEYS[self.en_passant[1]]
+            self.en_passant = None
 
-            # Επαναφερουμε τις αρχικες συντεταγμενες του πιονιου
-            piece.row, piece.col = old_row, old_col
-            return False
-    
         piece.moved = True # Το πιονι έχει πλεον μετακινηθει
+        if self.turn is Color.BLACK:
+            self.fullmove += 1
         self.turn = self.turn.opposite # Εναλλαγη σειρας παιχτη
-        return True
-    
+        self.key ^= TURN_KEY
+
+        # Μετρητης 50 κινησεων, επαναληψεις και σαχ/ματ/πατ της νεας θεσης (υπολογιζεται οταν ζητηθει)
+        self.halfmove = 0 if captured or piece.kind is PieceType.PAWN else self.halfmove + 1
+        self.repetitions[self.key] = self.repetitions.get(self.key, 0) + 1
+        self.terminal = None
+
+    # Αναιρει την τελευταια κινηση και την επιστρεφει
+    def pop(self) -> int:
+        undo = self.history.pop()
+        source, destination = undo.move & 63, undo.move >> 6
+        count = self.repetitions[self.key] - 1
+        if count:
+            self.repetitions[self.key] = count
+        else:
+            del self.repetitions[self.key]
+        piece = self.sq[destination >> 3][destination & 7]
+
+        # Επαναφερουμε το πιονι στην αρχικη του θεση και οτι υπηρχε στον προορισμο
+        self._relocate(piece, source >> 3, source & 7)
+        if undo.captured:
+            self._place(undo.captured)
+
+        piece.moved = undo.moved
+        if undo.turn is Color.BLACK:
+            self.fullmove -= 1
+        self.turn = undo.turn
+        self.key ^= TURN_KEY
+        if self.castling != undo.castling:
+            self.key ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[undo.castling]
+            self.castling = undo.castling
+        if self.en_passant != undo.en_passant:
+            if self.en_passant:
+                self.key ^= EN_PASSANT_KEYS[self.en_passant[1]]
+            if undo.en_passant:
+                self.key ^= EN_PASSANT_KEYS[undo.en_passant[1]]
+            self.en_passant = undo.en_passant
+        self.halfmove = undo.halfmove
+        self.terminal = undo.terminal
+        return undo.move
+
     # --------------------------------------------------------------------- #
     #  Επιτρεπτες κινησεις
     # --------------------------------------------------------------------- #
@@ -233,70 +669,195 @@ class Board:
 
         return moves # Επιστρεφει ολες τις νομιμες κινησεις
     
+    # --------------------------------------------------------------------- #
+    #  Επιθεσεις σε τετραγωνο
+    # --------------------------------------------------------------------- #
+    # Παραγει τις θεσεις των κομματιων του color που απειλουν το square.
+    # Ξεκιναμε απο το ιδιο το τετραγωνο και κοιταμε προς τα εξω (ιππος, βασιλιας, πιονι, ακτινες)
+    # αντι να παραγουμε τις κινησεις ολων των αντιπαλων κομματιων
+    def _iter_attackers(self, square: tuple[int, int], color: Color):
+        r, c = square
+        sq = self.sq
+
+        # Ιπποι
+        for delta_row, delta_col in KNIGHT_DELTAS:
+            new_row, new_col = r + delta_row, c + delta_col
+            if 0 <= new_row <= 7 and 0 <= new_col <= 7:
+                piece = sq[new_row][new_col]
+                if piece and piece.color is color and piece.kind is PieceType.KNIGHT:
+                    yield (new_row, new_col)
+
+        # Βασιλιας
+        for delta_row, delta_col in KING_DELTAS:
+            new_row, new_col = r + delta_row, c + delta_col
+            if 0 <= new_row <= 7 and 0 <= new_col <= 7:
+                piece = sq[new_row][new_col]
+                if piece and piece.color is color and piece.kind is PieceType.KING:
+                    yield (new_row, new_col)
+
+        # Πιονια: ενα λευκο πιονι απειλει απο την απο κατω γραμμη, ενα μαυρο απο την απο πανω
+        pawn_row = r + 1 if color is Color.WHITE else r - 1
+        if 0 <= pawn_row <= 7:
+            for new_col in (c - 1, c + 1):
+                if 0 <= new_col <= 7:
+                    piece = sq[pawn_row][new_col]
+                    if piece and piece.color is color and piece.kind is PieceType.PAWN:
+                        yield (pawn_row, new_col)
+
+        # Αξιωματικοι - Πυργοι - Βασιλισσες: το πρωτο κομματι σε καθε ακτινα
+        for directions, slider in ((DIAGONAL_DIRECTIONS, PieceType.BISHOP), (STRAIGHT_DIRECTIONS, PieceType.ROOK)):
+            for delta_row, delta_col in directions:
+                new_row, new_col = r + delta_row, c + delta_col
+                while 0 <= new_row <= 7 and 0 <= new_col <= 7:
+                    piece = sq[new_row][new_col]
+                    if piece:
+                        if piece.color is color and (piece.kind is slider or piece.kind is PieceType.QUEEN):
+                            yield (new_row, new_col)
+                        break
+                    new_row += delta_row
+                    new_col += delta_col
+
+    # Επιστρεφει τις θεσεις ολων των κομματιων του color που απειλουν το square
+    def attackers_of(self, square: tuple[int, int], color: Color) -> list[tuple[int, int]]:
+        return list(self._iter_attackers(square, color))
+
+    # Ελεγχει αν το square απειλειται απο τουλαχιστον ενα κομματι του color
+    def is_square_attacked(self, square: tuple[int, int], color: Color) -> bool:
+        return next(self._iter_attackers(square, color), None) is not None
+
     # --------------------------------------------------------------------- #
     #  Ελεγχος βασιλια
     # --------------------------------------------------------------------- #
     def king_in_check(self, color: Color) -> bool:
-        king_position = None
+        king_position = self.kings.get(color)
 
-         # Εντοπιζουμε τη θεση του βασιλια
-        for r in range(8):
-            for c in range(8):
-                piece = self.sq[r][c]
-                if piece and piece.color == color and piece.kind == PieceType.KING:
-                    king_position = (r, c)
-                    break
-            if king_position:
-                break
-        
         # Σφαλμα στο στησιμο της σκακιερας (αν δεν βρεθει ο βασιλιας στην σκακερια)
         if not king_position:
             return False
-        
+
         # Ελεγχει αν καποιο αντιπαλο κομματι μπορει να τον φαει
-        for r in range(8):
-            for c in range(8):
-                attacker = self.sq[r][c]
-                if attacker and attacker.color != color:
-                    targets = self.legal_moves(attacker)
-                    if king_position in targets:
-                        return True
+        return self.is_square_attacked(king_position, color.opposite)
+
+    # --------------------------------------------------------------------- #
+    #  Καρφωμενα κομματια
+    # --------------------------------------------------------------------- #
+    # Επιστρεφει {θεση καρφωμενου κομματιου: κατευθυνση καρφωματος} για τα κομματια του color.
+    # Ενα κομματι ειναι καρφωμενο αν ειναι το μονο κομματι αναμεσα στον βασιλια και σε αντιπαλο
+    # αξιωματικο/πυργο/βασιλισσα της ιδιας ακτινας
+    def _pins(self, king: tuple[int, int], color: Color) -> dict[tuple[int, int], tuple[int, int]]:
+        pins = {}
+        sq = self.sq
+        for directions, slider in ((DIAGONAL_DIRECTIONS, PieceType.BISHOP), (STRAIGHT_DIRECTIONS, PieceType.ROOK)):
+            for delta_row, delta_col in directions:
+                new_row, new_col = king[0] + delta_row, king[1] + delta_col
+                blocker = None
+                while 0 <= new_row <= 7 and 0 <= new_col <= 7:
+                    piece = sq[new_row][new_col]
+                    if piece:
+                        if piece.color is color:
+                            # Δευτερο δικο μας κομματι στην ακτινα: κανενα καρφωμα
+                            if blocker:
+                                break
+                            blocker = (new_row, new_col)
+                        else:
+                            if blocker and (piece.kind is slider or piece.kind is PieceType.QUEEN):
+                                pins[blocker] = (delta_row, delta_col)
+                            break
+                    new_row += delta_row
+                    new_col += delta_col
+        return pins
+
+    # Ελεγχει αν ο βασιλιας μπορει να παει στο (row, col) χωρις να απειλειται.
+    # Ο βασιλιας αφαιρειται προσωρινα ωστε να μην "κρυβει" τις ακτινες που περνουν απο τη θεση του
+    def _king_move_safe(self, king: Piece, row: int, col: int) -> bool:
+        self.sq[king.row][king.col] = None
+        safe = not self.is_square_attacked((row, col), king.color.opposite)
+        self.sq[king.row][king.col] = king
+        return safe
+
+    # --------------------------------------------------------------------- #
+    #  Ολες οι νομιμες κινησεις ενος παικτη
+    # --------------------------------------------------------------------- #
+    # Επιστρεφει ολες τις νομιμες κινησεις του color ως ακεραιους (βλ. encode_move).
+    # Τα καρφωματα και τα σαχ υπολογιζονται μια φορα στην αρχη, ωστε να μην παραγονται
+    # ποτε παρανομες κινησεις και να μη χρειαζεται δοκιμαστικη κινηση για καθε υποψηφια
+    def generate_legal_moves(self, color: Color) -> list[int]:
+        moves = []
+        sq = self.sq
+        king_position = self.kings.get(color)
+
+        # Τα κομματια του color με τη σειρα των τετραγωνων (ιδια σειρα κινησεων με μια σαρωση της σκακιερας)
+        own = self.pieces[color]
+        squares = sorted(own)
+
+        # Χωρις βασιλια (σφαλμα στο στησιμο) καθε ψευδο-νομιμη κινηση θεωρειται νομιμη
+        if not king_position:
+            for s in squares:
+                for new_row, new_col in self.legal_moves(own[s]):
+                    moves.append(encode_move(s >> 3, s & 7, new_row, new_col))
+            return moves
+
+        king_row, king_col = king_position
+        king = sq[king_row][king_col]
+
+        # Κινησεις του βασιλια: ο προορισμος δεν πρεπει να απειλειται
+        for new_row, new_col in self.legal_moves(king):
+            if self._king_move_safe(king, new_row, new_col):
+                moves.append(encode_move(king_row, king_col, new_row, new_col))
+
+        checkers = self.attackers_of(king_position, color.opposite)
+
+        # Διπλο σαχ: μονο ο βασιλιας μπορει να κινηθει
+        if len(checkers) > 1:
+            return moves
+
+        # Απλο σαχ: τα αλλα κομματια μπορουν μονο να φανε τον επιτιθεμενο ή να μπουν αναμεσα
+        evasions = None
+        if checkers:
+            checker_row, checker_col = checkers[0]
+            evasions = {(checker_row, checker_col)}
+            if sq[checker_row][checker_col].kind in {PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN}:
+                delta_row = (checker_row > king_row) - (checker_row < king_row)
+                delta_col = (checker_col > king_col) - (checker_col < king_col)
+                new_row, new_col = king_row + delta_row, king_col + delta_col
+                while (new_row, new_col) != (checker_row, checker_col):
+                    evasions.add((new_row, new_col))
+                    new_row += delta_row
+                    new_col += delta_col
+
+        pins = self._pins(king_position, color)
+
+        for s in squares:
+            piece = own[s]
+            if piece is king:
+                continue
+            r, c = s >> 3, s & 7
+            pin = pins.get((r, c))
+            for new_row, new_col in self.legal_moves(piece):
+                if evasions is not None and (new_row, new_col) not in evasions:
+                    continue
+                # Ενα καρφωμενο κομματι κινειται μονο πανω στη γραμμη βασιλια - επιτιθεμενου
+                if pin and (new_row - king_row) * pin[1] != (new_col - king_col) * pin[0]:
+                    continue
+                moves.append(encode_move(r, c, new_row, new_col))
+        return moves
 
-        return False
-    
     # --------------------------------------------------------------------- #
     #  Ελεγχος διαθεσιμων νoμιμων κινησεων
     # --------------------------------------------------------------------- #
     def has_legal_moves(self, color: Color) -> bool:
         # Ελεγχει αν ο παικτης με το δοσμενο χρωμα έχει τουλαχιστον μια νομιμη κινηση
-        for r in range(8):
-            for c in range(8):
-                piece = self.sq[r][c]
-                if piece and piece.color == color:
-                    # Ελεγχουμε καθε νομιμη κινηση για αυτο το κομματι
-                    for (new_row, new_col) in self.legal_moves(piece):
-                        # Αποθηκευουμε τι υπαρχει στην νεα θεση (μπορει να ειναι εχθρος ή κενο)
-                        captured = self.sq[new_row][new_col]
-
-                        # Προσωρινα κανουμε την κινηση (μεταφερουμε το κομματι)
-                        self.sq[piece.row][piece.col] = None
-                        self.sq[new_row][new_col] = piece
-
-                        # Αποθηκευουμε την παλια θεση του κομματιου
-                        old_row, old_col = piece.row, piece.col
-                        piece.row, piece.col = new_row, new_col
-
-                        # Ελεγχουμε αν μετα την κινηση ο βασιλιας είναι σε σαχ
-                        in_check = self.king_in_check(color)
-
-                        # Επαναφερουμε τα παντα στην προηγουμενη κατασταση (undo)
-                        self.sq[old_row][old_col] = piece
-                        self.sq[new_row][new_col] = captured
-                        piece.row, piece.col = old_row, old_col
-
-                        # Αν η κινηση δεν οδηγει σε σαχ, τοτε ειναι εγκυρη
-                        if not in_check:
-                            return True # Υπαρχει Τουλαχιστον μια νομιμη κινηση
-                        
-        # Αν δεν βρεθηκε καμια νομιμη κινηση, επιστρεφει False
-        return False
\ No newline at end of file
+        return bool(self.generate_legal_moves(color))
+
+    # --------------------------------------------------------------------- #
+    #  Κατασταση παρτιδας
+    # --------------------------------------------------------------------- #
+    # Σαχ, ματ, πατ, επαναληψεις και μετρητης 50 κινησεων της τρεχουσας θεσης. Οι επαναληψεις και ο
+    # μετρητης ενημερωνονται σε καθε push/pop. Το σαχ/ματ/πατ υπολογιζεται μια φορα ανα θεση (με τις
+    # νομιμες κινησεις legal, αν τις εχει ηδη ο καλων) και επανερχεται απο τη στοιβα αναιρεσης στο pop
+    def status(self, legal: Optional[list[int]] = None) -> Status:
+        if self.terminal is None:
+            check = self.king_in_check(self.turn)
+            moves = bool(legal) if legal is not None else self.has_legal_moves(self.turn)
+            self.terminal = (check, check and not moves, not check and not moves)
+        return Status(*self.terminal, self.repetitions.get(self.key, 1), self.halfmove)
\ No newline at end of file
@@ -0,0 +1,216 @@
+import argparse
+import mmap
+import multiprocessing as mp
+import os
+import random
+import struct
+import sys
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, NamedTuple, Optional
+
+import config
+from board import Board, Color, STARTING_FEN, move_to_uci
+from bitboard import BitBoard
+from pgn import iter_pgn_texts, parse_game, move_from_san, move_to_san, chunks
+
+# Κλαση σκακιερας για την αναπαραγωγη των παρτιδων του βιβλιου
+BOARD = BitBoard if config.board_backend == "bitboard" else Board
+
+# --------------------------------------------------------------------- #
+#  Βιβλιο ανοιγματων (σαν το Polyglot): ταξινομημενες εγγραφες 16 bytes
+#  (κλειδι Zobrist, κινηση, βαρος, πληθος), big endian ωστε η σειρα των
+#  bytes να ειναι και σειρα των κλειδιων. Οι κινησεις μιας θεσης ειναι
+#  συνεχομενες, με το μεγαλυτερο βαρος πρωτο
+# --------------------------------------------------------------------- #
+ENTRY = struct.Struct(">QHHI")
+KEY = struct.Struct(">Q")
+
+class BookMove(NamedTuple):
+    move: int
+    weight: int # 2 * νικες + ισοπαλιες για τον παικτη που εκανε την κινηση
+    count: int # Ποσες φορες παιχτηκε
+
+
+# --------------------------------------------------------------------- #
+#  Κατασκευη απο PGN
+# --------------------------------------------------------------------- #
+# Σκορ του αποτελεσματος για καθε χρωμα (νικη 2, ισοπαλια 1, ηττα 0)
+RESULT_POINTS = {
+    "1-0": {Color.WHITE: 2, Color.BLACK: 0},
+    "0-1": {Color.WHITE: 0, Color.BLACK: 2},
+    "1/2-1/2": {Color.WHITE: 1, Color.BLACK: 1},
+}
+
+# Μετραει (κλειδι, κινηση) -> [βαθμοι, πληθος] για τις πρωτες max_ply κινησεις καθε παρτιδας.
+# Παρτιδες με αγνωστο αποτελεσμα μετρανε μονο στο πληθος
+def _count_chunk(texts: list[str], max_ply: int) -> dict:
+    stats = defaultdict(lambda: [0, 0])
+    for text in texts:
+        game = parse_game(text)
+        points = RESULT_POINTS.get(game.result)
+        board = BOARD.from_fen(game.start_fen)
+        for san in game.moves[:max_ply]:
+            try:
+                move = move_from_san(board, san)
+            except ValueError:
+                break
+            entry = stats[(board.key, move)]
+            if points:
+                entry[0] += points[board.turn]
+            entry[1] += 1
+            board.push(move)
+    return dict(stats)
+
+def build_book(texts: Iterable[str], path: str, max_ply: int = 20, min_count: int = 1,
+               workers: Optional[int] = None, chunk_size: int = 500) -> int:
+    workers = workers or config.search_workers
+    stats = defaultdict(lambda: [0, 0])
+
+    def merge(chunk_stats: dict):
+        for key, (points, count) in chunk_stats.items():
+            entry = stats[key]
+            entry[0] += points
+            entry[1] += count
+
+    if workers == 1:
+        for chunk in chunks(texts, chunk_size):
+            merge(_count_chunk(chunk, max_ply))
+    else:
+        # Οπως στο pgn.replay: λιγα κομματια "στον αερα" ωστε η μνημη να μην εξαρταται απο το μεγεθος του αρχειου
+        with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn")) as pool:
+            pending = deque()
+            for chunk in chunks(texts, chunk_size):
+                pending.append(pool.submit(_count_chunk, chunk, max_ply))
+                if len(pending) >= workers * 2:
+                    merge(pending.popleft().result())
+            while pending:
+                merge(pending.popleft().result())
+
+    entries = [(key, move, points, count) for (key, move), (points, count) in stats.items() if count >= min_count]
+    # Τα βαρη πρεπει να χωρανε σε 16 bits: κλιμακωνονται αναλογα αν χρειαστει
+    scale = max((points for _, _, points, _ in entries), default=0) / 0xFFFF
+    entries.sort(key=lambda e: (e[0], -e[2], e[1]))
+    with open(path, "wb") as f:
+        for key, move, points, count in entries:
+            weight = int(points / scale) if scale > 1 else points
+            f.write(ENTRY.pack(key, move, weight, min(count, 0xFFFFFFFF)))
+    return len(entries)
+
+
+# --------------------------------------------------------------------- #
+#  Αναγνωση με mmap και δυαδικη αναζητηση
+# --------------------------------------------------------------------- #
+class OpeningBook:
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        if size % ENTRY.size:
+            raise ValueError(f"Μη εγκυρο αρχειο βιβλιου: {path}")
+        self.count = size // ENTRY.size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _key_at(self, i: int) -> int:
+        return KEY.unpack_from(self.map, i * ENTRY.size)[0]
+
+    # Ολες οι εγγραφες του κλειδιου (ταξινομημενες κατα βαρος)
+    def probe(self, key: int) -> list[BookMove]:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        moves = []
+        while low < self.count:
+            entry_key, move, weight, count = ENTRY.unpack_from(self.map, low * ENTRY.size)
+            if entry_key != key:
+                break
+            moves.append(BookMove(move, weight, count))
+            low += 1
+        return moves
+
+    # Κινησεις του βιβλιου για τη θεση της board (μονο νομιμες, σε περιπτωση συγκρουσης κλειδιων)
+    def moves(self, board: Board) -> list[BookMove]:
+        entries = self.probe(board.key)
+        if not entries:
+            return []
+        legal = set(board.generate_legal_moves(board.turn))
+        return [entry for entry in entries if entry.move in legal]
+
+    # Τυχαια κινηση αναλογα με το βαρος (ή το πληθος αν ολα τα βαρη ειναι 0), ή None
+    def choose(self, board: Board, rng: random.Random = random) -> Optional[int]:
+        entries = self.moves(board)
+        if not entries:
+            return None
+        weights = [entry.weight for entry in entries]
+        if not any(weights):
+            weights = [entry.count for entry in entries]
+        return rng.choices([entry.move for entry in entries], weights)[0]
+
+    def close(self):
+        if self.map:
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Ανοιγει το βιβλιο του config, αν υπαρχει
+def open_book(path=None) -> Optional[OpeningBook]:
+    path = path or config.book_path
+    if not path or not os.path.exists(path):
+        return None
+    return OpeningBook(str(path))
+
+# Κειμενο για εμφανιση, π.χ. "Nf3 52%  e3 31%  c3 17%"
+def book_text(board: Board, entries: list[BookMove]) -> str:
+    weights = [entry.weight for entry in entries]
+    if not any(weights):
+        weights = [entry.count for entry in entries]
+    total = sum(weights) or 1
+    return "  ".join(f"{move_to_san(board, entry.move)} {weight * 100 // total}%" for entry, weight in zip(entries, weights))
+
+
+# --------------------------------------------------------------------- #
+#  python book.py build games.pgn book.bin [--max-ply 20] [--min-count 2]
+#  python book.py probe book.bin [--fen ...]
+# --------------------------------------------------------------------- #
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Βιβλιο ανοιγματων")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build", help="Κατασκευη βιβλιου απο αρχειο PGN")
+    p.add_argument("pgn")
+    p.add_argument("book")
+    p.add_argument("--max-ply", type=int, default=20)
+    p.add_argument("--min-count", type=int, default=1)
+    p.add_argument("--workers", type=int, default=config.search_workers)
+
+    p = sub.add_parser("probe", help="Κινησεις του βιβλιου για μια θεση")
+    p.add_argument("book")
+    p.add_argument("--fen", default=STARTING_FEN)
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        entries = build_book(iter_pgn_texts(args.pgn), args.book, args.max_ply, args.min_count, args.workers)
+        print(f"{entries} εγγραφες στο {args.book}")
+        return 0
+
+    board = BOARD.from_fen(args.fen)
+    with OpeningBook(args.book) as book:
+        for entry in book.moves(board):
+            print(f"{move_to_uci(entry.move)}  {move_to_san(board, entry.move):6s} weight {entry.weight:6d}  count {entry.count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
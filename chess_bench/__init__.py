@@ -0,0 +1 @@
+from chess_bench.perft import perft, divide, reference_perft
@@ -0,0 +1,279 @@
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import config
+from board import Board, STARTING_FEN, move_to_uci
+from bitboard import BitBoard
+from chess_bench.perft import perft, hashed_perft, divide, reference_perft
+from transposition import TranspositionTable
+from chess_bench.positions import REFERENCE_POSITIONS
+from chess_bench import suite
+
+# Διαθεσιμες αναπαραστασεις σκακιερας
+BACKENDS = {"mailbox": Board, "bitboard": BitBoard}
+
+# --------------------------------------------------------------------- #
+#  python -m chess_bench perft --depth N [--fen ...] [--divide]
+# --------------------------------------------------------------------- #
+def cmd_perft(args) -> int:
+    board = BACKENDS[args.backend].from_fen(args.fen)
+    table = TranspositionTable(args.hash) if args.hash else None
+    start = time.perf_counter()
+    if args.divide:
+        result = divide(board, args.depth, table)
+        for move in sorted(result, key=move_to_uci):
+            print(f"{move_to_uci(move)}: {result[move]}")
+        nodes = sum(result.values())
+        print()
+    elif table:
+        nodes = hashed_perft(board, args.depth, table)
+    else:
+        nodes = perft(board, args.depth)
+    elapsed = time.perf_counter() - start
+
+    print(f"Nodes: {nodes}")
+    print(f"Time:  {elapsed:.3f}s")
+    print(f"NPS:   {nodes / elapsed if elapsed else 0:.0f}")
+    if table:
+        stats = table.stats()
+        print(f"Hash:  {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.1%}), {stats['overwrites']} overwrites")
+    return 0
+
+# --------------------------------------------------------------------- #
+#  python -m chess_bench verify: ελεγχος ορθοτητας στις θεσεις αναφορας
+# --------------------------------------------------------------------- #
+def cmd_verify(args) -> int:
+    failures = 0
+    for name, fen, expected in REFERENCE_POSITIONS:
+        for depth, nodes in sorted(expected.items()):
+            if depth > args.max_depth:
+                continue
+            for backend, board_class in BACKENDS.items():
+                got = perft(board_class.from_fen(fen), depth)
+                status = "ok" if got == nodes else "FAIL"
+                failures += got != nodes
+                print(f"{status:4s} {name:14s} {backend:8s} depth {depth}: {got} (expected {nodes})")
+            # Ανεξαρτητος ελεγχος με τον παλιο τροπο παραγωγης κινησεων
+            if args.reference and depth <= 3:
+                got = reference_perft(Board.from_fen(fen), depth)
+                failures += got != nodes
+                print(f"{'ok' if got == nodes else 'FAIL':4s} {name:14s} {'ref':8s} depth {depth}: {got}")
+    return 1 if failures else 0
+
+# --------------------------------------------------------------------- #
+#  python -m chess_bench bench [--save] [--tolerance 0.2]
+# --------------------------------------------------------------------- #
+def cmd_bench(args) -> int:
+    backends = {name: BACKENDS[name] for name in args.backends}
+    results = suite.run_suite(backends, args.only, args.rounds)
+    baselines = suite.load_baselines()
+
+    for backend, benches in results.items():
+        for name, value in benches.items():
+            baseline = baselines.get(backend, {}).get(name)
+            change = f"{(value / baseline - 1) * 100:+6.1f}%" if baseline else "   new"
+            print(f"{backend:8s} {name:22s} {value:12.0f} ops/s  {change}")
+
+    if args.save:
+        # Κραταμε τις μετρησεις αλλων αναπαραστασεων/benchmarks που δεν ετρεξαν τωρα
+        for backend, benches in results.items():
+            baselines.setdefault(backend, {}).update(benches)
+        suite.save_baselines(baselines)
+        print(f"Αποθηκευτηκε στο {suite.BASELINE_FILE}")
+        return 0
+
+    failed = suite.regressions(results, baselines, args.tolerance)
+    for backend, name, value, baseline in failed:
+        print(f"ΠΤΩΣΗ ΑΠΟΔΟΣΗΣ: {backend} {name}: {value:.0f} < {baseline:.0f} ops/s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+# --------------------------------------------------------------------- #
+#  python -m chess_bench scaling --workers 1 2 4 8 --depth N
+#  Χρονος αναζητησης σε σταθερο βαθος για διαφορο πληθος διεργασιων
+# --------------------------------------------------------------------- #
+def cmd_scaling(args) -> int:
+    from engine import Engine
+    from parallel import ParallelSearch
+
+    positions = [(name, fen) for name, fen, _ in REFERENCE_POSITIONS]
+    board_class = BACKENDS[config.board_backend]
+
+    # Σειριακη μηχανη ως σημειο αναφορας
+    rows = []
+    elapsed = nodes = 0
+    for name, fen in positions:
+        result = Engine(table=TranspositionTable(args.hash)).search(board_class.from_fen(fen), args.depth)
+        elapsed += result.elapsed
+        nodes += result.nodes
+    rows.append(("engine", elapsed, nodes))
+
+    for workers in args.workers:
+        with ParallelSearch(workers, table_mb=args.hash * workers) as search:
+            # Ζεσταμα: οι διεργασιες ξεκινουν πριν αρχισει η μετρηση
+            search.search(board_class(), 1)
+            elapsed = nodes = 0
+            for name, fen in positions:
+                result = search.search(board_class.from_fen(fen), args.depth)
+                elapsed += result.elapsed
+                nodes += result.nodes
+        rows.append((f"{workers} workers", elapsed, nodes))
+
+    serial = rows[0][1]
+    print(f"{'':12s} {'time':>9s} {'nodes':>10s} {'nps':>9s} {'speedup':>8s}")
+    for label, elapsed, nodes in rows:
+        print(f"{label:12s} {elapsed:8.2f}s {nodes:10d} {nodes / elapsed:9.0f} {serial / elapsed:7.2f}x")
+    return 0
+
+
+# --------------------------------------------------------------------- #
+#  python -m chess_bench eval --count N
+#  Ελεγχος οτι η batch_eval δινει τις ιδιες τιμες με την evaluation.evaluate
+#  σε τυχαιες θεσεις, και συγκριση ταχυτητας
+# --------------------------------------------------------------------- #
+def cmd_eval(args) -> int:
+    from evaluation import evaluate
+    from batch_eval import encode_boards, evaluate_codes
+    from chess_bench.positions import random_positions
+
+    boards = random_positions(BACKENDS[args.backend], args.count, args.seed)
+
+    start = time.perf_counter()
+    expected = [evaluate(board) for board in boards]
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    codes, black_to_move = encode_boards(boards)
+    encoded = time.perf_counter() - start
+    start = time.perf_counter()
+    got = evaluate_codes(codes, black_to_move)
+    batch = time.perf_counter() - start
+
+    mismatches = [i for i, value in enumerate(expected) if got[i] != value]
+    for i in mismatches[:10]:
+        print(f"FAIL {boards[i].fen()}: evaluate {expected[i]}, batch {got[i]}", file=sys.stderr)
+    print(f"Positions: {len(boards)}, mismatches: {len(mismatches)}")
+    print(f"evaluate:       {len(boards) / scalar:10.0f} positions/s")
+    print(f"evaluate_codes: {len(boards) / batch:10.0f} positions/s (+ encode_boards {len(boards) / encoded:.0f}/s)")
+    return 1 if mismatches else 0
+
+
+# --------------------------------------------------------------------- #
+#  python -m chess_bench moves --count N
+#  batch_moves.legal_masks εναντι Board.generate_legal_moves: ιδιες
+#  κινησεις σε καθε θεση και ταχυτητα των δυο δρομων
+# --------------------------------------------------------------------- #
+def cmd_moves(args) -> int:
+    from batch_eval import encode_boards
+    from batch_moves import legal_masks, moves_from_masks
+    from chess_bench.positions import random_positions
+
+    boards = random_positions(BACKENDS[args.backend], args.count, args.seed)
+
+    start = time.perf_counter()
+    expected = [board.generate_legal_moves(board.turn) for board in boards]
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    codes, black_to_move = encode_boards(boards)
+    encoded = time.perf_counter() - start
+    start = time.perf_counter()
+    masks, counts = legal_masks(codes, black_to_move)
+    batch = time.perf_counter() - start
+
+    mismatches = [i for i, moves in enumerate(expected)
+                  if counts[i] != len(moves) or sorted(moves_from_masks(masks[i])) != sorted(moves)]
+    for i in mismatches[:10]:
+        print(f"FAIL {boards[i].fen()}: generate_legal_moves {len(expected[i])}, batch {counts[i]}", file=sys.stderr)
+    moves = sum(len(legal) for legal in expected)
+    print(f"Positions: {len(boards)}, moves: {moves}, mismatches: {len(mismatches)}")
+    print(f"generate_legal_moves: {len(boards) / scalar:10.0f} positions/s")
+    print(f"legal_masks:          {len(boards) / batch:10.0f} positions/s (+ encode_boards {len(boards) / encoded:.0f}/s)")
+    return 1 if mismatches else 0
+
+
+# --------------------------------------------------------------------- #
+#  python -m chess_bench imports
+#  Χρονος φορτωσης καθε module σε καθαρη διεργασια. Τα modules χωρις
+#  γραφικα δεν πρεπει να φορτωνουν PIL ή tkinter, και το gui οχι PIL
+#  (οι εικονες ερχονται ετοιμες απο το cache των sprites)
+# --------------------------------------------------------------------- #
+HEADLESS_MODULES = ["board", "bitboard", "evaluation", "batch_eval", "batch_moves", "engine", "parallel", "worker",
+                    "pgn", "book", "position_store", "tablebase", "instrument", "server", "archive"]
+
+IMPORT_PROBE = ("import sys, time; start = time.perf_counter(); import {module}; "
+                "print(time.perf_counter() - start, 'PIL' in sys.modules, 'tkinter' in sys.modules)")
+
+def cmd_imports(args) -> int:
+    root = Path(__file__).resolve().parent.parent
+    failures = 0
+    for module in HEADLESS_MODULES + ["gui"]:
+        times = []
+        for _ in range(args.rounds):
+            output = subprocess.run([sys.executable, "-c", IMPORT_PROBE.format(module=module)], cwd=root,
+                                    capture_output=True, text=True, check=True).stdout.split()
+            times.append(float(output[0]))
+        uses_pil, uses_tk = output[1] == "True", output[2] == "True"
+        failed = uses_pil or (uses_tk and module != "gui")
+        failures += failed
+        print(f"{'FAIL' if failed else 'ok':4s} {module:15s} {min(times) * 1000:8.1f} ms"
+              f"  PIL: {'ναι' if uses_pil else 'οχι':3s}  tkinter: {'ναι' if uses_tk else 'οχι'}")
+    return 1 if failures else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="chess_bench", description="Perft και benchmarks για την board.Board")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("perft", help="Μετρηση κομβων του δεντρου κινησεων")
+    p.add_argument("--depth", type=int, default=3)
+    p.add_argument("--fen", default=STARTING_FEN)
+    p.add_argument("--divide", action="store_true", help="Πληθος κομβων ανα κινηση της ριζας")
+    p.add_argument("--backend", choices=BACKENDS, default=config.board_backend)
+    p.add_argument("--hash", type=float, default=0, metavar="MB", help="Perft με πινακα μεταθεσεων αυτου του μεγεθους")
+    p.set_defaults(func=cmd_perft)
+
+    p = sub.add_parser("verify", help="Ελεγχος perft στις θεσεις αναφορας")
+    p.add_argument("--max-depth", type=int, default=3)
+    p.add_argument("--reference", action="store_true", help="Συγκριση και με τον αργο ελεγχο αναφορας")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("bench", help="Μετρηση αποδοσης και συγκριση με τα baselines")
+    p.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    p.add_argument("--only", nargs="+", choices=suite.BENCHMARKS, help="Μονο αυτα τα benchmarks")
+    p.add_argument("--rounds", type=int, default=5)
+    p.add_argument("--tolerance", type=float, default=0.2, help="Επιτρεπτη πτωση (0.2 = 20%%)")
+    p.add_argument("--save", action="store_true", help="Αποθηκευση των μετρησεων ως νεα baselines")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("scaling", help="Κλιμακωση της παραλληλης αναζητησης με το πληθος διεργασιων")
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    p.add_argument("--depth", type=int, default=4)
+    p.add_argument("--hash", type=float, default=16, metavar="MB", help="Πινακας μεταθεσεων ανα διεργασια")
+    p.set_defaults(func=cmd_scaling)
+
+    p = sub.add_parser("eval", help="Συγκριση batch_eval με evaluation.evaluate σε τυχαιες θεσεις")
+    p.add_argument("--count", type=int, default=5000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--backend", choices=BACKENDS, default=config.board_backend)
+    p.set_defaults(func=cmd_eval)
+
+    p = sub.add_parser("moves", help="Συγκριση batch_moves με generate_legal_moves σε τυχαιες θεσεις")
+    p.add_argument("--count", type=int, default=5000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--backend", choices=BACKENDS, default=config.board_backend)
+    p.set_defaults(func=cmd_moves)
+
+    p = sub.add_parser("imports", help="Χρονος φορτωσης των modules (χωρις PIL/tkinter εκτος GUI)")
+    p.add_argument("--rounds", type=int, default=3)
+    p.set_defaults(func=cmd_imports)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+from board import Board, encode_move
+from transposition import TranspositionTable
+
+# --------------------------------------------------------------------- #
+#  Perft: μετραει ολους τους κομβους του δεντρου κινησεων σε βαθος depth
+# --------------------------------------------------------------------- #
+def perft(board: Board, depth: int) -> int:
+    if depth == 0:
+        return 1
+    moves = board.generate_legal_moves(board.turn)
+
+    # Στο τελευταιο επιπεδο αρκει το πληθος των κινησεων
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+# Perft με πινακα μεταθεσεων: θεσεις που εμφανιζονται με διαφορετικη σειρα κινησεων μετριουνται μια φορα
+def hashed_perft(board: Board, depth: int, table: TranspositionTable) -> int:
+    if depth <= 1:
+        return perft(board, depth)
+
+    entry = table.probe(board.key)
+    if entry is not None and entry.depth == depth:
+        return entry.score
+
+    nodes = 0
+    for move in board.generate_legal_moves(board.turn):
+        board.push(move)
+        nodes += hashed_perft(board, depth - 1, table)
+        board.pop()
+    table.store(board.key, depth, nodes)
+    return nodes
+
+# Perft ανα κινηση της ριζας (χρησιμο για να βρεθει ποια κινηση δινει λαθος πληθος)
+def divide(board: Board, depth: int, table: TranspositionTable = None) -> dict[int, int]:
+    result = {}
+    for move in board.generate_legal_moves(board.turn):
+        board.push(move)
+        result[move] = hashed_perft(board, depth - 1, table) if table else perft(board, depth - 1)
+        board.pop()
+    return result
+
+# --------------------------------------------------------------------- #
+#  Perft αναφορας: ψευδο-νομιμες κινησεις ανα κομματι + δοκιμαστικη κινηση
+#  και king_in_check (ο παλιος τροπος ελεγχου). Αργο, αλλα ανεξαρτητο απο
+#  την generate_legal_moves, ωστε να ελεγχεται η ορθοτητα της
+# --------------------------------------------------------------------- #
+def reference_moves(board: Board) -> list[int]:
+    color = board.turn
+    moves = []
+    for r in range(8):
+        for c in range(8):
+            piece = board.piece_at(r, c)
+            if piece and piece.color is color:
+                for new_row, new_col in board.legal_moves(piece):
+                    move = encode_move(r, c, new_row, new_col)
+                    board.push(move)
+                    if not board.king_in_check(color):
+                        moves.append(move)
+                    board.pop()
+    return moves
+
+def reference_perft(board: Board, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in reference_moves(board):
+        board.push(move)
+        nodes += reference_perft(board, depth - 1)
+        board.pop()
+    return nodes
@@ -0,0 +1,60 @@
+import random
+
+# --------------------------------------------------------------------- #
+#  Θεσεις αναφορας για perft
+#  Τα πληθη κομβων αντιστοιχουν στους κανονες της board.Board (χωρις ροκε,
+#  en passant, προαγωγη και διπλο βημα πιονιου), οποτε διαφερουν απο τους
+#  γνωστους πινακες perft του πληρους σκακιου. Υπολογιστηκαν με την
+#  perft.reference_perft και συμφωνουν και στις δυο αναπαραστασεις.
+# --------------------------------------------------------------------- #
+REFERENCE_POSITIONS = [
+    (
+        "start",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        {1: 12, 2: 144, 3: 2124, 4: 31250},
+    ),
+    (
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        {1: 44, 2: 1740, 3: 77305},
+    ),
+    (
+        "rook-endgame",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        {1: 12, 2: 148, 3: 2012, 4: 29373},
+    ),
+    (
+        "pins",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        {1: 5, 2: 178, 3: 5741},
+    ),
+    (
+        "middlegame",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        {1: 44, 2: 1898, 3: 78191},
+    ),
+    (
+        "checks",
+        "4k3/8/8/8/1b6/8/3N4/R3K2r w - - 0 1",
+        {1: 2, 2: 54, 3: 1159, 4: 28162},
+    ),
+]
+
+
+# --------------------------------------------------------------------- #
+#  Τυχαιες θεσεις: τυχαιες παρτιδες απο τις θεσεις αναφορας, κρατωντας
+#  τη θεση μετα απο καθε κινηση (για ελεγχους συμφωνιας και benchmarks)
+# --------------------------------------------------------------------- #
+def random_positions(board_class, count: int, seed: int = 0, max_plies: int = 80) -> list:
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        _, fen, _ = rng.choice(REFERENCE_POSITIONS)
+        board = board_class.from_fen(fen)
+        for _ in range(rng.randint(1, max_plies)):
+            moves = board.generate_legal_moves(board.turn)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        boards.append(board)
+    return boards
@@ -0,0 +1,120 @@
+import json
+import time
+from pathlib import Path
+
+from board import Board
+from chess_bench.perft import perft
+from chess_bench.positions import REFERENCE_POSITIONS
+
+# Αρχειο με τις αποθηκευμενες αποδοσεις (λειτουργιες / δευτερολεπτο) ανα αναπαρασταση και benchmark
+BASELINE_FILE = Path(__file__).parent / "baselines.json"
+
+# --------------------------------------------------------------------- #
+#  Benchmarks: καθε συναρτηση εκτελει μια "γυρα" πανω στις θεσεις αναφορας
+#  και επιστρεφει ποσες λειτουργιες εκανε
+# --------------------------------------------------------------------- #
+def _pieces(board: Board):
+    return [p for row in board.sq for p in row if p]
+
+def bench_legal_moves(boards: list[Board]) -> int:
+    ops = 0
+    for board in boards:
+        for piece in _pieces(board):
+            board.legal_moves(piece)
+            ops += 1
+    return ops
+
+def bench_king_in_check(boards: list[Board]) -> int:
+    ops = 0
+    for board in boards:
+        board.king_in_check(board.turn)
+        board.king_in_check(board.turn.opposite)
+        ops += 2
+    return ops
+
+def bench_has_legal_moves(boards: list[Board]) -> int:
+    ops = 0
+    for board in boards:
+        board.has_legal_moves(board.turn)
+        board.has_legal_moves(board.turn.opposite)
+        ops += 2
+    return ops
+
+def bench_generate_legal_moves(boards: list[Board]) -> int:
+    for board in boards:
+        board.generate_legal_moves(board.turn)
+    return len(boards)
+
+# Board.move (με ολους τους ελεγχους νομιμοτητας) για καθε ψευδο-νομιμη κινηση, με αναιρεση
+def bench_move(boards: list[Board]) -> int:
+    ops = 0
+    for board in boards:
+        for piece in _pieces(board):
+            if piece.color is not board.turn:
+                continue
+            source_row, source_col = piece.row, piece.col
+            for destination_row, destination_col in board.legal_moves(piece):
+                if board.move(source_row, source_col, destination_row, destination_col):
+                    board.pop()
+                ops += 1
+    return ops
+
+# Κομβοι perft βαθους 2 (μετραει ολο το κυκλωμα παραγωγης - push - pop)
+def bench_perft(boards: list[Board]) -> int:
+    return sum(perft(board, 2) for board in boards)
+
+BENCHMARKS = {
+    "legal_moves": bench_legal_moves,
+    "king_in_check": bench_king_in_check,
+    "has_legal_moves": bench_has_legal_moves,
+    "generate_legal_moves": bench_generate_legal_moves,
+    "move": bench_move,
+    "perft": bench_perft,
+}
+
+# --------------------------------------------------------------------- #
+#  Εκτελεση και συγκριση με τις αποθηκευμενες τιμες
+# --------------------------------------------------------------------- #
+# Τρεχει ενα benchmark για rounds γυρες και επιστρεφει την καλυτερη αποδοση (λειτουργιες / δευτερολεπτο)
+def run_benchmark(board_class, name: str, rounds: int = 5, min_time: float = 0.2) -> float:
+    bench = BENCHMARKS[name]
+    boards = [board_class.from_fen(fen) for _, fen, _ in REFERENCE_POSITIONS]
+    best = 0.0
+    for _ in range(rounds):
+        ops, start = 0, time.perf_counter()
+        while True:
+            ops += bench(boards)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, ops / elapsed)
+    return best
+
+def run_suite(backends: dict, names=None, rounds: int = 5) -> dict[str, dict[str, float]]:
+    names = names or list(BENCHMARKS)
+    return {
+        backend: {name: run_benchmark(board_class, name, rounds) for name in names}
+        for backend, board_class in backends.items()
+    }
+
+def load_baselines(path: Path = BASELINE_FILE) -> dict:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_baselines(results: dict, path: Path = BASELINE_FILE):
+    with open(path, "w") as f:
+        rounded = {backend: {name: round(value) for name, value in benches.items()} for backend, benches in results.items()}
+        json.dump(rounded, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+# Επιστρεφει τις μετρησεις που επεσαν περισσοτερο απο tolerance (π.χ. 0.2 = 20%) κατω απο το baseline
+def regressions(results: dict, baselines: dict, tolerance: float) -> list[tuple[str, str, float, float]]:
+    failed = []
+    for backend, benches in results.items():
+        for name, value in benches.items():
+            baseline = baselines.get(backend, {}).get(name)
+            if baseline and value < baseline * (1 - tolerance):
+                failed.append((backend, name, value, baseline))
+    return failed
@@ -1,5 +1,63 @@
 import pathlib
 
+# --------------- Λογικη παιχνιδιου --------------- #
+# Αναπαρασταση σκακιερας: "mailbox" (board.Board, πινακας 8x8) ή "bitboard" (bitboard.BitBoard)
+board_backend = "bitboard"
+
+# Μεγεθος πινακα μεταθεσεων (MB) και πολιτικη αντικαταστασης ("depth" ή "always")
+tt_size_mb = 16
+tt_replacement = "depth"
+
+# --------------- Μηχανη (engine) --------------- #
+# Πληθος διεργασιων για την παραλληλη αναζητηση (parallel.ParallelSearch)
+search_workers = 4
+
+# Χρωμα που παιζει η μηχανη: "w" (λευκα), "b" (μαυρα) ή None (δυο ανθρωποι)
+engine_color = None
+
+# Δυναμη μηχανης: μεγιστο βαθος (μισες κινησεις) και χρονος σκεψης ανα κινηση (δευτερολεπτα)
+engine_depth = 4
+engine_time = 2.0
+
+# Συνεχης αναλυση της θεσης οταν παιζει ο ανθρωπος (βαθος, τιμη και κυρια παραλλαγη στο πλαισιο)
+engine_analysis = False
+
+# Καθε ποσα ms το GUI ελεγχει για μηνυματα απο τη διεργασια της μηχανης
+engine_poll_ms = 50
+
+# Βιβλιο ανοιγματων (κατασκευαζεται με "python book.py build"). Αν λειπει το αρχειο, η μηχανη ψαχνει απο την αρχη
+book_path = pathlib.Path(__file__).parent / "assets" / "book.bin"
+
+# Tablebases για φιναλε με λιγα κομματια (κατασκευαζονται με "python tablebase.py generate KQvK KRvK KBNvK KPvK")
+tablebase_directory = pathlib.Path(__file__).parent / "assets" / "tablebases"
+
+# Ποσες θεσεις (νομιμες κινησεις, σαχ, ματ/πατ) κραταει το GUI στη μνημη
+legal_cache_size = 256
+
+# --------------- Αρχειο παρτιδων (archive.py) --------------- #
+# Καθε ποσες μισες κινησεις αποθηκευεται ολοκληρη η θεση (η μεταβαση σε οποιαδηποτε θεση
+# μιας παρτιδας παιζει το πολυ τοσες κινησεις απο το πλησιεστερο checkpoint)
+archive_checkpoint_interval = 16
+
+# --------------- Game server (server.py) --------------- #
+server_host = "127.0.0.1"
+server_port = 8765
+
+# Διεργασιες για την αναλυση των νεων θεσεων (0: στο ιδιο το event loop) και ποσες θεσεις κρατιουνται στο cache
+server_workers = 2
+server_cache_size = 10000
+
+# --------------- Μετρησεις (instrument.py) --------------- #
+# Μετρηση κλησεων και χρονου στη σκακιερα και στο GUI (και με τη μεταβλητη περιβαλλοντος CHESS_INSTRUMENT=1)
+instrumentation = False
+
+# Αρχειο οπου γραφονται οι μετρησεις στο κλεισιμο: .json ή αρχειο pstats (π.χ. "session.prof"), None για καθολου
+instrumentation_output = None
+
+# Πλαισιο με τις μετρησεις πανω στη σκακιερα (εναλλαγη με F2) και καθε ποσα ms ανανεωνεται
+instrumentation_overlay = True
+instrumentation_overlay_ms = 500
+
 # --------------- Εμφανιση σκακιερας --------------- #
 game_title = "Chess Game"
 square_size = 100
@@ -7,6 +65,7 @@ square_size = 100
 light_color = "#f0d9b5"
 dark_color = "#b58863"
 highlight_color = "red"
+target_color = "#6a9955" # Τετραγωνα οπου μπορει να παει το επιλεγμενο κομματι
 check_color = "yellow"
 
 blink_time_when_king_in_check = 300 # (100ms = 0.1 second)
@@ -24,3 +83,7 @@ piece_codes = [
     "wP", "wR", "wN", "wB", "wQ", "wK",
     "bP", "bR", "bN", "bB", "bQ", "bK",
 ]
+
+# Φακελος με τις εικονες σε ετοιμο μεγεθος (δημιουργειται την πρωτη φορα) και ποσες κρατιουνται στη μνημη
+sprite_cache_directory = pathlib.Path(__file__).parent / "assets" / "cache"
+sprite_memory_size = 48
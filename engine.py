@@ -0,0 +1,346 @@
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Optional
+
+from board import Board, PieceType, move_to_uci
+from book import OpeningBook
+from evaluation import PIECE_VALUES, evaluate
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+# Τα tablebases χρειαζονται NumPy: φορτωνονται μονο απο οποιον τα ανοιγει (tablebase.open_tablebases)
+if TYPE_CHECKING:
+    from tablebase import Tablebases, ProbeResult
+
+# --------------------------------------------------------------------- #
+#  Σταθερες αναζητησης
+# --------------------------------------------------------------------- #
+INF = 1_000_000
+MATE = 100_000 # Τιμη ματ (μειωνεται κατα την αποσταση σε μισες κινησεις)
+MATE_BOUND = MATE - 1000 # Τιμες πανω απο αυτο το οριο ειναι ματ
+MAX_PLY = 64
+
+ASPIRATION_WINDOW = 50 # Αρχικο παραθυρο (centipawns) γυρω απο την προηγουμενη τιμη
+TIME_CHECK_NODES = 256 # Καθε ποσους κομβους ελεγχεται ο χρονος
+
+# Σειρα κομματιων για MVV-LVA (φθηνοτερος επιτιθεμενος πρωτα)
+ATTACKER_ORDER = {
+    PieceType.PAWN: 0, PieceType.KNIGHT: 1, PieceType.BISHOP: 2,
+    PieceType.ROOK: 3, PieceType.QUEEN: 4, PieceType.KING: 5,
+}
+
+
+# --------------------------------------------------------------------- #
+#  Αποτελεσμα αναζητησης
+# --------------------------------------------------------------------- #
+@dataclass
+class SearchResult:
+    best_move: Optional[int] # Καλυτερη κινηση (None αν δεν υπαρχουν νομιμες κινησεις)
+    score: int # Τιμη απο την πλευρα του παικτη που παιζει (centipawns ή ματ)
+    depth: int # Βαθος της τελευταιας ολοκληρωμενης επαναληψης
+    pv: list[int] = field(default_factory=list) # Κυρια παραλλαγη
+    nodes: int = 0 # Κομβοι που επισκεφθηκαν
+    elapsed: float = 0.0 # Χρονος σε δευτερολεπτα
+    book: bool = False # Η κινηση βγηκε απο το βιβλιο ανοιγματων (χωρις αναζητηση)
+
+    @property
+    def nps(self) -> int:
+        return int(self.nodes / self.elapsed) if self.elapsed > 0 else 0
+
+    # Κειμενο για εμφανιση (π.χ. "+0.35" ή "M3")
+    def score_text(self) -> str:
+        if abs(self.score) >= MATE_BOUND:
+            moves = (MATE - abs(self.score) + 1) // 2
+            return f"M{moves}" if self.score > 0 else f"-M{moves}"
+        return f"{self.score / 100:+.2f}"
+
+    def pv_text(self) -> str:
+        return " ".join(move_to_uci(move) for move in self.pv)
+
+
+# Πεταγεται οταν τελειωσει ο χρονος ή ζητηθει διακοπη
+class SearchAborted(Exception):
+    pass
+
+
+# --------------------------------------------------------------------- #
+#  Engine κλαση: negamax alpha-beta με iterative deepening
+# --------------------------------------------------------------------- #
+class Engine:
+    def __init__(self, max_depth: int = 64, time_limit: Optional[float] = None,
+                 table: Optional[TranspositionTable] = None, book: Optional[OpeningBook] = None,
+                 tablebases: Optional["Tablebases"] = None, node_limit: Optional[int] = None,
+                 evaluator: Optional[Callable[[Board], int]] = None):
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        # Μεγιστο πληθος κομβων ανα αναζητηση (ελεγχεται μαζι με τον χρονο, καθε TIME_CHECK_NODES κομβους)
+        self.node_limit = node_limit
+        # Συναρτηση αξιολογησης (π.χ. μια νεα εκδοση προς δοκιμη σε τουρνουα)
+        self.evaluate = evaluator or evaluate
+        self.table = table if table is not None else TranspositionTable()
+        self.book = book
+        self.tablebases = tablebases
+
+        self.nodes = 0
+        self.stopped = False
+        self.deadline = None
+
+        # Προαιρετικη συναρτηση που ελεγχεται μαζι με τον χρονο (π.χ. διακοπη απο αλλη διεργασια)
+        self.should_stop: Optional[Callable[[], bool]] = None
+        self.killers: list[list[Optional[int]]] = []
+        self.history: dict[int, int] = {}
+        self.pv_table: list[list[int]] = []
+
+    # Διακοπη της αναζητησης που τρεχει (απο αλλο νημα)
+    def stop(self):
+        self.stopped = True
+
+    # --------------------------------------------------------------------- #
+    #  Iterative deepening με aspiration windows
+    # --------------------------------------------------------------------- #
+    # on_info: καλειται με ενα SearchResult μετα απο καθε ολοκληρωμενο βαθος
+    # use_book: αν η θεση ειναι στο βιβλιο, παιζεται κινηση του βιβλιου χωρις αναζητηση
+    def search(self, board: Board, max_depth: Optional[int] = None, time_limit: Optional[float] = None,
+               on_info: Optional[Callable[[SearchResult], None]] = None, use_book: bool = False) -> SearchResult:
+        max_depth = max_depth or self.max_depth
+        time_limit = time_limit if time_limit is not None else self.time_limit
+
+        if use_book and self.book is not None:
+            move = self.book.choose(board)
+            if move is not None:
+                return SearchResult(move, 0, 0, [move], book=True)
+
+        start = time.perf_counter()
+        self._prepare(start, time_limit)
+
+        moves = board.generate_legal_moves(board.turn)
+        if not moves:
+            score = -MATE if board.king_in_check(board.turn) else 0
+            return SearchResult(None, score, 0)
+
+        # Αν η αναζητηση διακοπει πριν το πρωτο βαθος, παιζεται η πρωτη κινηση
+        result = SearchResult(moves[0], 0, 0, [moves[0]])
+        history_length = len(board.history)
+        score = 0
+        # Αν η θεση ειναι στα tablebases, ολες οι κινησεις της ριζας εχουν ακριβη τιμη απο το πρωτο βαθος
+        solved = self._probe_tablebases(board) is not None
+
+        for depth in range(1, max_depth + 1):
+            try:
+                if depth >= 3:
+                    alpha, beta = score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW
+                    score = self._negamax(board, depth, alpha, beta, 0)
+                    # Εκτος παραθυρου: νεα αναζητηση με πληρες παραθυρο
+                    if score <= alpha or score >= beta:
+                        score = self._negamax(board, depth, -INF, INF, 0)
+                else:
+                    score = self._negamax(board, depth, -INF, INF, 0)
+            except SearchAborted:
+                # Επαναφερουμε τη σκακιερα στην αρχικη θεση
+                while len(board.history) > history_length:
+                    board.pop()
+                break
+
+            pv = self.pv_table[0][:] if self.pv_table and self.pv_table[0] else result.pv
+            result = SearchResult(pv[0], score, depth, pv, self.nodes, time.perf_counter() - start)
+            if on_info:
+                on_info(result)
+
+            # Ματ βρεθηκε, η θεση ειναι λυμενη ή δεν θα προλαβει το επομενο βαθος (περιπου διπλασιος χρονος)
+            if abs(score) >= MATE_BOUND or solved:
+                break
+            if self.deadline and time.perf_counter() + result.elapsed > self.deadline:
+                break
+            if self.node_limit and self.nodes * 2 > self.node_limit:
+                break
+
+        result.nodes = self.nodes
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    # Αναζητηση σε σταθερο βαθος και παραθυρο (χωρις iterative deepening), π.χ. για μια κινηση
+    # της ριζας σε παραλληλη αναζητηση. Επιστρεφει None αν διακοπει
+    def search_fixed(self, board: Board, depth: int, time_limit: Optional[float] = None,
+                     alpha: int = -INF, beta: int = INF) -> Optional[SearchResult]:
+        start = time.perf_counter()
+        self._prepare(start, time_limit)
+        history_length = len(board.history)
+        try:
+            score = self._negamax(board, depth, alpha, beta, 0)
+        except SearchAborted:
+            while len(board.history) > history_length:
+                board.pop()
+            return None
+        pv = self.pv_table[0][:]
+        return SearchResult(pv[0] if pv else None, score, depth, pv, self.nodes, time.perf_counter() - start)
+
+    # Αρχικοποιηση μετρητων, χρονου και πινακων ταξινομησης για νεα αναζητηση
+    def _prepare(self, start: float, time_limit: Optional[float]):
+        self.deadline = start + time_limit if time_limit else None
+        self.stopped = False
+        self.nodes = 0
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.history = {}
+        self.table.new_search()
+
+    # --------------------------------------------------------------------- #
+    #  Negamax alpha-beta
+    # --------------------------------------------------------------------- #
+    def _negamax(self, board: Board, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self._count_node()
+        if len(self.pv_table) <= ply:
+            self.pv_table.append([])
+        self.pv_table[ply] = []
+
+        # Φιναλε με λιγα κομματια: ακριβες αποτελεσμα απο τα tablebases
+        if ply > 0:
+            probe = self._probe_tablebases(board)
+            if probe is not None:
+                return self._tablebase_score(probe, ply)
+
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiesce(board, alpha, beta, ply)
+
+        # Πινακας μεταθεσεων
+        original_alpha = alpha
+        entry = self.table.probe(board.key)
+        tt_move = None
+        if entry is not None:
+            tt_move = entry.move
+            if ply > 0 and entry.depth >= depth:
+                tt_score = self._score_from_table(entry.score, ply)
+                if entry.flag == EXACT:
+                    return tt_score
+                if entry.flag == LOWER and tt_score >= beta:
+                    return tt_score
+                if entry.flag == UPPER and tt_score <= alpha:
+                    return tt_score
+
+        moves = board.generate_legal_moves(board.turn)
+        if not moves:
+            # Ματ (οσο πιο κοντα τοσο χειροτερο) ή πατ
+            return -MATE + ply if board.king_in_check(board.turn) else 0
+
+        best_score, best_move = -INF, None
+        for move in self._order_moves(board, moves, tt_move, ply):
+            captured = board.sq[(move >> 6) >> 3][(move >> 6) & 7]
+            board.push(move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+                self.pv_table[ply] = [move] + self.pv_table[ply + 1]
+            if alpha >= beta:
+                # Killer και history μονο για ησυχες κινησεις
+                if captured is None:
+                    killers = self.killers[ply]
+                    if killers[0] != move:
+                        killers[1], killers[0] = killers[0], move
+                    self.history[move] = self.history.get(move, 0) + depth * depth
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(board.key, depth, self._score_to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    def _probe_tablebases(self, board: Board) -> Optional["ProbeResult"]:
+        if self.tablebases is None or board.piece_count > self.tablebases.max_pieces:
+            return None
+        return self.tablebases.probe(board)
+
+    # Νικη/ηττα ως τιμη ματ (ιδια κλιμακα με το ματ της αναζητησης), ισοπαλια 0
+    @staticmethod
+    def _tablebase_score(probe: "ProbeResult", ply: int) -> int:
+        if probe.wdl > 0:
+            return MATE - (ply + probe.plies)
+        if probe.wdl < 0:
+            return -MATE + ply + probe.plies
+        return 0
+
+    # --------------------------------------------------------------------- #
+    #  Quiescence: συνεχιζουμε μονο με τα φαγωματα ωστε να μην αξιολογουμε
+    #  θεσεις στη μεση μιας ανταλλαγης
+    # --------------------------------------------------------------------- #
+    def _quiesce(self, board: Board, alpha: int, beta: int, ply: int) -> int:
+        self._count_node()
+        stand_pat = self.evaluate(board)
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        sq = board.sq
+        captures = [m for m in board.generate_legal_moves(board.turn) if sq[(m >> 6) >> 3][(m >> 6) & 7]]
+        captures.sort(key=lambda m: self._mvv_lva(board, m), reverse=True)
+        for move in captures:
+            board.push(move)
+            score = -self._quiesce(board, -beta, -alpha, ply + 1)
+            board.pop()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    # --------------------------------------------------------------------- #
+    #  Ταξινομηση κινησεων: κινηση πινακα, φαγωματα (MVV-LVA), killers, history
+    # --------------------------------------------------------------------- #
+    def _mvv_lva(self, board: Board, move: int) -> int:
+        source, destination = move & 63, move >> 6
+        victim = board.sq[destination >> 3][destination & 7]
+        attacker = board.sq[source >> 3][source & 7]
+        return PIECE_VALUES[victim.kind] * 8 - ATTACKER_ORDER[attacker.kind]
+
+    def _order_moves(self, board: Board, moves: list[int], tt_move: Optional[int], ply: int) -> list[int]:
+        sq = board.sq
+        killers = self.killers[ply]
+        history = self.history
+
+        def priority(move: int) -> int:
+            if move == tt_move:
+                return 10_000_000
+            destination = move >> 6
+            if sq[destination >> 3][destination & 7]:
+                return 1_000_000 + self._mvv_lva(board, move)
+            if move == killers[0]:
+                return 900_000
+            if move == killers[1]:
+                return 800_000
+            return history.get(move, 0)
+
+        return sorted(moves, key=priority, reverse=True)
+
+    # --------------------------------------------------------------------- #
+    #  Βοηθητικες
+    # --------------------------------------------------------------------- #
+    def _count_node(self):
+        self.nodes += 1
+        if self.nodes % TIME_CHECK_NODES == 0:
+            if self.stopped or (self.deadline and time.perf_counter() >= self.deadline):
+                raise SearchAborted()
+            if self.node_limit and self.nodes >= self.node_limit:
+                raise SearchAborted()
+            if self.should_stop and self.should_stop():
+                raise SearchAborted()
+
+    # Οι τιμες ματ αποθηκευονται σχετικα με τον κομβο (οχι τη ριζα) ωστε να ισχυουν απο οποιαδηποτε θεση
+    @staticmethod
+    def _score_to_table(score: int, ply: int) -> int:
+        if score >= MATE_BOUND:
+            return score + ply
+        if score <= -MATE_BOUND:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_table(score: int, ply: int) -> int:
+        if score >= MATE_BOUND:
+            return score - ply
+        if score <= -MATE_BOUND:
+            return score + ply
+        return score
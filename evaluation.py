@@ -0,0 +1,73 @@
+from board import Board, Color, PieceType, PIECE_KINDS
+from psqt import VALUES, TABLES
+
+# --------------------------------------------------------------------- #
+#  Αξιες κομματιων (centipawns) και πινακες θεσεων ανα τυπο (βλ. psqt.py)
+# --------------------------------------------------------------------- #
+PIECE_VALUES = dict(zip(PIECE_KINDS, VALUES))
+PST = dict(zip(PIECE_KINDS, TABLES))
+
+# Αξια κομματιου + πινακα θεσης, απο την πλευρα του χρωματος του κομματιου
+def piece_square_value(color: Color, kind: PieceType, row: int, col: int) -> int:
+    if color is Color.BLACK:
+        row = 7 - row
+    return PIECE_VALUES[kind] + PST[kind][row * 8 + col]
+
+# --------------------------------------------------------------------- #
+#  Κινητικοτητα: centipawns ανα τετραγωνο που μπορει να παει το κομματι
+#  (ψευδο-νομιμες κινησεις, χωρις ελεγχο καρφωματων)
+# --------------------------------------------------------------------- #
+MOBILITY_WEIGHTS = {
+    PieceType.KNIGHT: 4,
+    PieceType.BISHOP: 3,
+    PieceType.ROOK: 2,
+    PieceType.QUEEN: 1,
+}
+
+# --------------------------------------------------------------------- #
+#  Ασφαλεια βασιλια
+# --------------------------------------------------------------------- #
+KING_SHIELD_BONUS = 10 # Για καθε δικο του πιονι στα 3 τετραγωνα μπροστα απο τον βασιλια
+KING_ZONE_PENALTY = 15 # Για καθε αντιπαλο ιππο/αξιωματικο/πυργο/βασιλισσα σε αποσταση ως 2 τετραγωνα
+KING_ZONE_ATTACKERS = (PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN)
+
+def king_safety(board: Board, color: Color) -> int:
+    king = board.kings.get(color)
+    if not king:
+        return 0
+    king_row, king_col = king
+    score = 0
+
+    # Πιονια μπροστα απο τον βασιλια (τα λευκα "μπροστα" ειναι η μικροτερη γραμμη)
+    shield_row = king_row - 1 if color is Color.WHITE else king_row + 1
+    if 0 <= shield_row <= 7:
+        for col in (king_col - 1, king_col, king_col + 1):
+            if 0 <= col <= 7:
+                piece = board.sq[shield_row][col]
+                if piece and piece.color is color and piece.kind is PieceType.PAWN:
+                    score += KING_SHIELD_BONUS
+
+    # Αντιπαλα κομματια κοντα στον βασιλια
+    for row in range(max(0, king_row - 2), min(7, king_row + 2) + 1):
+        for col in range(max(0, king_col - 2), min(7, king_col + 2) + 1):
+            piece = board.sq[row][col]
+            if piece and piece.color is not color and piece.kind in KING_ZONE_ATTACKERS:
+                score -= KING_ZONE_PENALTY
+    return score
+
+# --------------------------------------------------------------------- #
+#  Στατικη αξιολογηση απο την πλευρα του παικτη που παιζει:
+#  υλικο + θεσεις + κινητικοτητα + ασφαλεια βασιλια
+#  (το batch_eval.evaluate_batch πρεπει να δινει ακριβως τις ιδιες τιμες).
+#  Το υλικο και οι θεσεις ερχονται ετοιμα απο τη σκακιερα (board.material,
+#  board.psqt), οποτε μενει μονο ενας βροχος πανω στα κομματια
+# --------------------------------------------------------------------- #
+def evaluate(board: Board) -> int:
+    score = board.material + board.psqt
+    for color, sign in ((Color.WHITE, 1), (Color.BLACK, -1)):
+        for piece in board.pieces[color].values():
+            weight = MOBILITY_WEIGHTS.get(piece.kind)
+            if weight:
+                score += sign * weight * len(board.legal_moves(piece))
+    score += king_safety(board, Color.WHITE) - king_safety(board, Color.BLACK)
+    return score if board.turn is Color.WHITE else -score
@@ -1,8 +1,13 @@
 import tkinter as tk
-from tkinter import messagebox, filedialog
-from pathlib import Path
-from PIL import Image, ImageTk
-from board import Board, Color, PieceType
+from tkinter import messagebox, filedialog, simpledialog
+from board import Board, Color, PieceType, encode_move, decode_move, move_to_uci
+from bitboard import BitBoard
+from worker import EngineWorker
+from pgn import game_to_pgn, move_to_san, move_from_san, san_without_check, iter_pgn
+from move_cache import LegalMoveCache
+from book import open_book, book_text
+from sprites import SpriteCache
+import instrument
 import config
 
 # ------------------------------------------------------------------------ #
@@ -15,10 +20,15 @@ DC = config.dark_color # Χρωμα σκουρου τετραγωνου
 MHBC = config.move_history_box_color # Χρωμα πλαισιου ιστορικου κινησεων
 MHBW = config.move_history_box_width # Πλατος πλαισιου ιστορικου κινησεων
 HC = config.highlight_color # Χρωμα επισημανσης
+TC = config.target_color # Χρωμα για τα τετραγωνα οπου μπορει να παει το επιλεγμενο κομματι
 CC = config.check_color # Χρωμα για το σαχ
 BT = config.blink_time_when_king_in_check # Διαρκεια χρονου (ms) blink οταν ο βασιλιας βρισκεται σε σαχ
-PC = config.piece_codes # Κωδικοι εικονων πιονιων
-DIR = Path(config.asset_directory) # Path φακελου με τις εικονες
+BOARD = BitBoard if config.board_backend == "bitboard" else Board # Κλαση αναπαραστασης σκακιερας
+ENGINE_COLOR = Color(config.engine_color) if config.engine_color else None # Χρωμα που παιζει η μηχανη
+ANALYSIS = config.engine_analysis # Συνεχης αναλυση οταν παιζει ο ανθρωπος
+POLL = config.engine_poll_ms # Περιοδος ελεγχου μηνυματων της μηχανης (ms)
+ARCHIVE_FILES = ("Αρχείο Παρτίδων", "*.chga") # Δυαδικο αρχειο παρτιδων (archive.py)
+STATS_MS = config.instrumentation_overlay_ms # Περιοδος ανανεωσης του πλαισιου μετρησεων (ms)
 
 # --------------------------------------------------------------------- #
 # Συσχετιση τυπου πιονιου και χρωματος με το αντιστοιχο ονομα εικονας
@@ -44,7 +54,7 @@ codes = {
 class ChessGUI:
     def __init__(self, root: tk.Tk):
         self.root = root
-        self.board = Board()
+        self.board = BOARD()
 
         # Δημιουργια βασικου πλαισιου παραθυρου
         self.frame = tk.Frame(root)
@@ -66,112 +76,157 @@ class ChessGUI:
         self.scrollbar = tk.Scrollbar(self.history_frame, command=self.history_box.yview)
         self.history_box.config(yscrollcommand=self.scrollbar.set)
 
+        # Κουμπι αναιρεσης τελευταιας κινησης (και συντομευση Ctrl+Z)
+        self.undo_button = tk.Button(self.history_frame, text="Αναίρεση", command=self.take_back)
+        self.undo_button.pack(fill=tk.X)
+        root.bind("<Control-z>", lambda evt: self.take_back())
+
+        # Κουμπι για ανοιγμα παρτιδας απο αρχειο PGN
+        self.open_button = tk.Button(self.history_frame, text="Άνοιγμα PGN", command=self.open_game)
+        self.open_button.pack(fill=tk.X)
+
+        # Πληροφοριες αναζητησης της μηχανης (βαθος, τιμη, ταχυτητα)
+        self.engine_label = tk.Label(self.history_frame, text="", anchor="w", justify=tk.LEFT)
+        self.engine_label.pack(fill=tk.X)
+
         # Μεταβλητες για σαχ - επιλογη τετραγωνου - επισημανση πιονιου
         self.blink_id = None
         self.blink_state = False
         self.check_square = None
         self.selected_sq = None
+        self.piece_items = {} # (γραμμη, στηλη) -> (canvas item, κωδικος εικονας) για καθε πιονι στον καμβα
 
-        self.images = self.load_images() # Φορτωση πιονιων (εικονες)
-        self.draw_board() # Σχεδιαση ταμπλο
-        self.draw_all_pieces() # Τοποθετηση πιονιων
+        # Νομιμες κινησεις, σαχ και ματ/πατ της θεσης: υπολογιζονται μια φορα ανα θεση και μενουν σε cache
+        self.positions = LegalMoveCache()
+        self.position = self.positions.get(self.board)
+
+        self.sprites = SpriteCache() # Εικονες πιονιων (φορτωνονται οταν χρειαστουν)
+        self.draw_board() # Σχεδιαση ταμπλο (μια φορα)
+        self.sync_pieces() # Τοποθετηση πιονιων
         self.canvas.bind("<Button-1>", self.on_click) # Αντιδραση σε αριστερο click χρηστη
 
-        self.move_list = [] # Λιστα κινησεων
+        self.move_list = [] # Λιστα κινησεων (SAN)
+        self.history_start = (self.board.fullmove, self.board.turn) # Αριθμος και σειρα της πρωτης κινησης στο ιστορικο
+
+        # Βιβλιο ανοιγματων (για την εμφανιση των κινησεων του, η μηχανη ανοιγει το δικο της)
+        self.book = open_book()
+
+        # Η μηχανη τρεχει σε δικη της διεργασια, ωστε το παραθυρο να μενει ελευθερο οσο σκεφτεται
+        self.worker = EngineWorker() if ENGINE_COLOR or ANALYSIS else None
+        self.search_id = None # Αναζητηση για την κινηση της μηχανης
+        self.analysis_id = None # Αναλυση της θεσης (οταν παιζει ο ανθρωπος)
+        self.poll_id = None
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.start_thinking()
+
+        # Πλαισιο με τις μετρησεις χρονου (μονο αν ειναι ενεργοποιημενες, εναλλαγη με F2)
+        self.stats_id = None
+        self.stats_visible = config.instrumentation_overlay
+        if instrument.ENABLED:
+            root.bind("<F2>", lambda evt: self.toggle_stats())
+            self.update_stats()
 
     # ------------------------------------------------------------------ #
     #  Image handling
     # ------------------------------------------------------------------ #
-    # Φορτωση των εικονων PNG για καθε πιονι στο λεξικο imgs με την σωστη συσχετιση τυπου-χρωματος-εικονας
-    def load_images(self):
-        imgs = {}
-        for code in PC:
-            img = Image.open(DIR / f"{code}.png").resize((SQ, SQ), Image.LANCZOS)
-            imgs[code] = ImageTk.PhotoImage(img)
-        return imgs
+    # Εικονα πιονιου στο μεγεθος του τετραγωνου (απο το cache των sprites)
+    def image(self, code):
+        return self.sprites.photo(code, SQ)
 
     # ------------------------------------------------------------------ #
     #  Board drawing
     # ------------------------------------------------------------------ #
-    # Σχεδιαση του ταμπλο σκακιερας
+    # Σχεδιαση του ταμπλο σκακιερας (μονο στην αρχη, τα τετραγωνα δεν αλλαζουν ποτε)
     def draw_board(self):
         for r in range(8):
             for c in range(8):
                 x1, y1 = c*SQ, r*SQ
                 x2, y2 = x1+SQ, y1+SQ
                 color = LC if (r+c) % 2 == 0 else DC
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
-
-    # Σχεδιαση ολων των πιονιων πανω στην σκακιερα και εμφανιση σαχ (αν υπαρχει)
-    def draw_all_pieces(self):
-        self.canvas.delete("piece")
+                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="", tags=("square",))
+
+    # Συγχρονισμος των εικονων με την Board στα τετραγωνα squares (αν ειναι None: οσα εχουν εικονα ή
+    # κομματι, απο τις λιστες κομματιων της σκακιερας αντι για σαρωση των 64 τετραγωνων).
+    # Αλλαζουν μονο τα items που διαφερουν: διαγραφη, νεα εικονα ή νεο item
+    def sync_pieces(self, squares=None):
+        if squares is None:
+            squares = set(self.piece_items)
+            squares.update(divmod(s, 8) for own in self.board.pieces.values() for s in own)
+        for square in squares:
+            piece = self.board.piece_at(*square)
+            code = codes[(piece.color, piece.kind)] if piece else None
+            current = self.piece_items.get(square)
+            if (current[1] if current else None) == code:
+                continue
+            if code is None:
+                self.canvas.delete(current[0])
+                del self.piece_items[square]
+            elif current:
+                self.canvas.itemconfig(current[0], image=self.image(code))
+                self.piece_items[square] = (current[0], code)
+            else:
+                self.piece_items[square] = (self.draw_piece(piece), code)
+        self.update_check()
+
+    # Μετα απο μια κινηση: απο την εγγραφη αναιρεσης ξερουμε ποια τετραγωνα αλλαξαν, οποτε
+    # μετακινειται μονο η εικονα του πιονιου και διαγραφεται αυτη του πιονιου που φαγωθηκε
+    def draw_move(self, undo):
+        source_row, source_col, destination_row, destination_col = decode_move(undo.move)
+        if undo.captured:
+            self.canvas.delete(self.piece_items.pop((destination_row, destination_col))[0])
+        item = self.piece_items.pop((source_row, source_col))
+        self.canvas.coords(item[0], *self.square_center(destination_row, destination_col))
+        self.piece_items[(destination_row, destination_col)] = item
+        self.update_check()
+
+    # Εμφανιση σαχ (αν υπαρχει)
+    def update_check(self):
         self.canvas.delete("check")
-
-        check_position = None
-        if self.board.king_in_check(self.board.turn):
-            for r in range(8):
-                for c in range(8):
-                    p = self.board.piece_at(r, c)
-                    if p and p.color == self.board.turn and p.kind.name == "KING":
-                        check_position = (r, c)
-                        self.check_square = (r, c)
-                        break
-                if check_position:
-                    break
+        if self.position.check:
+            # Η θεση του βασιλια ειναι ηδη γνωστη στην Board
+            self.check_square = self.board.kings[self.board.turn]
             self.start_check_blink()
+            self.highlight_check(*self.check_square)
         else:
             self.stop_check_blink()
-            self.check_square = None 
-
-        for r in range(8):
-            for c in range(8):
-                piece = self.board.piece_at(r, c)
-                if piece:
-                    self.draw_piece(piece)
+            self.check_square = None
 
-        if check_position:
-            self.highlight_check(*check_position)
+    # Κεντρο ενος τετραγωνου σε συντεταγμενες του καμβα
+    @staticmethod
+    def square_center(row, col):
+        return col * SQ + SQ // 2, row * SQ + SQ // 2
 
-    # Σχεδιαση ενος πιονιου στη σωστη θεση
+    # Σχεδιαση ενος πιονιου στη σωστη θεση (επιστρεφει το canvas item)
     def draw_piece(self, piece):
-        x = piece.col * SQ + SQ // 2
-        y = piece.row * SQ + SQ // 2
         code = codes[(piece.color, piece.kind)]
-        self.canvas.create_image(x, y, image=self.images[code], tags=("piece",))
+        return self.canvas.create_image(*self.square_center(piece.row, piece.col), image=self.image(code), tags=("piece",))
 
     # ------------------------------------------------------------------ #
     #  Event handling
     # ------------------------------------------------------------------ #
     # Καλειται οταν ο χρηστης κανει κλικ σε τετραγωνο της σκακιερας
     def on_click(self, evt):
+        if instrument.ENABLED:
+            instrument.until_redraw(self.root, "gui.click_to_redraw")
+        # Click οσο σκεφτεται η μηχανη: σταματαει την αναζητηση και παιζει την καλυτερη κινηση μεχρι τωρα
+        if self.board.turn is ENGINE_COLOR:
+            if self.search_id:
+                self.worker.stop()
+            return
+        # Καθε click ακυρωνει την αναλυση που τρεχει
+        if self.analysis_id:
+            self.worker.stop()
+            self.analysis_id = None
         # Μετατροπη των συντεταγμενων του click σε θεση στη σκακιερα
         row, col = evt.y // SQ, evt.x // SQ
         # Αν υπαρχει ηδη επιλεγμενο πιονι, προσπαθουμε να το μετακινησουμε
         if self.selected_sq:
-            source_row, source_col = self.selected_sq
-            sel_piece = self.board.piece_at(source_row, source_col)
-            moved = self.board.move(source_row, source_col, row, col)
+            source = self.selected_sq
             # Αφαιρουμε το highlight και μηδενιζουμε την τρεχουσα επιλογη
             self.canvas.delete("highlight")
             self.selected_sq = None
-            if moved:
-                # Αν η κινηση ηταν επιτυχης, ανανεωνουμε τα πιονια
-                self.draw_all_pieces()
-                # Καταγραφουμε την κινηση στο ιστορικο
-                move_str = self.format_move(sel_piece, row, col)
-                self.append_move_to_history(move_str)
-                # Ελεγχος για ματ ή πατ
-                if not self.board.has_legal_moves(self.board.turn):
-                    if self.board.king_in_check(self.board.turn):
-                        names = {
-                            "WHITE": "Άσπροι",
-                            "BLACK": "Μαύροι"
-                        }
-                        message = f"Ματ - Οι {names[self.board.turn.opposite.name]} νίκησαν"
-                    else:
-                        message = "Αδιέξοδο - Ισοπαλία"
-                    tk.messagebox.showinfo("Λήξη Παιχνιδιού", message)
-                    self.reset_game()
+            if (row, col) in self.position.targets.get(source, ()):
+                self.play(encode_move(*source, row, col))
             else:
                 # Αν η κινηση δεν ηταν εγκυρη, προσπαθουμε να επιλεξουμε νεο πιονι
                 self.try_select(row, col)
@@ -179,6 +234,109 @@ class ChessGUI:
             # Αν δεν εχει επιλεγει ακομη κομματι, προσπαθουμε να επιλεξουμε
             self.try_select(row, col)
     
+    # Εκτελεση νομιμης κινησης (του παικτη ή της μηχανης). Η αναλυση της νεας θεσης (απο το cache)
+    # δινει το σαχ/ματ της SAN, το τελος του παιχνιδιου, την επισημανση και τα επομενα κλικ
+    def play(self, move):
+        san = san_without_check(self.board, move, self.position.moves)
+        self.board.push(move)
+        self.position = self.positions.get(self.board)
+        self.after_move(san + self.position.suffix)
+
+    # Μετα απο καθε επιτυχημενη κινηση (του παικτη ή της μηχανης)
+    def after_move(self, san):
+        # Ανανεωνουμε μονο τα τετραγωνα της κινησης
+        self.draw_move(self.board.history[-1])
+        # Καταγραφουμε την κινηση στο ιστορικο
+        self.append_move_to_history(san)
+        # Ελεγχος για ματ ή πατ
+        if self.check_game_over():
+            return
+        # Σειρα της μηχανης (ή αναλυση της νεας θεσης)
+        self.start_thinking()
+
+    # Ελεγχος για ματ, πατ, τριπλη επαναληψη και κανονα 50 κινησεων (επιστρεφει True αν το παιχνιδι τελειωσε)
+    def check_game_over(self):
+        status = self.board.status(self.position.moves)
+        if not status.over:
+            return False
+        if status.mate:
+            names = {
+                "WHITE": "Άσπροι",
+                "BLACK": "Μαύροι"
+            }
+            message = f"Ματ - Οι {names[self.board.turn.opposite.name]} νίκησαν"
+        elif status.stalemate:
+            message = "Αδιέξοδο - Ισοπαλία"
+        elif status.threefold:
+            message = "Τριπλή επανάληψη - Ισοπαλία"
+        else:
+            message = "Κανόνας 50 κινήσεων - Ισοπαλία"
+        tk.messagebox.showinfo("Λήξη Παιχνιδιού", message)
+        self.reset_game()
+        return True
+
+    # ------------------------------------------------------------------ #
+    #  Μηχανη (σε ξεχωριστη διεργασια)
+    # ------------------------------------------------------------------ #
+    # Ξεκιναει αναζητηση αν ειναι σειρα της μηχανης, ή αναλυση αν ειναι ενεργοποιημενη
+    def start_thinking(self):
+        if self.board.turn is not ENGINE_COLOR:
+            self.show_book_moves()
+        if not self.worker:
+            return
+        if self.board.turn is ENGINE_COLOR:
+            self.search_id = self.worker.start(self.board, config.engine_depth, config.engine_time, use_book=True)
+        elif ANALYSIS:
+            self.analysis_id = self.worker.start(self.board)
+        else:
+            return
+        if not self.poll_id:
+            self.poll_id = self.root.after(POLL, self.poll_engine)
+
+    # Ακυρωνει οτι τρεχει (π.χ. σε αναιρεση ή νεο παιχνιδι)
+    def cancel_thinking(self):
+        if self.worker:
+            self.worker.stop()
+        self.search_id = None
+        self.analysis_id = None
+
+    # Διαβαζει την προοδο της μηχανης απο την ουρα (καλειται περιοδικα με root.after)
+    def poll_engine(self):
+        self.poll_id = None
+        for kind, search_id, result in self.worker.poll():
+            # Μηνυματα απο αναζητησεις που ακυρωθηκαν αγνοουνται
+            if search_id not in (self.search_id, self.analysis_id):
+                continue
+            self.show_engine_info(result)
+            if kind == "done" and search_id == self.search_id:
+                self.search_id = None
+                self.play_engine_move(result)
+        if self.search_id or self.analysis_id:
+            self.poll_id = self.root.after(POLL, self.poll_engine)
+
+    # Εκτελεση της κινησης που βρηκε η μηχανη
+    def play_engine_move(self, result):
+        if self.board.turn is not ENGINE_COLOR or result.best_move not in self.position.moves:
+            return
+        self.play(result.best_move)
+
+    # Εμφανιση βαθους, τιμης, κυριας παραλλαγης και ταχυτητας της μηχανης
+    def show_engine_info(self, result):
+        if result.book:
+            self.engine_label.config(text=f"Βιβλίο: {move_to_san(self.board, result.best_move)}")
+            return
+        self.engine_label.config(
+            text=f"Βάθος {result.depth}  {result.score_text()}  {result.nps} κόμβοι/δ\n{result.pv_text()}"
+        )
+
+    # Κινησεις του βιβλιου ανοιγματων για τη θεση (αν υπαρχουν)
+    def show_book_moves(self):
+        if not self.book:
+            return
+        entries = self.book.moves(self.board)
+        if entries:
+            self.engine_label.config(text=f"Βιβλίο: {book_text(self.board, entries)}")
+
     # Επιλογη κομματιου για μετακινηση
     def try_select(self, row, col):
         piece = self.board.piece_at(row, col)
@@ -186,6 +344,8 @@ class ChessGUI:
         if piece and piece.color is self.board.turn:
             self.selected_sq = (row, col)
             self.highlight_square(row, col)
+            for target_row, target_col in self.position.targets.get((row, col), ()):
+                self.highlight_target(target_row, target_col)
 
     # ------------------------------------------------------------------ #
     #  Extras
@@ -196,6 +356,12 @@ class ChessGUI:
         x2, y2 = x1 + SQ, y1 + SQ
         self.canvas.create_rectangle(x1, y1, x2, y2, outline=HC, width=2, tags="highlight")
 
+    # Επισημανση τετραγωνου οπου μπορει να παει το επιλεγμενο κομματι (κυκλος στο κεντρο)
+    def highlight_target(self, row, col):
+        x, y = self.square_center(row, col)
+        radius = SQ // 8
+        self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius, fill=TC, outline="", tags="highlight")
+
     # Επισημανση σαχ στον βασιλια
     def highlight_check(self, row, col):
         x1, y1 = col * SQ, row * SQ
@@ -231,65 +397,91 @@ class ChessGUI:
         self.blink_state = not self.blink_state
         self.blink_id = self.root.after(BT, self.blink)
 
-    # Μορφοποιηση κινησης σε μορφη (π.χ. Qd5, e4)
-    def format_move(self, piece, dst_r, dst_c):
-        c = "abcdefgh"
-        r = "87654321"
-
-        name = {
-            PieceType.KING: "K",
-            PieceType.QUEEN: "Q",
-            PieceType.ROOK: "R",
-            PieceType.BISHOP: "B",
-            PieceType.KNIGHT: "N",
-            PieceType.PAWN: ""
-        }[piece.kind]
-
-        dst = c[dst_c] + r[dst_r]
+    # Το κομματι του κειμενου του ιστορικου για τη μιση κινηση ply (απο την αρχη του ιστορικου).
+    # Καθε γραμμη εχει τον αριθμο της κινησης και τις κινησεις λευκων και μαυρων, και ολο το
+    # κειμενο ειναι η ενωση αυτων των κομματιων: μια νεα κινηση προσθετει μονο το δικο της
+    def history_text(self, ply, san):
+        fullmove, turn = self.history_start
+        half = ply + (turn is Color.BLACK)
+        number = fullmove + half // 2
+        if half % 2 == 0:
+            return ("\n" if ply else "") + f"{number:2d}. {san:7s}"
+        if ply == 0:
+            return f"{number:2d}. {'...':7s} {san}"
+        return f" {san}"
+
+    # Προσθηκη μιας κινησης στο τελος του ιστορικου (χωρις να ξαναγραφτουν οι προηγουμενες)
+    def append_move_to_history(self, san):
+        self.history_box.config(state="normal")
+        self.history_box.insert(tk.END, self.history_text(len(self.move_list), san))
+        self.move_list.append(san)
+        self.history_box.see(tk.END)
+        self.history_box.config(state="disabled")
 
-        return name + dst
-    
-    # Ενημερωση του ιστορικου κινησεων
-    def append_move_to_history(self, move_str):
-        self.move_list.append(move_str)
+    # Αφαιρεση της τελευταιας κινησης (σβηνεται μονο το κομματι της απο το τελος του κειμενου)
+    def remove_last_history(self):
+        if not self.move_list:
+            return
+        san = self.move_list.pop()
+        text = self.history_text(len(self.move_list), san)
+        self.history_box.config(state="normal")
+        self.history_box.delete(f"end-{len(text) + 1}c", "end-1c")
+        self.history_box.see(tk.END)
+        self.history_box.config(state="disabled")
 
+    # Σχεδιαση του ιστορικου κινησεων απο την αρχη, με μια εισαγωγη (νεο παιχνιδι ή παρτιδα απο αρχειο)
+    def redraw_history(self):
         self.history_box.config(state="normal")
         self.history_box.delete("1.0", tk.END)
-
-        lines = []
-        for i in range(0, len(self.move_list), 2):
-            turn = i // 2 + 1
-            white = self.move_list[i]
-            black = self.move_list[i + 1] if i + 1 < len(self.move_list) else ""
-            lines.append(f"{turn:2d}. {white:5s} {black}")
-
-        self.history_box.insert(tk.END, "\n".join(lines))
+        self.history_box.insert(tk.END, "".join(self.history_text(ply, san) for ply, san in enumerate(self.move_list)))
         self.history_box.see(tk.END)
         self.history_box.config(state="disabled")
 
-    # Αποθηκευση κινησεων σε αρχειο κειμενου
+    # Αναιρεση της τελευταιας κινησης (χρησιμοποιει τη στοιβα αναιρεσης της Board)
+    def take_back(self):
+        if not self.board.history:
+            return
+        self.cancel_thinking()
+        undone = [self.board.pop()]
+        self.remove_last_history()
+        # Απεναντι στη μηχανη αναιρουμε και τη δικη της κινηση ωστε να ξαναπαιξει ο παικτης
+        if self.board.turn is ENGINE_COLOR and self.board.history:
+            undone.append(self.board.pop())
+            self.remove_last_history()
+        self.position = self.positions.get(self.board)
+        self.canvas.delete("highlight")
+        self.selected_sq = None
+        # Ξανασχεδιαζονται μονο τα τετραγωνα των κινησεων που αναιρεθηκαν
+        squares = set()
+        for move in undone:
+            source_row, source_col, destination_row, destination_col = decode_move(move)
+            squares.update(((source_row, source_col), (destination_row, destination_col)))
+        self.sync_pieces(squares)
+        self.start_thinking()
+
+    # Αποθηκευση της παρτιδας σε αρχειο PGN (διαβαζεται ξανα με το pgn.iter_pgn) ή προσθηκη
+    # της σε αρχειο παρτιδων (.chga, αναζητηση θεσεων με το archive.py)
     def download_move_history(self):
-        if not self.move_list:
+        if not self.board.history:
             return
 
-        lines = []
-        for i in range(0, len(self.move_list), 2):
-            turn = i // 2 + 1
-            white = self.move_list[i]
-            black = self.move_list[i + 1] if i + 1 < len(self.move_list) else ""
-            lines.append(f"{turn}. {white} {black}")
-
-        content = "\n".join(lines)
-
         file_path = filedialog.asksaveasfilename(
-            defaultextension=".txt",
-            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")],
+            defaultextension=".pgn",
+            filetypes=[("PGN Files", "*.pgn"), ARCHIVE_FILES, ("Text Files", "*.txt"), ("All Files", "*.*")],
             title="Αποθήκευση Ιστορικού Παιχνιδιού"
         )
 
-        if file_path:
-            with open(file_path, "w") as f:
-                f.write(content)
+        if not file_path:
+            return
+        if file_path.endswith(ARCHIVE_FILES[1][1:]):
+            # Το archive (και το NumPy) φορτωνεται μονο οταν χρειαστει
+            from archive import GameArchiveWriter
+
+            with GameArchiveWriter(file_path) as writer:
+                writer.append(self.board)
+        else:
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(game_to_pgn(self.board))
 
     # Επαναφορα παιχνιδιου
     def reset_game(self):
@@ -297,16 +489,120 @@ class ChessGUI:
             answer = messagebox.askyesno("Αποθήκευση Ιστορικού Παιχνιδιού", "Θέλετε να κατεβάσετε το ιστορικό κινήσεων?")
             if answer:
                 self.download_move_history()
-        self.board = Board()
+        self.cancel_thinking()
+        self.set_game(BOARD())
+        self.start_thinking()
+
+    # Νεα παρτιδα στην οθονη (σκακιερα, νομιμες κινησεις και ιστορικο).
+    # moves: η SAN των κινησεων της board, start: (αριθμος κινησης, σειρα) της θεσης πριν απο την πρωτη
+    def set_game(self, board, moves=(), start=None):
+        self.board = board
+        self.position = self.positions.get(board)
+        self.history_start = start or (board.fullmove, board.turn)
+        self.move_list = list(moves)
         self.selected_sq = None
         self.canvas.delete("highlight")
-        self.canvas.delete("check")
-        self.draw_board()
-        self.draw_all_pieces()
-        self.move_list.clear()
-        self.history_box.config(state="normal")
-        self.history_box.delete("1.0", tk.END)
-        self.history_box.config(state="disabled")
+        self.sync_pieces()
+        self.redraw_history()
+        self.engine_label.config(text="")
+
+    # Ανοιγμα της πρωτης παρτιδας ενος αρχειου PGN ή μιας παρτιδας αρχειου .chga. Καθε θεση
+    # αναλυεται μια φορα (μενει και στο cache για αναιρεσεις) και το ιστορικο γραφεται με μια εισαγωγη
+    def open_game(self):
+        path = filedialog.askopenfilename(
+            filetypes=[("PGN Files", "*.pgn"), ARCHIVE_FILES, ("All Files", "*.*")],
+            title="Άνοιγμα Παρτίδας"
+        )
+        if not path:
+            return
+        if path.endswith(ARCHIVE_FILES[1][1:]):
+            game = self.read_archive(path)
+        else:
+            parsed = next(iter_pgn(path), None)
+            game = (parsed.start_fen, parsed.moves) if parsed else None
+        if game is None:
+            return
+        start_fen, game_moves = game
+
+        moves = []
+        try:
+            board = BOARD.from_fen(start_fen)
+            start = (board.fullmove, board.turn)
+            position = self.positions.get(board)
+            for item in game_moves:
+                # SAN απο PGN, ακεραιος (encode_move) απο αρχειο παρτιδων
+                move = move_from_san(board, item, list(position.moves)) if isinstance(item, str) else item
+                if move not in position.moves:
+                    raise ValueError(f"Μη νομιμη κινηση: {move_to_uci(move)}")
+                san = san_without_check(board, move, position.moves)
+                board.push(move)
+                position = self.positions.get(board)
+                moves.append(san + position.suffix)
+        except ValueError as error:
+            messagebox.showerror("Άνοιγμα Παρτίδας", f"Κίνηση {len(moves) + 1}: {error}")
+            return
+
+        self.cancel_thinking()
+        self.set_game(board, moves, start)
+        if not self.board.status(self.position.moves).over:
+            self.start_thinking()
+
+    # (FEN αρχης, κινησεις) της παρτιδας που διαλεγει ο χρηστης (η τελευταια αν δεν αλλαξει τον αριθμο)
+    def read_archive(self, path):
+        from archive import GameArchive
+
+        try:
+            with GameArchive(path) as archive:
+                if not len(archive):
+                    return None
+                number = simpledialog.askinteger("Άνοιγμα Παρτίδας", f"Παρτίδα (1-{len(archive)}):",
+                                                 initialvalue=len(archive), minvalue=1, maxvalue=len(archive))
+                if number is None:
+                    return None
+                return archive.board(number - 1, 0).fen(), archive.moves(number - 1)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Άνοιγμα Παρτίδας", str(error))
+            return None
+
+    # ------------------------------------------------------------------ #
+    #  Μετρησεις χρονου (instrument.py)
+    # ------------------------------------------------------------------ #
+    # Ξαναγραφει το πλαισιο των μετρησεων (πανω απο τα πιονια) και προγραμματιζει την επομενη ανανεωση
+    def update_stats(self):
+        self.canvas.delete("stats")
+        if self.stats_visible:
+            text = self.canvas.create_text(4, 4, anchor="nw", text=instrument.report(8), fill="white",
+                                           font=("Consolas", 9), tags="stats")
+            background = self.canvas.create_rectangle(self.canvas.bbox(text), fill="black", stipple="gray50",
+                                                      outline="", tags="stats")
+            self.canvas.tag_lower(background, text)
+            self.canvas.tag_raise("stats")
+        self.stats_id = self.root.after(STATS_MS, self.update_stats)
+
+    def toggle_stats(self):
+        self.stats_visible = not self.stats_visible
+        self.root.after_cancel(self.stats_id)
+        self.update_stats()
+
+    # Κλεισιμο παραθυρου (τερματιζει και τη διεργασια της μηχανης)
+    def close(self):
+        if self.worker:
+            self.worker.close()
+        if self.book:
+            self.book.close()
+        if self.stats_id:
+            self.root.after_cancel(self.stats_id)
+        if instrument.ENABLED:
+            print(instrument.report())
+            if instrument.OUTPUT:
+                instrument.save(instrument.OUTPUT)
+        self.root.destroy()
+
+# Με ενεργοποιημενες μετρησεις μετρανε και οι μεθοδοι της σκακιερας και του GUI
+# (πριν δημιουργηθει το παραθυρο, ωστε τα bind να δεχτουν τις τυλιγμενες μεθοδους)
+if instrument.ENABLED:
+    instrument.install()
+    instrument.wrap(ChessGUI, ("on_click", "play", "sync_pieces", "draw_move", "take_back", "set_game"))
 
 # ------------------------------------------------------------------ #
 #  Εκκινηση του παιχνιδιου (main)
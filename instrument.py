@@ -0,0 +1,167 @@
+import json
+import marshal
+import os
+import time
+from collections import deque
+from functools import wraps
+from pathlib import Path
+
+import config
+
+# --------------------------------------------------------------------- #
+#  Μετρησεις χρονου στα "ζεστα" σημεια της σκακιερας και του GUI.
+#  Ενεργοποιουνται με config.instrumentation ή με CHESS_INSTRUMENT=1.
+#  Οταν ειναι κλειστες οι μεθοδοι δεν τυλιγονται καθολου, αρα δεν
+#  υπαρχει κανενα κοστος. Τα αποτελεσματα εξαγονται σε JSON ή σε μορφη
+#  pstats (python -m pstats αρχειο) και φαινονται σε μικρο πλαισιο στο GUI
+# --------------------------------------------------------------------- #
+ENABLED = os.environ.get("CHESS_INSTRUMENT", "1" if config.instrumentation else "0") not in ("", "0")
+OUTPUT = os.environ.get("CHESS_INSTRUMENT_OUTPUT") or config.instrumentation_output # Αρχειο για τις μετρησεις στο κλεισιμο
+
+# Μεθοδοι της σκακιερας που μετρανε (μονο οσες οριζει η ιδια η κλαση, οι κληρονομημενες μετρανε στη βαση)
+BOARD_METHODS = ("legal_moves", "generate_legal_moves", "king_in_check", "has_legal_moves", "move", "push", "pop")
+
+SAMPLES = 1000 # Ποσες προσφατες τιμες κραταει καθε μετρηση καθυστερησης (για p50/p95)
+
+
+class Stat:
+    __slots__ = ("name", "calls", "total", "own", "maximum", "code", "samples")
+
+    def __init__(self, name, code=None, samples=False):
+        self.name = name
+        self.calls = 0
+        self.total = 0.0 # Συνολικος χρονος (μαζι με τις μετρουμενες κλησεις που εγιναν μεσα της)
+        self.own = 0.0 # Χρονος χωρις τις μετρουμενες κλησεις που εγιναν μεσα της
+        self.maximum = 0.0
+        self.code = code # (αρχειο, γραμμη, ονομα) για την εξαγωγη σε pstats
+        self.samples = deque(maxlen=SAMPLES) if samples else None
+
+    def add(self, elapsed, own=None):
+        self.calls += 1
+        self.total += elapsed
+        self.own += elapsed if own is None else own
+        if elapsed > self.maximum:
+            self.maximum = elapsed
+        if self.samples is not None:
+            self.samples.append(elapsed)
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def as_dict(self):
+        result = {"calls": self.calls, "total": self.total, "own": self.own, "maximum": self.maximum,
+                  "mean": self.total / self.calls if self.calls else 0.0}
+        if self.samples is not None:
+            result["p50"] = self.percentile(0.5)
+            result["p95"] = self.percentile(0.95)
+        return result
+
+
+stats: dict[str, Stat] = {}
+_children = [] # Στοιβα: χρονος των μετρουμενων κλησεων μεσα σε καθε ενεργη κληση
+_wrapped = set()
+
+
+def stat(name, code=None, samples=False) -> Stat:
+    entry = stats.get(name)
+    if entry is None:
+        entry = stats[name] = Stat(name, code, samples)
+    return entry
+
+
+def _timed(function, entry):
+    @wraps(function)
+    def timed(*args, **kwargs):
+        _children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            inner = _children.pop()
+            if _children:
+                _children[-1] += elapsed
+            entry.add(elapsed, elapsed - inner)
+
+    return timed
+
+
+# Τυλιγει τις μεθοδους names της κλασης cls ωστε να μετρανε κλησεις και χρονο ("Κλαση.μεθοδος")
+def wrap(cls, names):
+    for name in names:
+        function = cls.__dict__.get(name)
+        if function is None or (cls, name) in _wrapped:
+            continue
+        code = function.__code__
+        entry = stat(f"{cls.__name__}.{name}", (code.co_filename, code.co_firstlineno, f"{cls.__name__}.{name}"))
+        setattr(cls, name, _timed(function, entry))
+        _wrapped.add((cls, name))
+
+
+# Τυλιγμα των δυο αναπαραστασεων της σκακιερας
+def install():
+    from board import Board
+    from bitboard import BitBoard
+
+    for cls in (Board, BitBoard):
+        wrap(cls, BOARD_METHODS)
+
+
+# Καθυστερηση απο τωρα μεχρι να ζωγραφισει το Tk τις αλλαγες του καμβα. Ο καμβας ζωγραφιζεται σε
+# idle callback που μπαινει στην ουρα κατα τη διαρκεια του handler. Τα idle callbacks που
+# προστιθενται μεσα σε ενα περασμα τρεχουν στο επομενο, γι' αυτο το δευτερο after_idle ερχεται
+# μετα τη σχεδιαση
+def until_redraw(root, name):
+    entry = stat(name, samples=True)
+    start = time.perf_counter()
+    root.after_idle(lambda: root.after_idle(lambda: entry.add(time.perf_counter() - start)))
+
+
+def reset():
+    for entry in stats.values():
+        entry.calls, entry.total, entry.own, entry.maximum = 0, 0.0, 0.0, 0.0
+        if entry.samples is not None:
+            entry.samples.clear()
+
+
+# --------------------------------------------------------------------- #
+#  Εξαγωγη
+# --------------------------------------------------------------------- #
+def to_json(path):
+    data = {name: entry.as_dict() for name, entry in sorted(stats.items()) if entry.calls}
+    Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+# Μορφη που διαβαζει το pstats.Stats: {(αρχειο, γραμμη, συναρτηση): (cc, nc, tt, ct, callers)}
+def to_pstats(path):
+    data = {}
+    for name, entry in stats.items():
+        if entry.calls:
+            code = entry.code or ("~", 0, name)
+            data[code] = (entry.calls, entry.calls, entry.own, entry.total, {})
+    with open(path, "wb") as file:
+        marshal.dump(data, file)
+
+
+# Αποθηκευση με βαση την καταληξη: .json για JSON, οτιδηποτε αλλο για pstats
+def save(path):
+    if Path(path).suffix.lower() == ".json":
+        to_json(path)
+    else:
+        to_pstats(path)
+
+
+# Συντομος πινακας (για το πλαισιο του GUI και την κονσολα): οι μετρησεις με τον περισσοτερο χρονο
+def report(limit=None) -> str:
+    rows = sorted((entry for entry in stats.values() if entry.calls), key=lambda entry: entry.total, reverse=True)
+    lines = [f"{'':28}{'calls':>8}{'mean ms':>9}{'max ms':>8}"]
+    for entry in rows[:limit]:
+        line = f"{entry.name[:28]:28}{entry.calls:>8}{1000 * entry.total / entry.calls:>9.3f}{1000 * entry.maximum:>8.1f}"
+        if entry.samples:
+            line += f"  p95 {1000 * entry.percentile(0.95):.1f}"
+        lines.append(line)
+    return "\n".join(lines)
+
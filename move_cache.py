@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+import config
+from board import Board
+
+# --------------------------------------------------------------------- #
+#  Cache νομιμων κινησεων ανα θεση (κλειδι Zobrist) για το GUI: καθε
+#  θεση αναλυεται μια φορα και το ιδιο αποτελεσμα χρησιμοποιειται για
+#  την επισημανση των στοχων, τον ελεγχο των κινησεων και το τελος του
+#  παιχνιδιου. Οι θεσεις που ξαναεμφανιζονται (αναιρεση, επαναληψεις)
+#  δεν ξαναϋπολογιζονται
+# --------------------------------------------------------------------- #
+PLAYING, MATE, STALEMATE = "playing", "mate", "stalemate"
+
+class PositionInfo(NamedTuple):
+    moves: tuple[int, ...] # Ολες οι νομιμες κινησεις
+    targets: dict[tuple[int, int], list[tuple[int, int]]] # (γραμμη, στηλη) κομματιου -> τετραγωνα που μπορει να παει
+    check: bool # Ο βασιλιας του παικτη που παιζει απειλειται
+    status: str # PLAYING, MATE ή STALEMATE
+
+    # "+" ή "#" για την κινηση που οδηγησε σε αυτη τη θεση
+    @property
+    def suffix(self) -> str:
+        if self.status == MATE:
+            return "#"
+        return "+" if self.check else ""
+
+
+def analyse(board: Board) -> PositionInfo:
+    moves = board.generate_legal_moves(board.turn)
+    status = board.status(moves) # Με τις κινησεις που ηδη υπαρχουν (και μενει στη σκακιερα)
+    targets = {}
+    for move in moves:
+        targets.setdefault(divmod(move & 63, 8), []).append(divmod(move >> 6, 8))
+    terminal = MATE if status.mate else STALEMATE if status.stalemate else PLAYING
+    return PositionInfo(tuple(moves), targets, status.check, terminal)
+
+
+class LegalMoveCache:
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or config.legal_cache_size
+        self.entries: OrderedDict[int, PositionInfo] = OrderedDict() # Η πιο προσφατη θεση στο τελος
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, board: Board) -> PositionInfo:
+        info = self.find(board.key)
+        if info is None:
+            info = self.store(board.key, analyse(board))
+        return info
+
+    # Αναζητηση με το κλειδι μονο (None αν η θεση δεν ειναι στο cache). Ο game server τη χρησιμοποιει
+    # ωστε να στελνει στις διεργασιες μονο τις θεσεις που λειπουν
+    def find(self, key: int) -> Optional[PositionInfo]:
+        info = self.entries.get(key)
+        if info is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return info
+
+    def store(self, key: int, info: PositionInfo) -> PositionInfo:
+        self.entries[key] = info
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return info
+
+    def clear(self):
+        self.entries.clear()
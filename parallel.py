@@ -0,0 +1,154 @@
+import multiprocessing as mp
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Optional
+
+import config
+from board import Board
+from bitboard import BitBoard
+from engine import Engine, SearchResult, INF, MATE, MATE_BOUND
+from book import OpeningBook
+from tablebase import open_tablebases
+from transposition import TranspositionTable
+
+# Κλαση σκακιερας που χρησιμοποιουν οι διεργασιες
+BOARD = BitBoard if config.board_backend == "bitboard" else Board
+
+# Η μηχανη καθε διεργασιας (δημιουργειται μια φορα, ο πινακας μεταθεσεων μενει μεταξυ εργασιων)
+_engine: Optional[Engine] = None
+
+
+# --------------------------------------------------------------------- #
+#  Κωδικας που τρεχει στις διεργασιες
+# --------------------------------------------------------------------- #
+def _init_worker(table_mb: float):
+    global _engine
+    _engine = Engine(table=TranspositionTable(table_mb), tablebases=open_tablebases())
+
+# Αναζητηση μιας κινησης της ριζας: παιζεται η κινηση και η θεση που προκυπτει ψαχνεται σε βαθος depth - 1.
+# alpha ειναι η καλυτερη τιμη της ριζας μεχρι τωρα: αρκει να ξερουμε αν η κινηση την ξεπερνα.
+# Επιστρεφει (κινηση, τιμη απο την πλευρα της ριζας, κυρια παραλλαγη, κομβοι) ή None αν δεν προλαβε
+def _search_root_move(snapshot, move: int, depth: int, time_limit: Optional[float], alpha: int):
+    board = BOARD.from_snapshot(snapshot)
+    board.push(move)
+    # Με τιμη ματ ως οριο ψαχνουμε με πληρες παραθυρο (η αποσταση ματ αλλαζει αναμεσα σε ριζα και παιδι)
+    beta = -alpha if abs(alpha) < MATE_BOUND else INF
+    result = _engine.search_fixed(board, depth - 1, time_limit, -INF, beta)
+    if result is None:
+        return None
+
+    # Η τιμη του παιδιου ειναι απο την πλευρα του αντιπαλου, και τα ματ απεχουν μια μιση κινηση παραπανω
+    score = -result.score
+    if score >= MATE_BOUND:
+        score -= 1
+    elif score <= -MATE_BOUND:
+        score += 1
+    return move, score, [move] + result.pv, result.nodes
+
+
+# --------------------------------------------------------------------- #
+#  ParallelSearch: iterative deepening οπου σε καθε βαθος οι κινησεις της
+#  ριζας μοιραζονται σε μια ομαδα διεργασιων (root splitting).
+#  Η διεπαφη ειναι ιδια με την Engine.search
+# --------------------------------------------------------------------- #
+class ParallelSearch:
+    def __init__(self, workers: int = None, max_depth: int = 64, time_limit: Optional[float] = None,
+                 table_mb: float = None, book: Optional[OpeningBook] = None):
+        self.workers = workers or config.search_workers
+        self.book = book
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        table_mb = config.tt_size_mb if table_mb is None else table_mb
+
+        # Ο πινακας μεταθεσεων μοιραζεται ισα στις διεργασιες
+        self.pool = ProcessPoolExecutor(
+            self.workers, mp_context=mp.get_context("spawn"),
+            initializer=_init_worker, initargs=(table_mb / self.workers,),
+        )
+
+    def search(self, board: Board, max_depth: Optional[int] = None, time_limit: Optional[float] = None,
+               on_info: Optional[Callable[[SearchResult], None]] = None, use_book: bool = False) -> SearchResult:
+        max_depth = max_depth or self.max_depth
+        time_limit = time_limit if time_limit is not None else self.time_limit
+        if use_book and self.book is not None:
+            move = self.book.choose(board)
+            if move is not None:
+                return SearchResult(move, 0, 0, [move], book=True)
+
+        start = time.perf_counter()
+        deadline = start + time_limit if time_limit else None
+
+        moves = board.generate_legal_moves(board.turn)
+        if not moves:
+            return SearchResult(None, -MATE if board.king_in_check(board.turn) else 0, 0)
+
+        snapshot = board.snapshot()
+        result = SearchResult(moves[0], 0, 0, [moves[0]])
+        nodes = 0
+        scores = {}
+
+        for depth in range(1, max_depth + 1):
+            # Οι καλυτερες κινησεις του προηγουμενου βαθους ψαχνονται πρωτες
+            queue = sorted(moves, key=lambda m: scores.get(m, -INF), reverse=True)
+            best = self._search_depth(snapshot, queue, depth, deadline, scores)
+            if best is None:
+                break
+
+            score, pv, depth_nodes = best
+            nodes += depth_nodes
+            result = SearchResult(pv[0], score, depth, pv, nodes, time.perf_counter() - start)
+            if on_info:
+                on_info(result)
+            if abs(score) >= MATE_BOUND:
+                break
+            if deadline and time.perf_counter() + result.elapsed > deadline:
+                break
+
+        result.nodes = nodes
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    # Ψαχνει ολες τις κινησεις της ριζας σε βαθος depth. Η πρωτη (η καλυτερη του προηγουμενου βαθους)
+    # ψαχνεται μονη της για να δωσει ενα καλο alpha, και οι υπολοιπες μοιραζονται στις διεργασιες
+    # με το καλυτερο alpha τη στιγμη που στελνονται. Επιστρεφει (τιμη, κυρια παραλλαγη, κομβοι)
+    # ή None αν δεν ολοκληρωθηκε εγκαιρα
+    def _search_depth(self, snapshot, queue: list[int], depth: int, deadline: Optional[float], scores: dict):
+        alpha, best, nodes = -INF, None, 0
+        queue = list(queue)
+        in_flight = set()
+
+        while queue or in_flight:
+            remaining = deadline - time.perf_counter() if deadline else None
+            if remaining is not None and remaining <= 0:
+                break
+            # Μεχρι να τελειωσει η πρωτη κινηση δεν στελνεται αλλη
+            limit = self.workers if best is not None else 1
+            while queue and len(in_flight) < limit:
+                in_flight.add(self.pool.submit(_search_root_move, snapshot, queue.pop(0), depth, remaining, alpha))
+
+            done, in_flight = wait(in_flight, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                outcome = future.result()
+                if outcome is None:
+                    return None
+                move, score, pv, move_nodes = outcome
+                nodes += move_nodes
+                scores[move] = score
+                if best is None or score > best[0]:
+                    best = (score, pv)
+                    alpha = max(alpha, score)
+
+        if queue or in_flight:
+            for future in in_flight:
+                future.cancel()
+            return None
+        return best[0], best[1], nodes
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
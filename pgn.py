@@ -0,0 +1,403 @@
+import argparse
+import multiprocessing as mp
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, NamedTuple, Optional, TextIO, Union
+
+import config
+from board import Board, Color, PieceType, STARTING_FEN, decode_move, square_name, parse_square
+from bitboard import BitBoard
+
+# Κλαση σκακιερας για την αναπαραγωγη παρτιδων
+BOARD = BitBoard if config.board_backend == "bitboard" else Board
+
+# --------------------------------------------------------------------- #
+#  Αλγεβρικη σημειογραφια (SAN), π.χ. "Nf3", "exd5", "Rad1", "Qh5+"
+#  Ροκε και προαγωγη δεν υπαρχουν στους κανονες της Board
+# --------------------------------------------------------------------- #
+SAN_LETTERS = {
+    PieceType.KNIGHT: "N",
+    PieceType.BISHOP: "B",
+    PieceType.ROOK: "R",
+    PieceType.QUEEN: "Q",
+    PieceType.KING: "K",
+}
+SAN_KINDS = {letter: kind for kind, letter in SAN_LETTERS.items()}
+
+SAN_PATTERN = re.compile(r"^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])$")
+
+# Κινηση σε SAN στη θεση της board (η κινηση πρεπει να ειναι νομιμη).
+# legal: οι νομιμες κινησεις της θεσης, αν εχουν ηδη υπολογιστει
+def move_to_san(board: Board, move: int, legal: Optional[list[int]] = None) -> str:
+    san = san_without_check(board, move, legal)
+    # Σαχ ή ματ
+    board.push(move)
+    if board.king_in_check(board.turn):
+        san += "+" if board.has_legal_moves(board.turn) else "#"
+    board.pop()
+    return san
+
+# Η SAN χωρις το "+" / "#" (που εξαρτωνται απο τη θεση μετα την κινηση)
+def san_without_check(board: Board, move: int, legal: Optional[list[int]] = None) -> str:
+    source_row, source_col, destination_row, destination_col = decode_move(move)
+    piece = board.sq[source_row][source_col]
+    capture = board.sq[destination_row][destination_col] is not None
+    destination = square_name(destination_row, destination_col)
+
+    if piece.kind is PieceType.PAWN:
+        san = ("abcdefgh"[source_col] + "x" if capture else "") + destination
+    else:
+        # Αποσαφηνιση οταν κι αλλο ιδιο κομματι μπορει να παει στο ιδιο τετραγωνο
+        if legal is None:
+            legal = board.generate_legal_moves(board.turn)
+        others = []
+        for other in legal:
+            if other >> 6 == move >> 6 and other != move:
+                other_piece = board.sq[(other & 63) >> 3][other & 7]
+                if other_piece.kind is piece.kind:
+                    others.append(divmod(other & 63, 8))
+        ambiguity = ""
+        if others:
+            if all(col != source_col for _, col in others):
+                ambiguity = "abcdefgh"[source_col]
+            elif all(row != source_row for row, _ in others):
+                ambiguity = "87654321"[source_row]
+            else:
+                ambiguity = square_name(source_row, source_col)
+        san = SAN_LETTERS[piece.kind] + ambiguity + ("x" if capture else "") + destination
+    return san
+
+# "+" ή "#" για την κινηση που μολις παιχτηκε, απο τις νομιμες κινησεις της νεας θεσης
+def check_suffix(board: Board, legal: list[int]) -> str:
+    if not board.king_in_check(board.turn):
+        return ""
+    return "+" if legal else "#"
+
+# SAN για καθε κινηση μιας παρτιδας (παιζονται πανω στην board), με μια παραγωγη νομιμων
+# κινησεων ανα μιση κινηση: οι νομιμες κινησεις της νεας θεσης δινουν το "+" / "#" της
+# κινησης και την αποσαφηνιση της επομενης
+def iter_san(board: Board, moves: Iterable[int]) -> Iterator[str]:
+    legal = board.generate_legal_moves(board.turn)
+    for move in moves:
+        san = san_without_check(board, move, legal)
+        board.push(move)
+        legal = board.generate_legal_moves(board.turn)
+        yield san + check_suffix(board, legal)
+
+# Κινηση απο SAN στη θεση της board. Πεταει ValueError αν δεν αντιστοιχει σε ακριβως μια νομιμη κινηση
+def move_from_san(board: Board, san: str, legal: Optional[list[int]] = None) -> int:
+    text = san.rstrip("+#!?")
+    if text in ("O-O", "O-O-O", "0-0", "0-0-0"):
+        raise ValueError(f"Το ροκε δεν υποστηριζεται: {san!r}")
+    if "=" in text:
+        raise ValueError(f"Η προαγωγη δεν υποστηριζεται: {san!r}")
+    match = SAN_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Μη εγκυρη κινηση SAN: {san!r}")
+
+    letter, from_file, from_rank, _, destination = match.groups()
+    kind = SAN_KINDS[letter] if letter else PieceType.PAWN
+    destination_row, destination_col = parse_square(destination)
+    target = destination_row * 8 + destination_col
+
+    if legal is None:
+        legal = board.generate_legal_moves(board.turn)
+    candidates = []
+    for move in legal:
+        if move >> 6 != target:
+            continue
+        source_row, source_col = divmod(move & 63, 8)
+        if board.sq[source_row][source_col].kind is not kind:
+            continue
+        if from_file and "abcdefgh"[source_col] != from_file:
+            continue
+        if from_rank and "87654321"[source_row] != from_rank:
+            continue
+        candidates.append(move)
+
+    if not candidates:
+        raise ValueError(f"Μη νομιμη κινηση: {san!r}")
+    if len(candidates) > 1:
+        raise ValueError(f"Διφορουμενη κινηση: {san!r}")
+    return candidates[0]
+
+
+# --------------------------------------------------------------------- #
+#  Εγγραφη PGN
+# --------------------------------------------------------------------- #
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+# Αποτελεσμα της παρτιδας στη σημερινη θεση ("*" αν δεν εχει τελειωσει)
+def game_result(board: Board) -> str:
+    if board.has_legal_moves(board.turn):
+        return "*"
+    if not board.king_in_check(board.turn):
+        return "1/2-1/2"
+    return "0-1" if board.turn is Color.WHITE else "1-0"
+
+# Η παρτιδα της board (απο την αρχικη της θεση) σε PGN
+def game_to_pgn(board: Board, headers: Optional[dict[str, str]] = None, result: Optional[str] = None) -> str:
+    start_fen, moves = board.snapshot()
+    result = result or game_result(board)
+    headers = dict(headers or {})
+    headers.setdefault("Result", result)
+    if start_fen != STARTING_FEN:
+        headers.setdefault("SetUp", "1")
+        headers.setdefault("FEN", start_fen)
+
+    replay = type(board).from_fen(start_fen)
+    tokens = []
+    for san in iter_san(replay, moves):
+        # Η iter_san εχει ηδη παιξει την κινηση: ο αριθμος ειναι της θεσης πριν απο αυτη
+        turn = replay.turn.opposite
+        if turn is Color.WHITE or not tokens:
+            number = replay.fullmove if turn is Color.WHITE else replay.fullmove - 1
+            tokens.append(f"{number}." if turn is Color.WHITE else f"{number}...")
+        tokens.append(san)
+    tokens.append(result)
+
+    # Γραμμες το πολυ 80 χαρακτηρων
+    lines, line = [], ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > 80:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+
+    header_lines = [f'[{name} "{value}"]' for name, value in headers.items()]
+    return "\n".join(header_lines) + "\n\n" + "\n".join(lines) + "\n"
+
+
+# --------------------------------------------------------------------- #
+#  Αναγνωση PGN / FEN χωρις να φορτωνεται ολο το αρχειο στη μνημη
+# --------------------------------------------------------------------- #
+class PGNGame(NamedTuple):
+    headers: dict[str, str]
+    moves: list[str] # Κινησεις σε SAN
+    result: str
+
+    @property
+    def start_fen(self) -> str:
+        return self.headers.get("FEN", STARTING_FEN)
+
+HEADER_PATTERN = re.compile(r'^\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]')
+# Σχολια {...} και ;..., αριθμοι κινησεων, NAG ($1) και αποτελεσματα
+COMMENT_PATTERN = re.compile(r"\{[^}]*\}|;[^\n]*")
+MOVE_NUMBER_PATTERN = re.compile(r"^\d+\.+")
+
+def _open(source: Union[str, TextIO]) -> TextIO:
+    return open(source, encoding="utf-8", errors="replace") if isinstance(source, str) else source
+
+# Κειμενο καθε παρτιδας (headers + κινησεις) ενος αρχειου PGN, μια-μια
+def iter_pgn_texts(source: Union[str, TextIO]) -> Iterator[str]:
+    f = _open(source)
+    try:
+        lines, in_moves = [], False
+        for line in f:
+            # Νεα παρτιδα: header μετα απο κινησεις
+            if line.startswith("[") and in_moves:
+                yield "".join(lines)
+                lines, in_moves = [], False
+            if line.strip() and not line.startswith("["):
+                in_moves = True
+            lines.append(line)
+        if any(line.strip() for line in lines):
+            yield "".join(lines)
+    finally:
+        if f is not source:
+            f.close()
+
+# Ενα αρχειο FEN (μια θεση ανα γραμμη) ως παρτιδες χωρις κινησεις
+def iter_fen_texts(source: Union[str, TextIO]) -> Iterator[str]:
+    f = _open(source)
+    try:
+        for line in f:
+            fen = line.strip()
+            if fen and not fen.startswith("#"):
+                yield f'[SetUp "1"]\n[FEN "{fen}"]\n\n*\n'
+    finally:
+        if f is not source:
+            f.close()
+
+def parse_game(text: str) -> PGNGame:
+    headers, movetext = {}, []
+    for line in text.splitlines():
+        match = HEADER_PATTERN.match(line)
+        if match:
+            headers[match.group(1)] = match.group(2).replace('\\"', '"')
+        else:
+            movetext.append(line)
+
+    body = COMMENT_PATTERN.sub(" ", "\n".join(movetext))
+    moves, result, depth = [], headers.get("Result", "*"), 0
+    # Οι παραλλαγες (...) μπορει να ειναι εμφωλευμενες: αγνοουνται
+    for token in body.replace("(", " ( ").replace(")", " ) ").split():
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth:
+            continue
+        elif token in RESULTS:
+            result = token
+        elif token.startswith("$"):
+            continue
+        else:
+            token = MOVE_NUMBER_PATTERN.sub("", token)
+            if token:
+                moves.append(token)
+    return PGNGame(headers, moves, result)
+
+def iter_pgn(source: Union[str, TextIO]) -> Iterator[PGNGame]:
+    for text in iter_pgn_texts(source):
+        yield parse_game(text)
+
+# Κειμενα παρτιδων αναλογα με την καταληξη του αρχειου (.fen / .epd: μια θεση ανα γραμμη)
+def iter_game_texts(path: str) -> Iterator[str]:
+    if path.endswith((".fen", ".epd")):
+        return iter_fen_texts(path)
+    return iter_pgn_texts(path)
+
+
+# --------------------------------------------------------------------- #
+#  Αναπαραγωγη παρτιδων μεσω της Board.move
+# --------------------------------------------------------------------- #
+class Position(NamedTuple):
+    game: int # Αυξων αριθμος παρτιδας στο αρχειο (απο 0)
+    ply: int # Μισες κινησεις απο την αρχικη θεση
+    fen: str
+
+class ReplayError(NamedTuple):
+    game: int
+    ply: int
+    move: str
+    message: str
+
+class GameStats(NamedTuple):
+    game: int
+    headers: dict[str, str]
+    plies: int # Κινησεις που παιχτηκαν
+    result: str # Αποτελεσμα που γραφει το αρχειο
+    final_fen: str
+    outcome: str # Αποτελεσμα της τελικης θεσης ("*" αν δεν ειναι ματ ή πατ)
+    error: Optional[ReplayError]
+
+MODES = ("stats", "positions", "errors")
+
+# Αναπαραγει μια παρτιδα κινηση προς κινηση. Επιστρεφει τα αντικειμενα που ζητα το mode
+def replay_game(text: str, game: int = 0, mode: str = "stats") -> list:
+    parsed = parse_game(text)
+    items = []
+    error = None
+    try:
+        board = BOARD.from_fen(parsed.start_fen)
+    except ValueError as exc:
+        error = ReplayError(game, 0, "", str(exc))
+        board = None
+
+    if board is not None:
+        if mode == "positions":
+            items.append(Position(game, 0, board.fen()))
+        for ply, san in enumerate(parsed.moves, 1):
+            try:
+                move = move_from_san(board, san)
+            except ValueError as exc:
+                error = ReplayError(game, ply, san, str(exc))
+                break
+            # Η κινηση περναει απο τους ιδιους ελεγχους με το GUI
+            if not board.move(*decode_move(move)):
+                error = ReplayError(game, ply, san, "Η Board.move απερριψε την κινηση")
+                break
+            if mode == "positions":
+                items.append(Position(game, ply, board.fen()))
+
+    if mode == "errors":
+        return [error] if error else []
+    if mode == "positions":
+        return items + ([error] if error else [])
+    plies = len(board.history) if board is not None else 0
+    final_fen = board.fen() if board is not None else ""
+    outcome = game_result(board) if board is not None else "*"
+    return [GameStats(game, parsed.headers, plies, parsed.result, final_fen, outcome, error)]
+
+def _replay_chunk(texts: list[str], first_game: int, mode: str) -> list:
+    items = []
+    for i, text in enumerate(texts):
+        items.extend(replay_game(text, first_game + i, mode))
+    return items
+
+# Χωριζει τα κειμενα σε κομματια των chunk_size παρτιδων
+def chunks(texts: Iterable[str], chunk_size: int) -> Iterator[list[str]]:
+    chunk = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# Αναπαραγει ολες τις παρτιδες της πηγης σε μια ομαδα διεργασιων και επιστρεφει τα αποτελεσματα
+# με τη σειρα του αρχειου. Το πολυ 2 κομματια ανα διεργασια ειναι "στον αερα", οποτε η μνημη μενει
+# σταθερη οσο μεγαλο κι αν ειναι το αρχειο. Με workers=1 ολα τρεχουν στην ιδια διεργασια
+def replay(texts: Iterable[str], mode: str = "stats", workers: Optional[int] = None,
+           chunk_size: int = 200) -> Iterator:
+    if mode not in MODES:
+        raise ValueError(f"Αγνωστο mode: {mode!r}")
+    workers = workers or config.search_workers
+
+    if workers == 1:
+        game = 0
+        for chunk in chunks(texts, chunk_size):
+            yield from _replay_chunk(chunk, game, mode)
+            game += len(chunk)
+        return
+
+    with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn")) as pool:
+        pending = deque()
+        game = 0
+        for chunk in chunks(texts, chunk_size):
+            pending.append(pool.submit(_replay_chunk, chunk, game, mode))
+            game += len(chunk)
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# --------------------------------------------------------------------- #
+#  python pgn.py games.pgn [--mode stats|positions|errors] [--workers N]
+# --------------------------------------------------------------------- #
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ελεγχος και αναπαραγωγη αρχειων PGN / FEN")
+    parser.add_argument("path")
+    parser.add_argument("--mode", choices=MODES, default="errors")
+    parser.add_argument("--workers", type=int, default=config.search_workers)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    games = errors = plies = 0
+    for item in replay(iter_game_texts(args.path), args.mode, args.workers, args.chunk_size):
+        if isinstance(item, ReplayError):
+            errors += 1
+            print(f"game {item.game + 1}, ply {item.ply} {item.move}: {item.message}", file=sys.stderr)
+        elif isinstance(item, Position):
+            print(item.fen)
+        else:
+            games += 1
+            plies += item.plies
+            if item.error:
+                errors += 1
+                print(f"game {item.game + 1}, ply {item.error.ply} {item.error.move}: {item.error.message}", file=sys.stderr)
+            print(f"{item.game + 1}\t{item.plies}\t{item.result}\t{item.outcome}\t{item.final_fen}")
+    if args.mode == "stats":
+        print(f"{games} games, {plies} plies, {errors} errors", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import mmap
+import os
+import struct
+from typing import Iterable
+
+import numpy as np
+
+import config
+from board import Board, PACKED_SIZE
+from bitboard import BitBoard
+
+# Κλαση σκακιερας που επιστρεφει το PositionStore
+BOARD = BitBoard if config.board_backend == "bitboard" else Board
+
+# --------------------------------------------------------------------- #
+#  Αρχειο θεσεων: επικεφαλιδα 16 bytes και μετα εγγραφες σταθερου μηκους
+#  (η packed μορφη της Board.pack). Γραφεται μονο στο τελος, διαβαζεται με
+#  mmap χωρις αντιγραφη: η θεση i βρισκεται στο HEADER.size + i * PACKED_SIZE
+# --------------------------------------------------------------------- #
+MAGIC = b"CHPOS"
+VERSION = 1
+HEADER = struct.Struct("<5sBH8x") # magic, εκδοση, μηκος εγγραφης
+
+# Η ιδια εγγραφη ως NumPy structured dtype
+POSITION_DTYPE = np.dtype([
+    ("squares", np.uint8, 32), # Δυο τετραγωνα ανα byte
+    ("flags", np.uint8), # bit 0: παιζουν τα μαυρα, bits 1-4: ροκε
+    ("en_passant", np.uint8), # 255 = κανενα
+    ("fullmove", "<u2"),
+])
+assert POSITION_DTYPE.itemsize == PACKED_SIZE
+
+
+def _check_header(data: bytes, path: str):
+    magic, version, record_size = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION or record_size != PACKED_SIZE:
+        raise ValueError(f"Μη εγκυρο αρχειο θεσεων: {path}")
+
+
+# --------------------------------------------------------------------- #
+#  Εγγραφη (append-only)
+# --------------------------------------------------------------------- #
+class PositionWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION, PACKED_SIZE))
+        else:
+            with open(path, "rb") as f:
+                _check_header(f.read(HEADER.size), path)
+            # Μια μισογραμμενη εγγραφη στο τελος (π.χ. απο διακοπη) αγνοειται
+            extra = (self.file.tell() - HEADER.size) % PACKED_SIZE
+            if extra:
+                self.file.truncate(self.file.tell() - extra)
+
+    def append(self, board: Board):
+        self.file.write(board.pack())
+
+    def extend(self, boards: Iterable[Board]):
+        self.file.write(b"".join(board.pack() for board in boards))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --------------------------------------------------------------------- #
+#  Αναγνωση με mmap: τυχαια προσβαση σε O(1) χωρις να διαβαζεται το αρχειο
+# --------------------------------------------------------------------- #
+class PositionStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        if size < HEADER.size:
+            raise ValueError(f"Μη εγκυρο αρχειο θεσεων: {path}")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        _check_header(self.map[:HEADER.size], path)
+        self.count = (size - HEADER.size) // PACKED_SIZE
+
+    def __len__(self) -> int:
+        return self.count
+
+    # Τα bytes της θεσης i
+    def packed(self, i: int) -> bytes:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        start = HEADER.size + i * PACKED_SIZE
+        return self.map[start:start + PACKED_SIZE]
+
+    def __getitem__(self, i: int) -> Board:
+        return BOARD.unpack(self.packed(i))
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    # Ολες οι θεσεις ως structured array πανω στο ιδιο το mmap (χωρις αντιγραφη)
+    def array(self) -> np.ndarray:
+        return np.frombuffer(self.map, dtype=POSITION_DTYPE, count=self.count, offset=HEADER.size)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Μετατροπη εγγραφων σε (κωδικοι (N, 64), παιζουν τα μαυρα (N,)) για το batch_eval.evaluate_codes
+def to_codes(records: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    squares = records["squares"]
+    codes = np.empty((len(records), 64), dtype=np.int8)
+    codes[:, 0::2] = squares & 15
+    codes[:, 1::2] = squares >> 4
+    return codes, (records["flags"] & 1).astype(bool)
@@ -0,0 +1,87 @@
+# --------------------------------------------------------------------- #
+#  Αξιες κομματιων και πινακες θεσεων (piece-square tables)
+#  Ολοι οι πινακες ειναι με τη σειρα της board.PIECE_KINDS (πιονι, ιππος,
+#  αξιωματικος, πυργος, βασιλισσα, βασιλιας), ωστε η σκακιερα να τους
+#  χρησιμοποιει χωρις να φορτωνει την evaluation (οπως τα κλειδια Zobrist)
+# --------------------------------------------------------------------- #
+
+# Αξιες κομματιων (centipawns)
+VALUES = (100, 320, 330, 500, 900, 0)
+
+# Πινακες θεσεων απο την πλευρα των λευκων. Η πρωτη γραμμη του πινακα ειναι η γραμμη 0
+# της σκακιερας (8η σειρα), για τα μαυρα η γραμμη καθρεφτιζεται (7 - γραμμη)
+TABLES = (
+    [ # Πιονι
+         0,   0,   0,   0,   0,   0,   0,   0,
+        50,  50,  50,  50,  50,  50,  50,  50,
+        10,  10,  20,  30,  30,  20,  10,  10,
+         5,   5,  10,  25,  25,  10,   5,   5,
+         0,   0,   0,  20,  20,   0,   0,   0,
+         5,  -5, -10,   0,   0, -10,  -5,   5,
+         5,  10,  10, -20, -20,  10,  10,   5,
+         0,   0,   0,   0,   0,   0,   0,   0,
+    ],
+    [ # Ιππος
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20,   0,   0,   0,   0, -20, -40,
+        -30,   0,  10,  15,  15,  10,   0, -30,
+        -30,   5,  15,  20,  20,  15,   5, -30,
+        -30,   0,  15,  20,  20,  15,   0, -30,
+        -30,   5,  10,  15,  15,  10,   5, -30,
+        -40, -20,   0,   5,   5,   0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ],
+    [ # Αξιωματικος
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   5,   5,  10,  10,   5,   5, -10,
+        -10,   0,  10,  10,  10,  10,   0, -10,
+        -10,  10,  10,  10,  10,  10,  10, -10,
+        -10,   5,   0,   0,   0,   0,   5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ],
+    [ # Πυργος
+         0,   0,   0,   0,   0,   0,   0,   0,
+         5,  10,  10,  10,  10,  10,  10,   5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+         0,   0,   0,   5,   5,   0,   0,   0,
+    ],
+    [ # Βασιλισσα
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,   5,   5,   5,   0, -10,
+         -5,   0,   5,   5,   5,   5,   0,  -5,
+          0,   0,   5,   5,   5,   5,   0,  -5,
+        -10,   5,   5,   5,   5,   5,   0, -10,
+        -10,   0,   5,   0,   0,   0,   0, -10,
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+    ],
+    [ # Βασιλιας
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+         20,  20,   0,   0,   0,   0,  20,  20,
+         20,  30,  10,   0,   0,  10,  30,  20,
+    ],
+)
+
+# Βαρη φασης παρτιδας: 24 με ολα τα κομματια, 0 οταν εχουν μεινει μονο βασιλιαδες και πιονια
+PHASE_WEIGHTS = (0, 1, 1, 2, 4, 0)
+PHASE_TOTAL = 24
+
+# --------------------------------------------------------------------- #
+#  Πινακες για τις σταδιακες ενημερωσεις της Board, με δεικτη απο
+#  board.PIECE_INDEX (0-5 λευκα, 6-11 μαυρα) και προσημο (+ λευκα, - μαυρα)
+# --------------------------------------------------------------------- #
+MATERIAL = list(VALUES) + [-value for value in VALUES]
+SQUARE_VALUES = ([list(table) for table in TABLES]
+                 + [[-table[(7 - s // 8) * 8 + s % 8] for s in range(64)] for table in TABLES])
+PHASE = list(PHASE_WEIGHTS) * 2
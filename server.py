@@ -0,0 +1,405 @@
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing as mp
+import random
+import sys
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from typing import Optional
+
+import config
+from board import Board, Color, move_from_uci, move_to_uci
+from bitboard import BitBoard
+from move_cache import LegalMoveCache, PositionInfo, analyse, MATE, PLAYING, STALEMATE
+from pgn import san_without_check
+
+BOARD = BitBoard if config.board_backend == "bitboard" else Board
+
+# --------------------------------------------------------------------- #
+#  Server για πολλες παρτιδες ταυτοχρονα (asyncio, TCP).
+#  Πρωτοκολλο: ενα αντικειμενο JSON ανα γραμμη και προς τις δυο μεριες
+#
+#   -> {"op": "new", "ref": 1}                   <- {"op": "created", "ref": 1, "game": 7, "color": "w"}
+#   -> {"op": "join", "game": 7}                 <- {"op": "joined", "game": 7, "color": "b"}
+#   -> {"op": "move", "game": 7, "move": "g2g3"}
+#   -> {"op": "resign", "game": 7}               <- {"op": "end", "game": 7, "result": "0-1", "reason": "resign"}
+#   -> {"op": "stats"}                           <- {"op": "stats", "games": ..., "moves": ..., ...}
+#   <- {"op": "error", "game": 7, "message": "..."}
+#
+#  Μολις μπει ο δευτερος παικτης και μετα απο καθε κινηση, και οι δυο παικτες
+#  παιρνουν την κατασταση της παρτιδας (status: playing, mate, stalemate,
+#  threefold ή fifty_moves, και με οτιδηποτε εκτος απο playing ακολουθει "end"):
+#   <- {"op": "state", "game": 7, "fen": "...", "turn": "b", "last": "g2g3", "san": "g3",
+#       "status": "playing", "moves": ["a7a6", ...]}
+#
+#  Η αναλυση καθε νεας θεσης (νομιμες κινησεις, σαχ, ματ/πατ) γινεται σε
+#  διεργασιες, ωστε το event loop να μη σταματαει, και μενει σε cache
+#  (move_cache.py) για τις θεσεις που ξαναεμφανιζονται σε αλλες παρτιδες
+# --------------------------------------------------------------------- #
+RESULTS = {Color.WHITE: "0-1", Color.BLACK: "1-0"} # Αποτελεσμα οταν χανει το χρωμα
+
+
+# Λαθος του client (απανταται με μηνυμα "error", η συνδεση μενει ανοιχτη)
+class ProtocolError(Exception):
+    pass
+
+
+# Η αναλυση μιας θεσης απετυχε (π.χ. χαλασε η δεξαμενη διεργασιων). Απανταται επισης με "error"
+class AnalysisError(Exception):
+    pass
+
+
+# Αναλυση θεσης σε διεργασια (η θεση ταξιδευει σε packed μορφη, 36 bytes)
+def analyse_packed(data: bytes) -> PositionInfo:
+    return analyse(BOARD.unpack(data))
+
+
+class Connection:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.games: set[int] = set() # Παρτιδες οπου παιζει αυτη η συνδεση (με το ενα ή και με τα δυο χρωματα)
+
+    def send(self, message: dict):
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+    # Απαντηση σε αιτημα (με το "ref" του αιτηματος, αν υπαρχει)
+    def reply(self, request: dict, message: dict):
+        if "ref" in request:
+            message["ref"] = request["ref"]
+        self.send(message)
+
+
+class Game:
+    def __init__(self, game_id: int, board: Board, position: PositionInfo):
+        self.id = game_id
+        self.board = board
+        self.position = position # Αναλυση της τρεχουσας θεσης
+        self.players: dict[Color, Connection] = {}
+        self.lock = asyncio.Lock() # Μια κινηση τη φορα ανα παρτιδα (η αναλυση γινεται με await)
+
+    # "playing", "mate", "stalemate", "threefold" ή "fifty_moves" (απο τη Board.status, σε σταθερο χρονο)
+    def status(self) -> str:
+        status = self.board.status(self.position.moves)
+        for name in (MATE, STALEMATE, "threefold", "fifty_moves"):
+            if getattr(status, name):
+                return name
+        return PLAYING
+
+    def state(self, move: Optional[int] = None, san: Optional[str] = None) -> dict:
+        return {"op": "state", "game": self.id, "fen": self.board.fen(), "turn": self.board.turn.value,
+                "last": move_to_uci(move) if move is not None else None, "san": san,
+                "status": self.status(), "moves": [move_to_uci(move) for move in self.position.moves]}
+
+    def broadcast(self, message: dict):
+        for connection in set(self.players.values()):
+            connection.send(message)
+
+
+class GameServer:
+    def __init__(self, workers: Optional[int] = None, cache_size: Optional[int] = None):
+        self.workers = config.server_workers if workers is None else workers
+        self.pool = self._new_pool()
+        self.positions = LegalMoveCache(cache_size or config.server_cache_size)
+        self.games: dict[int, Game] = {}
+        self.ids = itertools.count(1)
+        self.moves = 0
+        self.handlers = {"new": self.new_game, "join": self.join, "move": self.move, "resign": self.resign,
+                         "stats": self.stats}
+
+    def _new_pool(self) -> Optional[ProcessPoolExecutor]:
+        return ProcessPoolExecutor(self.workers, mp_context=mp.get_context("spawn")) if self.workers else None
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+
+    # Αναλυση θεσης: απο το cache, αλλιως σε διεργασια (ή εδω, αν δεν υπαρχουν διεργασιες). Με move
+    # αναλυεται η θεση μετα την κινηση, ενω η board μενει ιδια και κατα τη διαρκεια της αναμονης
+    async def analyse(self, board: Board, move: Optional[int] = None) -> PositionInfo:
+        if move is not None:
+            board.push(move)
+        try:
+            key = board.key
+            info = self.positions.find(key)
+            if info is None and not self.pool:
+                info = analyse(board)
+                self.positions.store(key, info)
+            data = board.pack() if info is None else None
+        finally:
+            if move is not None:
+                board.pop()
+        if info is None:
+            pool = self.pool
+            try:
+                info = await asyncio.get_running_loop().run_in_executor(pool, analyse_packed, data)
+            except Exception as error:
+                # Μια δεξαμενη που χαλασε (π.χ. σκοτωθηκε διεργασια) αντικαθισταται για τις επομενες αναλυσεις
+                if isinstance(error, BrokenExecutor) and self.pool is pool:
+                    pool.shutdown(wait=False)
+                    self.pool = self._new_pool()
+                raise AnalysisError(f"Αποτυχια αναλυσης θεσης: {type(error).__name__}: {error}") from error
+            self.positions.store(key, info)
+        return info
+
+    # Μια συνδεση: διαβαζει γραμμες μεχρι να κλεισει. Καθε μηνυμα εκτελειται σε δικη του εργασια,
+    # ωστε μια αναλυση που περιμενει διεργασια να μην καθυστερει τις αλλες παρτιδες της συνδεσης
+    # (η σειρα των κινησεων μιας παρτιδας κρατιεται απο το lock της)
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = Connection(writer)
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self.dispatch(connection, line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if tasks:
+                await asyncio.wait(tasks)
+            for game_id in list(connection.games):
+                game = self.games.get(game_id)
+                if game:
+                    self.finish(game, "*", "disconnect")
+            writer.close()
+
+    async def dispatch(self, connection: Connection, line: bytes):
+        message = None
+        try:
+            message = json.loads(line)
+            handler = self.handlers.get(message.get("op"))
+            if handler is None:
+                raise ProtocolError(f"Αγνωστη εντολη: {message.get('op')!r}")
+            await handler(connection, message)
+        except (ProtocolError, AnalysisError, ValueError, KeyError, TypeError, AttributeError) as error:
+            reply = {"op": "error", "message": str(error) if isinstance(error, (ProtocolError, AnalysisError)) else
+                     f"Μη εγκυρο μηνυμα: {type(error).__name__}: {error}"}
+            if isinstance(message, dict):
+                reply.update({key: message[key] for key in ("ref", "game") if key in message})
+            connection.send(reply)
+
+    def game(self, message: dict) -> Game:
+        game = self.games.get(message["game"])
+        if game is None:
+            raise ProtocolError(f"Αγνωστη παρτιδα: {message['game']}")
+        return game
+
+    def finish(self, game: Game, result: str, reason: str):
+        game.broadcast({"op": "end", "game": game.id, "result": result, "reason": reason})
+        del self.games[game.id]
+        for connection in game.players.values():
+            connection.games.discard(game.id)
+
+    async def new_game(self, connection: Connection, message: dict):
+        color = Color(message.get("color", "w"))
+        board = BOARD.from_fen(message["fen"]) if "fen" in message else BOARD()
+        game = Game(next(self.ids), board, await self.analyse(board))
+        game.players[color] = connection
+        connection.games.add(game.id)
+        self.games[game.id] = game
+        connection.reply(message, {"op": "created", "game": game.id, "color": color.value})
+
+    async def join(self, connection: Connection, message: dict):
+        game = self.game(message)
+        free = [color for color in (Color.WHITE, Color.BLACK) if color not in game.players]
+        if not free:
+            raise ProtocolError(f"Η παρτιδα {game.id} εχει ηδη δυο παικτες")
+        game.players[free[0]] = connection
+        connection.games.add(game.id)
+        connection.reply(message, {"op": "joined", "game": game.id, "color": free[0].value})
+        game.broadcast(game.state())
+        self.finish_if_over(game)
+
+    async def move(self, connection: Connection, message: dict):
+        game = self.game(message)
+        move = move_from_uci(message["move"])
+        async with game.lock:
+            board = game.board
+            if game.id not in self.games:
+                raise ProtocolError(f"Η παρτιδα {game.id} εχει τελειωσει")
+            if len(game.players) < 2:
+                raise ProtocolError("Η παρτιδα περιμενει αντιπαλο")
+            if game.players[board.turn] is not connection:
+                raise ProtocolError("Δεν ειναι η σειρα σας")
+            if move not in game.position.moves:
+                raise ProtocolError(f"Μη νομιμη κινηση: {message['move']}")
+            san = san_without_check(board, move, game.position.moves)
+            # Πρωτα η αναλυση και μετα η κινηση: αν η αναλυση αποτυχει ή ακυρωθει, η παρτιδα μενει ως ηταν
+            position = await self.analyse(board, move)
+            board.push(move)
+            game.position = position
+            self.moves += 1
+            game.broadcast(game.state(move, san + game.position.suffix))
+            self.finish_if_over(game)
+
+    # Ληξη με ματ, πατ, τριπλη επαναληψη ή κανονα 50 κινησεων
+    def finish_if_over(self, game: Game):
+        status = game.status()
+        if status != PLAYING:
+            self.finish(game, RESULTS[game.board.turn] if status == MATE else "1/2-1/2", status)
+
+    async def resign(self, connection: Connection, message: dict):
+        game = self.game(message)
+        async with game.lock:
+            colors = [color for color, player in game.players.items() if player is connection]
+            if not colors or game.id not in self.games:
+                raise ProtocolError(f"Δεν παιζετε στην παρτιδα {game.id}")
+            # Με τα δυο χρωματα στην ιδια συνδεση παραιτειται αυτος που παιζει
+            color = Color(message["color"]) if "color" in message else \
+                game.board.turn if len(colors) == 2 else colors[0]
+            self.finish(game, RESULTS[color], "resign")
+
+    async def stats(self, connection: Connection, message: dict):
+        connection.reply(message, {"op": "stats", "games": len(self.games), "moves": self.moves,
+                                   "cache_hits": self.positions.hits, "cache_misses": self.positions.misses})
+
+
+async def serve(host: str, port: int, workers: Optional[int] = None):
+    server = GameServer(workers)
+    listener = await asyncio.start_server(server.handle, host, port, backlog=4096)
+    print(f"Game server στο {host}:{port} (διεργασιες αναλυσης: {server.workers})", flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+# --------------------------------------------------------------------- #
+#  Γεννητρια φορτου: πολλες ταυτοχρονες παρτιδες με τυχαιες νομιμες
+#  κινησεις (και τα δυο χρωματα απο την ιδια συνδεση). Μετραει κινησεις
+#  ανα δευτερολεπτο και την καθυστερηση απο την αποστολη μιας κινησης
+#  μεχρι να ερθει η νεα κατασταση
+# --------------------------------------------------------------------- #
+class LoadConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.refs = itertools.count(1)
+        self.pending: dict[int, asyncio.Future] = {} # ref -> απαντηση που περιμενουμε
+        self.inbox: dict[int, asyncio.Queue] = {} # παρτιδα -> μηνυματα της (state, end, error)
+
+    def send(self, message: dict):
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+    async def read(self):
+        while line := await self.reader.readline():
+            message = json.loads(line)
+            future = self.pending.pop(message.get("ref"), None)
+            if future:
+                if message["op"] == "error":
+                    future.set_exception(ProtocolError(message["message"]))
+                    continue
+                # Η ουρα μιας νεας παρτιδας πρεπει να υπαρχει πριν ερθει η πρωτη κατασταση
+                if message["op"] == "created":
+                    self.inbox[message["game"]] = asyncio.Queue()
+                future.set_result(message)
+            elif message.get("game") in self.inbox and message["op"] != "joined":
+                self.inbox[message["game"]].put_nowait(message)
+
+    # Αιτημα με απαντηση (new, stats)
+    async def request(self, message: dict) -> dict:
+        ref = next(self.refs)
+        future = self.pending[ref] = asyncio.get_running_loop().create_future()
+        self.send(dict(message, ref=ref))
+        return await future
+
+
+async def load_game(connection: LoadConnection, rng: random.Random, max_plies: int,
+                    latencies: list[float], counters: dict):
+    game_id = (await connection.request({"op": "new"}))["game"]
+    inbox = connection.inbox[game_id]
+    connection.send({"op": "join", "game": game_id})
+    message = await inbox.get()
+    plies = 0
+    while message["op"] == "state" and message["status"] == PLAYING:
+        if plies >= max_plies:
+            connection.send({"op": "resign", "game": game_id})
+            break
+        start = time.perf_counter()
+        connection.send({"op": "move", "game": game_id, "move": rng.choice(message["moves"])})
+        message = await inbox.get()
+        latencies.append(time.perf_counter() - start)
+        plies += 1
+    if message["op"] == "error":
+        counters["errors"] += 1
+    while message["op"] != "end":
+        message = await inbox.get()
+    del connection.inbox[game_id]
+    counters["games"] += 1
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def run_load(host: str, port: int, games: int, connections: int, max_plies: int, seed: int = 0) -> dict:
+    links = []
+    for _ in range(connections):
+        reader, writer = await asyncio.open_connection(host, port)
+        links.append(LoadConnection(reader, writer))
+    readers = [asyncio.create_task(link.read()) for link in links]
+    rng = random.Random(seed)
+    latencies, counters = [], {"games": 0, "errors": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(load_game(links[i % connections], random.Random(rng.random()), max_plies, latencies, counters)
+                           for i in range(games)))
+    elapsed = time.perf_counter() - start
+
+    server = await links[0].request({"op": "stats"})
+    for link in links:
+        link.writer.close()
+    for task in readers:
+        task.cancel()
+    return {"games": counters["games"], "errors": counters["errors"], "moves": len(latencies), "elapsed": elapsed,
+            "moves_per_second": len(latencies) / elapsed, "p50": percentile(latencies, 0.5),
+            "p99": percentile(latencies, 0.99), "max": max(latencies, default=0.0),
+            "cache_hits": server["cache_hits"], "cache_misses": server["cache_misses"]}
+
+
+# --------------------------------------------------------------------- #
+#  python server.py serve --port 8765 --workers 2
+#  python server.py load --games 1000 --connections 100 --max-plies 60
+# --------------------------------------------------------------------- #
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Game server για πολλες ταυτοχρονες παρτιδες")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Εκκινηση του server")
+    serve_parser.add_argument("--host", default=config.server_host)
+    serve_parser.add_argument("--port", type=int, default=config.server_port)
+    serve_parser.add_argument("--workers", type=int, default=config.server_workers,
+                              help="Διεργασιες για την αναλυση θεσεων (0: στο ιδιο το event loop)")
+
+    load_parser = commands.add_parser("load", help="Γεννητρια φορτου (ο server πρεπει να τρεχει)")
+    load_parser.add_argument("--host", default=config.server_host)
+    load_parser.add_argument("--port", type=int, default=config.server_port)
+    load_parser.add_argument("--games", type=int, default=1000, help="Ταυτοχρονες παρτιδες")
+    load_parser.add_argument("--connections", type=int, default=100)
+    load_parser.add_argument("--max-plies", type=int, default=60, help="Μετα απο τοσες μισες κινησεις η παρτιδα ληγει με παραιτηση")
+    load_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.workers))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    result = asyncio.run(run_load(args.host, args.port, args.games, min(args.connections, args.games),
+                                  args.max_plies, args.seed))
+    print(f"{result['games']} παρτιδες, {result['moves']} κινησεις σε {result['elapsed']:.2f}s "
+          f"({result['errors']} λαθη)")
+    print(f"{result['moves_per_second']:.0f} κινησεις/s, καθυστερηση p50 {1000 * result['p50']:.1f} ms, "
+          f"p99 {1000 * result['p99']:.1f} ms, max {1000 * result['max']:.1f} ms")
+    print(f"Cache θεσεων στον server: {result['cache_hits']} hits, {result['cache_misses']} misses")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import os
+import tkinter as tk
+from collections import OrderedDict
+from pathlib import Path
+
+import config
+
+# --------------------------------------------------------------------- #
+#  Εικονες πιονιων σε ετοιμο μεγεθος.
+#  Καθε εικονα κλιμακωνεται μια φορα και αποθηκευεται στο cache ως
+#  "<κωδικος>-<μεγεθος>-<mtime>.png". Οι επομενες εκκινησεις τη διαβαζουν
+#  κατευθειαν με το tk.PhotoImage, χωρις PIL. Αν αλλαξει η αρχικη εικονα
+#  (νεο mtime) το ονομα δεν ταιριαζει πια και η εικονα ξαναδημιουργειται
+# --------------------------------------------------------------------- #
+class SpriteCache:
+    def __init__(self, source_directory=None, cache_directory=None, memory_size=None):
+        self.source_directory = Path(source_directory or config.asset_directory)
+        self.cache_directory = Path(cache_directory or config.sprite_cache_directory)
+        # Πρεπει να χωραει τουλαχιστον ενα πληρες σετ (12 εικονες): μια εικονα που βγαινει απο
+        # τη μνημη ενω φαινεται ακομη στον καμβα σβηνεται και απο εκει
+        self.memory_size = max(memory_size or config.sprite_memory_size, len(config.piece_codes))
+        self.photos = OrderedDict() # (κωδικος, μεγεθος) -> tk.PhotoImage, η πιο προσφατη στο τελος
+
+    def path(self, code: str, size: int) -> Path:
+        mtime = (self.source_directory / f"{code}.png").stat().st_mtime_ns
+        return self.cache_directory / f"{code}-{size}-{mtime}.png"
+
+    # Το αρχειο της εικονας στο μεγεθος size (κλιμακωνεται με PIL μονο αν λειπει)
+    def file(self, code: str, size: int) -> Path:
+        path = self.path(code, size)
+        if path.exists():
+            return path
+        from PIL import Image
+
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        # Παλιες εκδοσεις της ιδιας εικονας (απο αρχικη εικονα που αλλαξε)
+        for old in self.cache_directory.glob(f"{code}-{size}-*.png"):
+            old.unlink()
+        image = Image.open(self.source_directory / f"{code}.png").resize((size, size), Image.LANCZOS)
+        # Γραφεται πρωτα σε προσωρινο αρχειο, ωστε μια διακοπη να μην αφησει μισο αρχειο στο cache
+        temporary = path.with_suffix(".tmp")
+        image.save(temporary, "PNG")
+        os.replace(temporary, path)
+        return path
+
+    # Εικονα για τον καμβα: απο τη μνημη (LRU) ή απο το αρχειο του cache την πρωτη φορα
+    def photo(self, code: str, size: int) -> tk.PhotoImage:
+        key = (code, size)
+        photo = self.photos.get(key)
+        if photo is not None:
+            self.photos.move_to_end(key)
+            return photo
+        photo = self.photos[key] = tk.PhotoImage(file=str(self.file(code, size)))
+        if len(self.photos) > self.memory_size:
+            self.photos.popitem(last=False)
+        return photo
@@ -0,0 +1,510 @@
+import argparse
+import multiprocessing as mp
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+import config
+from board import Board, Color, PieceType, KNIGHT_DELTAS, KING_DELTAS, DIAGONAL_DIRECTIONS, STRAIGHT_DIRECTIONS
+from bitboard import BitBoard
+
+# Κλαση σκακιερας για το probe απο τη γραμμη εντολων
+BOARD = BitBoard if config.board_backend == "bitboard" else Board
+
+# --------------------------------------------------------------------- #
+#  Tablebases: για καθε συνδυασμο υλικου (π.χ. "KQvK") το ακριβες
+#  αποτελεσμα καθε θεσης με αναδρομικη αναλυση (retrograde analysis),
+#  με τους κανονες της Board (χωρις ροκε, en passant και προαγωγη: ενα
+#  πιονι που φτανει στην τελευταια γραμμη απλως δεν κινειται αλλο).
+#
+#  Δεικτης θεσης: stm * 64^n + s0 * 64^(n-1) + ... + s(n-1), οπου stm = 0 αν
+#  παιζουν τα λευκα και si το τετραγωνο (γραμμη*8 + στηλη) του κομματιου i
+#  με τη σειρα της ονομασιας (πρωτα τα λευκα). Καθε θεση εχει μοναδικο
+#  δεικτη, οποτε το probe ειναι μια αναγνωση πινακα.
+#
+#  Τιμες στο αρχειο (.npy, int8 ή int16), απο την πλευρα του παικτη που παιζει:
+#  0 = ισοπαλια, n > 0 = νικη με ματ σε n μισες κινησεις,
+#  -(n + 1) = ηττα με ματ σε n μισες κινησεις (-1: ειναι ηδη ματ), ILLEGAL = αδυνατη θεση
+# --------------------------------------------------------------------- #
+LETTERS = {"K": PieceType.KING, "Q": PieceType.QUEEN, "R": PieceType.ROOK,
+           "B": PieceType.BISHOP, "N": PieceType.KNIGHT, "P": PieceType.PAWN}
+ORDER = "KQRBNP"
+VALUES = {"K": 0, "Q": 9, "R": 5, "B": 3, "N": 3, "P": 1}
+
+# Καταστασεις κατα την επιλυση
+UNKNOWN, WIN, LOSS, DRAW, ILLEGAL = range(5)
+
+# Κανονικη ονομασια: ο "δυνατος" παικτης ειναι παντα τα λευκα.
+# Επιστρεφει (ονομα, αν χρειαζεται αντιστροφη χρωματων)
+def canonical(white: str, black: str) -> tuple[str, bool]:
+    white = "".join(sorted(white, key=ORDER.index))
+    black = "".join(sorted(black, key=ORDER.index))
+    strength = lambda side: (sum(VALUES[ch] for ch in side), len(side), [-ORDER.index(ch) for ch in side])
+    flip = strength(black) > strength(white)
+    return (f"{black}v{white}", True) if flip else (f"{white}v{black}", False)
+
+
+class Material:
+    def __init__(self, name: str):
+        white, black = name.split("v")
+        if white.count("K") != 1 or black.count("K") != 1 or any(ch not in LETTERS for ch in white + black):
+            raise ValueError(f"Μη εγκυρος συνδυασμος υλικου: {name!r}")
+        self.name = name
+        self.pieces = [(Color.WHITE, LETTERS[ch]) for ch in white] + [(Color.BLACK, LETTERS[ch]) for ch in black]
+        self.letters = list(white) + list(black)
+        self.n = len(self.pieces)
+        self.size = 2 * 64 ** self.n
+        self.kings = {color: i for i, (color, kind) in enumerate(self.pieces) if kind is PieceType.KING}
+
+    # Υλικο μετα το φαγωμα του κομματιου j: (κανονικο ονομα, αντιστροφη χρωματων)
+    def without(self, j: int) -> tuple[str, bool]:
+        white = "".join(ch for i, ch in enumerate(self.letters) if i != j and self.pieces[i][0] is Color.WHITE)
+        black = "".join(ch for i, ch in enumerate(self.letters) if i != j and self.pieces[i][0] is Color.BLACK)
+        return canonical(white, black)
+
+    def children(self) -> list[str]:
+        return sorted({self.without(j)[0] for j, (_, kind) in enumerate(self.pieces) if kind is not PieceType.KING})
+
+
+def encode(stm, squares) -> np.ndarray:
+    index = np.asarray(stm, dtype=np.int64)
+    for s in squares:
+        index = index * 64 + s
+    return index
+
+def decode(index: np.ndarray, n: int) -> tuple[np.ndarray, list[np.ndarray]]:
+    squares = []
+    for _ in range(n):
+        squares.append(index % 64)
+        index = index // 64
+    return index, squares[::-1]
+
+# Κωδικες αρχειου <-> (αποτελεσμα, μισες κινησεις)
+def _codes(state: np.ndarray, dtm: np.ndarray, dtype) -> np.ndarray:
+    codes = np.zeros(len(state), dtype=dtype)
+    codes[state == WIN] = dtm[state == WIN]
+    codes[state == LOSS] = -dtm[state == LOSS].astype(dtype) - 1
+    codes[state == ILLEGAL] = np.iinfo(dtype).min
+    return codes
+
+
+# --------------------------------------------------------------------- #
+#  Προυπολογισμενοι πινακες (το τετραγωνο 64 σημαινει "κανενα")
+# --------------------------------------------------------------------- #
+def _step_table(deltas) -> np.ndarray:
+    table = np.full((65, len(deltas)), 64, dtype=np.int64)
+    for s in range(64):
+        r, c = divmod(s, 8)
+        for i, (delta_row, delta_col) in enumerate(deltas):
+            if 0 <= r + delta_row <= 7 and 0 <= c + delta_col <= 7:
+                table[s, i] = (r + delta_row) * 8 + c + delta_col
+    return table
+
+def _slide_deltas(directions) -> list[tuple[int, int]]:
+    return [(dr * k, dc * k) for dr, dc in directions for k in range(1, 8)]
+
+# Τετραγωνα-στοχοι ανα ειδος κομματιου (για τα κομματια που γλιστρανε: ολες οι ακτινες, τα εμποδια ελεγχονται με το BETWEEN)
+STEPS = {
+    PieceType.KNIGHT: _step_table(KNIGHT_DELTAS),
+    PieceType.KING: _step_table(KING_DELTAS),
+    PieceType.BISHOP: _step_table(_slide_deltas(DIAGONAL_DIRECTIONS)),
+    PieceType.ROOK: _step_table(_slide_deltas(STRAIGHT_DIRECTIONS)),
+    PieceType.QUEEN: _step_table(_slide_deltas(DIAGONAL_DIRECTIONS + STRAIGHT_DIRECTIONS)),
+}
+SLIDERS = (PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN)
+
+# Απειλες (χωρις εμποδια): ATTACKS[ειδος][απο, προς]
+ATTACKS = {}
+for _kind, _table in STEPS.items():
+    ATTACKS[_kind] = np.zeros((65, 65), dtype=bool)
+    for _s in range(64):
+        ATTACKS[_kind][_s, _table[_s][_table[_s] < 64]] = True
+
+# Τα πιονια: λευκα προς τη γραμμη 0, μαυρα προς τη γραμμη 7
+PAWN_DIRECTION = {Color.WHITE: -1, Color.BLACK: 1}
+PAWN_PUSH = {color: _step_table([(d, 0)])[:, 0] for color, d in PAWN_DIRECTION.items()}
+PAWN_BACK = {color: _step_table([(-d, 0)])[:, 0] for color, d in PAWN_DIRECTION.items()}
+PAWN_CAPTURES = {color: _step_table([(d, -1), (d, 1)]) for color, d in PAWN_DIRECTION.items()}
+PAWN_ATTACKS = {}
+for _color, _table in PAWN_CAPTURES.items():
+    PAWN_ATTACKS[_color] = np.zeros((65, 65), dtype=bool)
+    for _s in range(64):
+        PAWN_ATTACKS[_color][_s, _table[_s][_table[_s] < 64]] = True
+
+# BETWEEN[a, b, c]: το c βρισκεται αναμεσα στα a και b (στην ιδια γραμμη, στηλη ή διαγωνιο)
+BETWEEN = np.zeros((65, 65, 65), dtype=bool)
+for _s in range(64):
+    for _dr, _dc in DIAGONAL_DIRECTIONS + STRAIGHT_DIRECTIONS:
+        _r, _c = divmod(_s, 8)
+        _path = []
+        _r, _c = _r + _dr, _c + _dc
+        while 0 <= _r <= 7 and 0 <= _c <= 7:
+            BETWEEN[_s, _r * 8 + _c, _path] = True
+            _path.append(_r * 8 + _c)
+            _r, _c = _r + _dr, _c + _dc
+
+
+# --------------------------------------------------------------------- #
+#  Διανυσματικοι κανονες (καθε πινακας εχει μια θεση ανα στοιχειο)
+# --------------------------------------------------------------------- #
+def _attacks(kind: PieceType, color: Color, origin, target, squares) -> np.ndarray:
+    if kind is PieceType.PAWN:
+        return PAWN_ATTACKS[color][origin, target]
+    hit = ATTACKS[kind][origin, target]
+    if kind in SLIDERS:
+        for s in squares:
+            hit = hit & ~BETWEEN[origin, target, s]
+    return hit
+
+# Ο βασιλιας του color απειλειται; alive[j] = False για κομματι που μολις φαγωθηκε
+def _in_check(material: Material, squares, color: Color, alive=None) -> np.ndarray:
+    king = squares[material.kings[color]]
+    check = np.zeros(len(king), dtype=bool)
+    for j, (piece_color, kind) in enumerate(material.pieces):
+        if piece_color is color:
+            continue
+        hit = _attacks(kind, piece_color, squares[j], king, squares)
+        if alive is not None:
+            hit &= alive[j]
+        check |= hit
+    return check
+
+# Προορισμοι του κομματιου (ειδος, χρωμα) απο τα τετραγωνα origin: (πινακας στοχων, "any" / "push" / "capture")
+def _targets(kind: PieceType, color: Color, origin):
+    if kind is PieceType.PAWN:
+        yield PAWN_PUSH[color][origin], "push"
+        for i in range(2):
+            yield PAWN_CAPTURES[color][origin, i], "capture"
+        return
+    table = STEPS[kind]
+    for i in range(table.shape[1]):
+        yield table[origin, i], "any"
+
+# Τετραγωνα απο οπου μπορει να ηρθε το κομματι χωρις φαγωμα (αναποδη κινηση)
+def _sources(kind: PieceType, color: Color, target):
+    if kind is PieceType.PAWN:
+        yield PAWN_BACK[color][target]
+        return
+    table = STEPS[kind]
+    for i in range(table.shape[1]):
+        yield table[target, i]
+
+
+# --------------------------------------------------------------------- #
+#  Αρχικη σαρωση (τρεχει σε κομματια, σε πολλες διεργασιες): νομιμες
+#  θεσεις, πληθος νομιμων κινησεων, ματ / πατ, και φαγωματα που οδηγουν
+#  σε ηδη λυμενους μικροτερους πινακες
+# --------------------------------------------------------------------- #
+def _initial_chunk(name: str, start: int, count: int, directory: str):
+    material = Material(name)
+    n = material.n
+    _, squares = decode(np.arange(start, start + count, dtype=np.int64), n)
+    stm = Color.BLACK if start >= 64 ** n else Color.WHITE
+    opponent = stm.opposite
+
+    valid = np.ones(count, dtype=bool)
+    for i in range(n):
+        for j in range(i + 1, n):
+            valid &= squares[i] != squares[j]
+    valid &= ~_in_check(material, squares, opponent)
+
+    legal_total = np.zeros(count, dtype=np.int32)
+    moves = np.zeros(count, dtype=np.int32) # Κινησεις που δεν ειναι ακομη γνωστο οτι χανουν
+    win_dtm = np.full(count, 255, dtype=np.int32) # Συντομοτερη νικη μεσω φαγωματος
+    max_dtm = np.zeros(count, dtype=np.int32) # Μεγιστη αποσταση ματ των φαγωματων που χανουν
+
+    children = {}
+    for i, (color, kind) in enumerate(material.pieces):
+        if color is not stm:
+            continue
+        for target, mode in _targets(kind, color, squares[i]):
+            ok = valid & (target != 64)
+            for j, (piece_color, _) in enumerate(material.pieces):
+                if j != i and piece_color is color:
+                    ok &= target != squares[j]
+            if kind in SLIDERS:
+                for s in squares:
+                    ok &= ~BETWEEN[squares[i], target, s]
+
+            captured = np.full(count, -1, dtype=np.int64)
+            for j, (piece_color, _) in enumerate(material.pieces):
+                if piece_color is opponent:
+                    captured[target == squares[j]] = j
+            if mode == "push":
+                ok &= captured < 0
+            elif mode == "capture":
+                ok &= captured >= 0
+
+            new = list(squares)
+            new[i] = target
+            alive = [captured != j for j in range(n)]
+            legal = ok & ~_in_check(material, new, stm, alive)
+            legal_total += legal
+            moves += legal
+
+            # Φαγωματα: το αποτελεσμα ερχεται απο τον πινακα του υλικου που μενει
+            for j in np.unique(captured[legal]):
+                if j < 0:
+                    continue
+                if j not in children:
+                    child_name, flip = material.without(j)
+                    children[j] = (Material(child_name), flip,
+                                   np.load(Path(directory) / f"{child_name}.npy", mmap_mode="r"))
+                child, flip, table = children[j]
+                rows = np.nonzero(legal & (captured == j))[0]
+                rest = [new[k][rows] for k in range(n) if k != j]
+                if flip:
+                    # Τα κομματια των μαυρων γινονται λευκα (και αντιστροφα) με καθρεφτισμα των γραμμων
+                    colors = [material.pieces[k][0] for k in range(n) if k != j]
+                    rest = [s ^ 56 for k, s in sorted(enumerate(rest), key=lambda e: colors[e[0]] is Color.WHITE)]
+                child_stm = (opponent is Color.BLACK) ^ flip
+                codes = table[encode(np.full(len(rows), child_stm), rest)].astype(np.int32)
+
+                # Ο αντιπαλος χανει σε n (κωδικος -(n + 1)): νικη σε n + 1. Ο αντιπαλος κερδιζει: η κινηση χανει
+                losing = (codes < 0) & (codes != np.iinfo(table.dtype).min)
+                win_dtm[rows[losing]] = np.minimum(win_dtm[rows[losing]], -codes[losing])
+                winning = codes > 0
+                np.subtract.at(moves, rows[winning], 1)
+                np.maximum.at(max_dtm, rows[winning], codes[winning])
+
+    state = np.full(count, UNKNOWN, dtype=np.int8)
+    dtm = np.zeros(count, dtype=np.int32)
+    state[~valid] = ILLEGAL
+
+    # Ματ ή πατ
+    no_moves = valid & (legal_total == 0)
+    mated = no_moves & _in_check(material, squares, stm)
+    state[mated] = LOSS
+    state[no_moves & ~mated] = DRAW
+
+    # Ολα τα φαγωματα χανουν και δεν υπαρχουν αλλες κινησεις
+    lost = valid & (legal_total > 0) & (moves == 0)
+    state[lost] = LOSS
+    dtm[lost] = max_dtm[lost] + 1
+
+    # Φαγωμα που κερδιζει (η αποσταση μπορει να μικρυνει αργοτερα απο ησυχη κινηση)
+    won = (state == UNKNOWN) & (win_dtm < 255)
+    state[won] = WIN
+    dtm[won] = win_dtm[won]
+    return start, state, dtm, moves, max_dtm
+
+
+# --------------------------------------------------------------------- #
+#  Αναδρομικη αναλυση: απο τις θεσεις με γνωστο αποτελεσμα (κατα αυξουσα
+#  αποσταση ματ) βρισκουμε τις προηγουμενες θεσεις με αναποδες κινησεις
+# --------------------------------------------------------------------- #
+def _predecessors(material: Material, frontier: np.ndarray) -> np.ndarray:
+    stm_value, squares = decode(frontier, material.n)
+    found = []
+    for stm_bit in (0, 1):
+        rows = stm_value == stm_bit
+        if not rows.any():
+            continue
+        group = [s[rows] for s in squares]
+        # Επαιξε ο αντιπαλος αυτου που παιζει τωρα
+        mover = Color.WHITE if stm_bit == 1 else Color.BLACK
+        for i, (color, kind) in enumerate(material.pieces):
+            if color is not mover:
+                continue
+            for source in _sources(kind, color, group[i]):
+                ok = source != 64
+                for s in group:
+                    ok &= source != s
+                if kind in SLIDERS:
+                    for j, s in enumerate(group):
+                        if j != i:
+                            ok &= ~BETWEEN[source, group[i], s]
+                previous = list(group)
+                previous[i] = source
+                found.append(encode(np.full(int(ok.sum()), 1 - stm_bit), [s[ok] for s in previous]))
+    return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+
+def generate(name: str, directory: Optional[str] = None, workers: Optional[int] = None,
+             verbose: bool = False) -> Path:
+    directory = Path(directory or config.tablebase_directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    workers = workers or config.search_workers
+    material = Material(name)
+    if canonical(*name.split("v"))[0] != name:
+        raise ValueError(f"Χρησιμοποιηστε το κανονικο ονομα {canonical(*name.split('v'))[0]!r}")
+
+    # Πρωτα οι πινακες που προκυπτουν μετα απο φαγωμα
+    for child in material.children():
+        if not (directory / f"{child}.npy").exists():
+            generate(child, directory, workers, verbose)
+
+    start_time = time.perf_counter()
+    size = material.size
+    state = np.empty(size, dtype=np.int8)
+    dtm = np.empty(size, dtype=np.int16)
+    moves = np.empty(size, dtype=np.uint8)
+    max_dtm = np.empty(size, dtype=np.int16)
+
+    chunk = min(64 ** material.n, 1 << 18)
+    starts = range(0, size, chunk)
+    with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn")) as pool:
+        futures = [pool.submit(_initial_chunk, name, start, chunk, str(directory)) for start in starts]
+        for future in futures:
+            start, *arrays = future.result()
+            for target, values in zip((state, dtm, moves, max_dtm), arrays):
+                target[start:start + chunk] = values
+
+    buckets = defaultdict(list)
+    for kind in (WIN, LOSS):
+        positions = np.nonzero(state == kind)[0]
+        for d in np.unique(dtm[positions]):
+            buckets[int(d)].append(positions[dtm[positions] == d])
+
+    d = 0
+    while buckets:
+        if d not in buckets:
+            d += 1
+            continue
+        frontier = np.unique(np.concatenate(buckets.pop(d)))
+        frontier = frontier[dtm[frontier] == d]
+
+        # Θεσεις που χανουν σε d: οι προηγουμενες κερδιζουν σε d + 1
+        losses = frontier[state[frontier] == LOSS]
+        previous = _predecessors(material, losses)
+        previous = previous[(state[previous] == UNKNOWN) | ((state[previous] == WIN) & (dtm[previous] > d + 1))]
+        if len(previous):
+            previous = np.unique(previous)
+            state[previous] = WIN
+            dtm[previous] = d + 1
+            buckets[d + 1].append(previous)
+
+        # Θεσεις που κερδιζουν σε d: μια κινηση λιγοτερη για τις προηγουμενες. Αν δεν μεινει καμια, χανουν
+        wins = frontier[state[frontier] == WIN]
+        previous = _predecessors(material, wins)
+        previous = previous[state[previous] == UNKNOWN]
+        if len(previous):
+            previous, counts = np.unique(previous, return_counts=True)
+            moves[previous] -= counts.astype(moves.dtype)
+            lost = previous[moves[previous] == 0]
+            state[lost] = LOSS
+            dtm[lost] = np.maximum(max_dtm[lost], d) + 1
+            for loss_dtm in np.unique(dtm[lost]):
+                buckets[int(loss_dtm)].append(lost[dtm[lost] == loss_dtm])
+        d += 1
+
+    state[state == UNKNOWN] = DRAW
+    longest = int(dtm[(state == WIN) | (state == LOSS)].max(initial=0))
+    path = directory / f"{name}.npy"
+    np.save(path, _codes(state, dtm, np.int8 if longest < 127 else np.int16))
+
+    if verbose:
+        legal = state != ILLEGAL
+        print(f"{name}: {int(legal.sum())} θεσεις, {int((state == WIN).sum())} νικες, "
+              f"{int((state == LOSS).sum())} ηττες, {int((state == DRAW).sum())} ισοπαλιες, "
+              f"μεγιστο ματ σε {longest} μισες κινησεις ({time.perf_counter() - start_time:.1f}s)")
+    return path
+
+
+# --------------------------------------------------------------------- #
+#  Probe: ακριβες αποτελεσμα μιας θεσης σε O(1)
+# --------------------------------------------------------------------- #
+class ProbeResult(NamedTuple):
+    wdl: int # 1 νικη, 0 ισοπαλια, -1 ηττα (για τον παικτη που παιζει)
+    plies: int # Μισες κινησεις ως το ματ (0 για ισοπαλια)
+
+class Tablebases:
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or config.tablebase_directory)
+        self.names = {path.stem for path in self.directory.glob("*v*.npy")}
+        self.max_pieces = max((len(name) - 1 for name in self.names), default=0)
+        self.tables = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def _table(self, name: str):
+        table = self.tables.get(name)
+        if table is None:
+            table = self.tables[name] = (Material(name), np.load(self.directory / f"{name}.npy", mmap_mode="r"))
+        return table
+
+    def probe(self, board: Board) -> Optional[ProbeResult]:
+        pieces = [piece for row in board.sq for piece in row if piece]
+        if len(pieces) > self.max_pieces:
+            return None
+        white = "".join(piece.kind.value for piece in pieces if piece.color is Color.WHITE)
+        black = "".join(piece.kind.value for piece in pieces if piece.color is Color.BLACK)
+        if "K" not in white or "K" not in black:
+            return None
+        name, flip = canonical(white, black)
+        if name not in self.names:
+            return None
+        material, table = self._table(name)
+
+        # Καθε κομματι πηγαινει στη θεση του στη σειρα του υλικου (με αντιστροφη χρωματων αν χρειαζεται)
+        squares = [None] * material.n
+        for piece in pieces:
+            color = piece.color.opposite if flip else piece.color
+            square = piece.row * 8 + piece.col
+            for i, slot in enumerate(material.pieces):
+                if squares[i] is None and slot == (color, piece.kind):
+                    squares[i] = square ^ 56 if flip else square
+                    break
+        stm = (board.turn is Color.BLACK) ^ flip
+        index = stm
+        for s in squares:
+            index = index * 64 + s
+        code = int(table[index])
+
+        if code == np.iinfo(table.dtype).min:
+            return None
+        if code > 0:
+            return ProbeResult(1, code)
+        if code < 0:
+            return ProbeResult(-1, -code - 1)
+        return ProbeResult(0, 0)
+
+# Ανοιγει τα tablebases του config, αν υπαρχουν
+def open_tablebases(directory=None) -> Optional[Tablebases]:
+    directory = Path(directory or config.tablebase_directory)
+    if not directory.is_dir():
+        return None
+    tablebases = Tablebases(directory)
+    return tablebases if tablebases.names else None
+
+
+# --------------------------------------------------------------------- #
+#  python tablebase.py generate KQvK KRvK KBNvK KPvK
+#  python tablebase.py probe --fen "8/8/8/8/8/2k5/8/KQ6 w - - 0 1"
+# --------------------------------------------------------------------- #
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tablebases για λιγα κομματια")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("generate", help="Δημιουργια πινακων")
+    p.add_argument("materials", nargs="+", help="π.χ. KQvK KRvK KBNvK KPvK")
+    p.add_argument("--directory", default=config.tablebase_directory)
+    p.add_argument("--workers", type=int, default=config.search_workers)
+
+    p = sub.add_parser("probe", help="Αποτελεσμα μιας θεσης")
+    p.add_argument("--fen", required=True)
+    p.add_argument("--directory", default=config.tablebase_directory)
+
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        for name in args.materials:
+            generate(name, args.directory, args.workers, verbose=True)
+        return 0
+
+    result = Tablebases(args.directory).probe(BOARD.from_fen(args.fen))
+    if result is None:
+        print("Η θεση δεν υπαρχει στα tablebases")
+        return 1
+    print({1: f"Νικη, ματ σε {result.plies} μισες κινησεις", 0: "Ισοπαλια",
+           -1: f"Ηττα, ματ σε {result.plies} μισες κινησεις"}[result.wdl])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
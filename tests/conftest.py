@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Τα modules του project ειναι στη ριζα (χωρις πακετο), οποτε τα tests τα βρισκουν απο εκει
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
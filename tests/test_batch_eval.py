@@ -0,0 +1,29 @@
+import pytest
+
+from board import Board
+from bitboard import BitBoard
+from evaluation import evaluate
+from batch_eval import encode_boards, evaluate_codes, evaluate_batch
+from chess_bench.positions import REFERENCE_POSITIONS, random_positions
+
+
+# --------------------------------------------------------------------- #
+#  Η batch_eval πρεπει να δινει ακριβως τις ιδιες τιμες με την evaluate
+# --------------------------------------------------------------------- #
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_random_positions_match_evaluate(board_class):
+    boards = random_positions(board_class, 500, seed=10)
+    codes, black_to_move = encode_boards(boards)
+    assert evaluate_codes(codes, black_to_move).tolist() == [evaluate(board) for board in boards]
+
+def test_reference_positions_match_evaluate():
+    boards = [Board.from_fen(fen) for _, fen, _ in REFERENCE_POSITIONS]
+    assert evaluate_batch(boards).tolist() == [evaluate(board) for board in boards]
+
+# Περισσοτερες θεσεις απο ενα chunk: τα ορια των chunks δεν πρεπει να αλλαζουν τιμες
+def test_several_chunks(monkeypatch):
+    import batch_eval
+
+    monkeypatch.setattr(batch_eval, "CHUNK_SIZE", 64)
+    boards = random_positions(Board, 200, seed=11)
+    assert evaluate_batch(boards).tolist() == [evaluate(board) for board in boards]
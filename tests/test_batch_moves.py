@@ -0,0 +1,36 @@
+import pytest
+
+from board import Board
+from bitboard import BitBoard
+from batch_moves import legal_masks_batch, moves_from_masks
+from chess_bench.positions import REFERENCE_POSITIONS, random_positions
+
+
+# --------------------------------------------------------------------- #
+#  Η batch_moves πρεπει να δινει ακριβως τις κινησεις της
+#  generate_legal_moves (μασκες και πληθος ανα θεση)
+# --------------------------------------------------------------------- #
+def _check(boards):
+    masks, counts = legal_masks_batch(boards)
+    for board, row, count in zip(boards, masks, counts.tolist()):
+        expected = sorted(board.generate_legal_moves(board.turn))
+        assert sorted(moves_from_masks(row)) == expected, board.fen()
+        assert count == len(expected), board.fen()
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_random_positions_match_generate_legal_moves(board_class):
+    boards = random_positions(board_class, 500, seed=20)
+    # Το δειγμα πρεπει να εχει και θεσεις με σαχ (αποκλεισμοι, καρφωματα)
+    assert any(board.king_in_check(board.turn) for board in boards)
+    _check(boards)
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_reference_positions_match_generate_legal_moves(board_class):
+    _check([board_class.from_fen(fen) for _, fen, _ in REFERENCE_POSITIONS])
+
+# Περισσοτερες θεσεις απο ενα chunk: τα ορια των chunks δεν πρεπει να αλλαζουν κινησεις
+def test_several_chunks(monkeypatch):
+    import batch_moves
+
+    monkeypatch.setattr(batch_moves, "CHUNK_SIZE", 64)
+    _check(random_positions(Board, 200, seed=21))
@@ -0,0 +1,42 @@
+import pytest
+
+from board import Board
+from bitboard import BitBoard
+from chess_bench.perft import perft
+from chess_bench.positions import REFERENCE_POSITIONS
+
+# Βαθη με λιγους κομβους, ωστε ο ελεγχος να τρεχει σε δευτερολεπτα (τα υπολοιπα: python -m chess_bench verify)
+MAX_NODES = 10000
+
+CASES = [(name, fen, depth, nodes) for name, fen, expected in REFERENCE_POSITIONS
+         for depth, nodes in sorted(expected.items()) if depth <= 2 or nodes <= MAX_NODES]
+
+
+# --------------------------------------------------------------------- #
+#  Perft στις θεσεις αναφορας, για καθε αναπαρασταση
+# --------------------------------------------------------------------- #
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("name, fen, depth, nodes", CASES, ids=[f"{case[0]}-{case[2]}" for case in CASES])
+def test_perft(board_class, name, fen, depth, nodes):
+    assert perft(board_class.from_fen(fen), depth) == nodes
+
+
+# --------------------------------------------------------------------- #
+#  push/pop: η pop επαναφερει FEN και κλειδι, και το κλειδι Zobrist που
+#  ενημερωνεται σταδιακα ειναι ιδιο με αυτο της θεσης απο την αρχη
+# --------------------------------------------------------------------- #
+def _round_trip(board, depth):
+    fen, key = board.fen(), board.key
+    for move in board.generate_legal_moves(board.turn):
+        board.push(move)
+        assert board.key == type(board).from_fen(board.fen()).key, board.fen()
+        if depth > 1:
+            _round_trip(board, depth - 1)
+        board.pop()
+        assert (board.fen(), board.key) == (fen, key)
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("fen", [fen for _, fen, _ in REFERENCE_POSITIONS],
+                         ids=[name for name, _, _ in REFERENCE_POSITIONS])
+def test_push_pop_round_trip(board_class, fen):
+    _round_trip(board_class.from_fen(fen), 2)
@@ -0,0 +1,55 @@
+import asyncio
+import json
+from concurrent.futures import BrokenExecutor
+
+from board import move_from_uci
+from server import Connection, GameServer
+
+
+# --------------------------------------------------------------------- #
+#  Μια αναλυση που αποτυγχανει δεν πρεπει να αλλαζει την παρτιδα και
+#  απανταται στον client με "error"
+# --------------------------------------------------------------------- #
+class FakeWriter:
+    def __init__(self):
+        self.messages = []
+
+    def write(self, data: bytes):
+        self.messages.extend(json.loads(line) for line in data.splitlines())
+
+
+class BrokenPool:
+    def submit(self, *args, **kwargs):
+        raise BrokenExecutor("η διεργασια τερματιστηκε")
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+
+def _send(game_server, connection, message):
+    asyncio.run(game_server.dispatch(connection, json.dumps(message).encode()))
+
+def test_failed_analysis_keeps_the_game():
+    game_server = GameServer(workers=0)
+    writer = FakeWriter()
+    connection = Connection(writer)
+    _send(game_server, connection, {"op": "new"})
+    game_id = writer.messages[-1]["game"]
+    _send(game_server, connection, {"op": "join", "game": game_id})
+    game = game_server.games[game_id]
+    fen, key, position = game.board.fen(), game.board.key, game.position
+
+    # Η δεξαμενη χαλαει: η κινηση απορριπτεται και μια νεα δεξαμενη παιρνει τη θεση της
+    game_server.workers, game_server.pool = 1, BrokenPool()
+    game_server._new_pool = lambda: None
+    _send(game_server, connection, {"op": "move", "game": game_id, "move": "g2g3"})
+    assert writer.messages[-1]["op"] == "error"
+    assert writer.messages[-1]["game"] == game_id
+    assert (game.board.fen(), game.board.key, game.position) == (fen, key, position)
+    assert game_server.pool is None
+
+    # Η ιδια κινηση περναει μετα
+    _send(game_server, connection, {"op": "move", "game": game_id, "move": "g2g3"})
+    assert writer.messages[-1]["op"] == "state"
+    assert game.board.history[-1].move == move_from_uci("g2g3")
+    assert move_from_uci("g7g6") in game.position.moves
@@ -0,0 +1,36 @@
+import time
+
+from board import Board
+from worker import EngineWorker
+
+
+# --------------------------------------------------------------------- #
+#  Το stop πρεπει παντα να φερνει ενα "done", ακομη κι αν η διεργασια
+#  δεν εχει ξεκινησει ακομη την αναζητηση
+# --------------------------------------------------------------------- #
+def _wait_done(worker, search_id, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for kind, message_id, result in worker.poll():
+            if kind == "done" and message_id == search_id:
+                return result
+        time.sleep(0.01)
+    raise AssertionError(f"Δεν ηρθε done για την αναζητηση {search_id}")
+
+def test_stop_before_search_starts():
+    worker = EngineWorker(table_mb=1)
+    try:
+        board = Board()
+        # Η διεργασια μολις ξεκινησε (φορτωνει ακομη), αρα το αιτημα ακυρωνεται πριν το παραλαβει
+        search_id = worker.start(board, max_depth=20, time_limit=30)
+        worker.stop()
+        result = _wait_done(worker, search_id)
+        assert result.best_move in board.generate_legal_moves(board.turn)
+
+        # Και μια αναζητηση που τρεχει ηδη
+        search_id = worker.start(board, max_depth=64, time_limit=30)
+        time.sleep(0.5)
+        worker.stop()
+        assert _wait_done(worker, search_id).best_move in board.generate_legal_moves(board.turn)
+    finally:
+        worker.close()
@@ -0,0 +1,405 @@
+import argparse
+import importlib
+import math
+import multiprocessing as mp
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, fields, replace
+from typing import Iterator, NamedTuple, Optional
+
+import config
+from board import Board, Color, STARTING_FEN
+from bitboard import BitBoard
+from engine import Engine
+from pgn import game_to_pgn, iter_game_texts, parse_game, move_from_san
+from tablebase import open_tablebases
+from transposition import TranspositionTable
+
+# Κλαση σκακιερας για τις παρτιδες
+BOARD = BitBoard if config.board_backend == "bitboard" else Board
+
+# --------------------------------------------------------------------- #
+#  Τουρνουα χωρις GUI: δυο ρυθμισεις της μηχανης παιζουν πολλες
+#  παρτιδες (καθε παρτιδα σε μια διεργασια), με ανοιγματα απο αρχειο,
+#  οριο χρονου/κομβων ανα κινηση και κανονες για τη ληξη παρτιδων.
+#  Τα αποτελεσματα γραφονται σε PGN μολις τελειωσει καθε παρτιδα και
+#  στο τελος δινεται η διαφορα Elo (με περιθωριο σφαλματος) και το SPRT
+# --------------------------------------------------------------------- #
+@dataclass(frozen=True)
+class EngineConfig:
+    name: str
+    depth: int = config.engine_depth # Μεγιστο βαθος
+    time: Optional[float] = None # Δευτερολεπτα ανα κινηση
+    nodes: Optional[int] = None # Κομβοι ανα κινηση
+    hash: float = 16 # Πινακας μεταθεσεων (MB)
+    eval: Optional[str] = None # Συναρτηση αξιολογησης ως "module:function" (π.χ. "my_eval:evaluate")
+    tablebases: bool = False # Χρηση των tablebases στην αναζητηση
+
+    # Απο κειμενο "name=new depth=5 nodes=20000 eval=my_eval:evaluate"
+    @classmethod
+    def parse(cls, items: list[str]) -> "EngineConfig":
+        names = {field.name for field in fields(cls)}
+        values = {}
+        for item in items:
+            key, _, value = item.partition("=")
+            if key not in names:
+                raise ValueError(f"Αγνωστη ρυθμιση μηχανης: {key!r}")
+            if key in ("depth", "nodes"):
+                values[key] = int(value)
+            elif key in ("time", "hash"):
+                values[key] = float(value)
+            elif key == "tablebases":
+                values[key] = value.lower() in ("1", "true", "yes")
+            else:
+                values[key] = value
+        values.setdefault("name", "engine")
+        return cls(**values)
+
+
+# Κανονες ληξης παρτιδας πριν απο ματ/πατ (οπως στο cutechess: -resign / -draw)
+@dataclass(frozen=True)
+class Adjudication:
+    max_plies: int = 400 # Ισοπαλια μετα απο τοσες μισες κινησεις
+    repetitions: int = 3 # Ισοπαλια οταν η ιδια θεση εμφανιστει τοσες φορες
+    resign_score: int = 1000 # Νικη οταν και οι δυο μηχανες βλεπουν τουλαχιστον τοση διαφορα...
+    resign_moves: int = 3 # ...σε τοσες συνεχομενες κινησεις καθε μια
+    draw_score: int = 10 # Ισοπαλια οταν και οι δυο βλεπουν |τιμη| <= draw_score...
+    draw_moves: int = 8 # ...σε τοσες συνεχομενες κινησεις καθε μια...
+    draw_after: int = 80 # ...μετα απο τοσες μισες κινησεις
+    tablebases: bool = True # Αποτελεσμα απο τα tablebases (αν υπαρχουν) μολις μεινουν λιγα κομματια
+
+
+class Opening(NamedTuple):
+    fen: str
+    moves: list[int]
+
+class GameResult(NamedTuple):
+    index: int # Αυξων αριθμος παρτιδας (απο 0)
+    white: str
+    black: str
+    result: str # "1-0", "0-1", "1/2-1/2"
+    reason: str
+    plies: int
+    pgn: str
+
+
+# --------------------------------------------------------------------- #
+#  Ανοιγματα
+# --------------------------------------------------------------------- #
+# Ανοιγματα απο αρχειο PGN/FEN (οι πρωτες plies κινησεις καθε παρτιδας)
+def load_openings(path: str, plies: int = 8) -> list[Opening]:
+    openings = []
+    for text in iter_game_texts(path):
+        game = parse_game(text)
+        board = BOARD.from_fen(game.start_fen)
+        moves = []
+        for san in game.moves[:plies]:
+            try:
+                move = move_from_san(board, san)
+            except ValueError:
+                break
+            moves.append(move)
+            board.push(move)
+        if board.has_legal_moves(board.turn):
+            openings.append(Opening(game.start_fen, moves))
+    return openings
+
+# Τυχαια ανοιγματα απο την αρχικη θεση (plies τυχαιες νομιμες κινησεις)
+def random_openings(count: int, plies: int = 8, seed: int = 0) -> list[Opening]:
+    rng = random.Random(seed)
+    openings = []
+    while len(openings) < count:
+        board = BOARD.from_fen(STARTING_FEN)
+        moves = []
+        for _ in range(plies):
+            legal = board.generate_legal_moves(board.turn)
+            if not legal:
+                break
+            moves.append(rng.choice(legal))
+            board.push(moves[-1])
+        if board.has_legal_moves(board.turn):
+            openings.append(Opening(STARTING_FEN, moves))
+    return openings
+
+
+# --------------------------------------------------------------------- #
+#  Μια παρτιδα (τρεχει σε διεργασια)
+# --------------------------------------------------------------------- #
+# Οι μηχανες καθε διεργασιας (μια ανα ρυθμιση, ο πινακας μεταθεσεων καθαριζεται σε καθε παρτιδα)
+_engines: dict[EngineConfig, Engine] = {}
+_tablebases = None
+
+def _init_worker():
+    global _tablebases
+    _tablebases = open_tablebases()
+
+def _engine(engine_config: EngineConfig) -> Engine:
+    engine = _engines.get(engine_config)
+    if engine is None:
+        evaluator = None
+        if engine_config.eval:
+            module, _, function = engine_config.eval.partition(":")
+            evaluator = getattr(importlib.import_module(module), function or "evaluate")
+        engine = _engines[engine_config] = Engine(
+            engine_config.depth, engine_config.time, TranspositionTable(engine_config.hash),
+            tablebases=_tablebases if engine_config.tablebases else None,
+            node_limit=engine_config.nodes, evaluator=evaluator,
+        )
+    return engine
+
+def play_game(index: int, opening: Opening, white: EngineConfig, black: EngineConfig,
+              adjudication: Adjudication) -> GameResult:
+    board = BOARD.from_fen(opening.fen)
+    for move in opening.moves:
+        board.push(move)
+    engines = {Color.WHITE: _engine(white), Color.BLACK: _engine(black)}
+    for engine in engines.values():
+        engine.table.clear()
+
+    # Τιμες των τελευταιων κινησεων απο την πλευρα των λευκων
+    scores = []
+    result, reason = None, None
+    while result is None:
+        status = board.status()
+        if status.mate:
+            result, reason = ("0-1" if board.turn is Color.WHITE else "1-0"), "ματ"
+            break
+        if status.stalemate:
+            result, reason = "1/2-1/2", "πατ"
+            break
+        if status.fifty_moves:
+            result, reason = "1/2-1/2", "κανονας 50 κινησεων"
+            break
+        if len(board.history) - len(opening.moves) >= adjudication.max_plies:
+            result, reason = "1/2-1/2", "οριο κινησεων"
+            break
+        if status.repetitions >= adjudication.repetitions:
+            result, reason = "1/2-1/2", "επαναληψη"
+            break
+        if adjudication.tablebases and _tablebases and board.piece_count <= _tablebases.max_pieces:
+            probe = _tablebases.probe(board)
+            if probe is not None:
+                if probe.wdl == 0:
+                    result = "1/2-1/2"
+                else:
+                    result = "1-0" if (probe.wdl > 0) is (board.turn is Color.WHITE) else "0-1"
+                reason = "tablebases"
+                break
+
+        search = engines[board.turn].search(board)
+        board.push(search.best_move)
+        scores.append(search.score if board.turn is Color.BLACK else -search.score)
+
+        result, reason = _adjudicate(scores, len(board.history), adjudication)
+
+    headers = {
+        "Event": "Tournament", "Round": str(index + 1),
+        "White": white.name, "Black": black.name, "Termination": reason,
+    }
+    return GameResult(index, white.name, black.name, result, reason, len(board.history),
+                      game_to_pgn(board, headers, result))
+
+# Παραιτηση ή ισοπαλια απο τις τιμες των μηχανων (None, None αν η παρτιδα συνεχιζεται)
+def _adjudicate(scores: list[int], plies: int, adjudication: Adjudication) -> tuple[Optional[str], Optional[str]]:
+    count = adjudication.resign_moves * 2
+    if len(scores) >= count:
+        recent = scores[-count:]
+        if all(score >= adjudication.resign_score for score in recent):
+            return "1-0", "παραιτηση"
+        if all(score <= -adjudication.resign_score for score in recent):
+            return "0-1", "παραιτηση"
+    count = adjudication.draw_moves * 2
+    if plies >= adjudication.draw_after and len(scores) >= count:
+        if all(abs(score) <= adjudication.draw_score for score in scores[-count:]):
+            return "1/2-1/2", "ισοπαλη θεση"
+    return None, None
+
+def _play_job(job) -> GameResult:
+    return play_game(*job)
+
+
+# --------------------------------------------------------------------- #
+#  Στατιστικα: Elo με περιθωριο 95% και SPRT
+# --------------------------------------------------------------------- #
+def _elo(score: float) -> float:
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+# (διαφορα Elo, περιθωριο ±) για νικες/ισοπαλιες/ηττες του πρωτου παικτη
+def elo_difference(wins: int, draws: int, losses: int) -> tuple[float, float]:
+    games = wins + draws + losses
+    if not games:
+        return 0.0, 0.0
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.959964 * math.sqrt(variance / games)
+    low, high = _elo(score - margin), _elo(score + margin)
+    return _elo(score), (high - low) / 2
+
+# Log-likelihood ratio του SPRT (H0: elo0, H1: elo1) με την κανονικη προσεγγιση του τριωνυμικου μοντελου
+def sprt_llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    games = wins + draws + losses
+    if not wins + losses or not games:
+        return 0.0
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    if variance <= 0:
+        return 0.0
+    expected0 = 1 / (1 + 10 ** (-elo0 / 400))
+    expected1 = 1 / (1 + 10 ** (-elo1 / 400))
+    return games * (expected1 - expected0) * (2 * score - expected0 - expected1) / (2 * variance)
+
+# Ορια του LLR: (κατω: αποδοχη H0, ανω: αποδοχη H1)
+def sprt_bounds(alpha: float, beta: float) -> tuple[float, float]:
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+# --------------------------------------------------------------------- #
+#  Τουρνουα
+# --------------------------------------------------------------------- #
+class Score:
+    def __init__(self, first: str):
+        self.first = first
+        self.wins = self.draws = self.losses = 0
+        self.reasons = Counter()
+        self.decision: Optional[str] = None # "H0" ή "H1" οταν το SPRT περασει ενα απο τα ορια
+
+    def add(self, game: GameResult):
+        self.reasons[game.reason] += 1
+        if game.result == "1/2-1/2":
+            self.draws += 1
+        elif (game.result == "1-0") is (game.white == self.first):
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+# Καθε ανοιγμα παιζεται δυο φορες, με αλλαγη χρωματων
+def _jobs(first: EngineConfig, second: EngineConfig, openings: list[Opening], games: int,
+          adjudication: Adjudication) -> Iterator[tuple]:
+    for index in range(games):
+        opening = openings[(index // 2) % len(openings)]
+        white, black = (first, second) if index % 2 == 0 else (second, first)
+        yield index, opening, white, black, adjudication
+
+def run_tournament(first: EngineConfig, second: EngineConfig, openings: list[Opening], games: int,
+                   adjudication: Adjudication = Adjudication(), workers: Optional[int] = None,
+                   pgn_path: Optional[str] = None, sprt: Optional[tuple[float, float, float, float]] = None,
+                   on_game=None) -> Score:
+    workers = workers or config.search_workers
+    score = Score(first.name)
+    bounds = sprt_bounds(sprt[2], sprt[3]) if sprt else None
+    output = open(pgn_path, "a", encoding="utf-8") if pgn_path else None
+    jobs = _jobs(first, second, openings, games, adjudication)
+    try:
+        with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn"), initializer=_init_worker) as pool:
+            # Λιγες παρτιδες "στον αερα" (οπως στο pgn.replay), ωστε το SPRT να σταματαει γρηγορα
+            pending = set()
+            finished = False
+            while not finished or pending:
+                while not finished and len(pending) < workers * 2:
+                    job = next(jobs, None)
+                    if job is None:
+                        finished = True
+                    else:
+                        pending.add(pool.submit(_play_job, job))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.cancelled():
+                        continue
+                    game = future.result()
+                    score.add(game)
+                    if output:
+                        output.write(game.pgn + "\n")
+                        output.flush()
+                    if on_game:
+                        on_game(game, score)
+                    # Το SPRT ελεγχεται μετα απο καθε παρτιδα μεχρι να παρθει αποφαση, και οταν δεν εχουν μεινει
+                    # αλλες παρτιδες να ξεκινησουν (το οριο μπορει να περαστει στις τελευταιες)
+                    if bounds and score.decision is None:
+                        llr = sprt_llr(score.wins, score.draws, score.losses, sprt[0], sprt[1])
+                        if not bounds[0] < llr < bounds[1]:
+                            # Αποφαση: οι παρτιδες που δεν ξεκινησαν ακυρωνονται, αυτες που παιζονται ολοκληρωνονται
+                            # (και καταγραφονται, χωρις να αλλαζουν την αποφαση)
+                            score.decision = "H1" if llr >= bounds[1] else "H0"
+                            finished = True
+                            for other in pending:
+                                other.cancel()
+    finally:
+        if output:
+            output.close()
+    return score
+
+
+# --------------------------------------------------------------------- #
+#  python tournament.py --engine name=base depth=3 --engine name=new depth=4 \
+#      --games 200 --openings openings.pgn --pgn games.pgn --sprt 0 10
+# --------------------------------------------------------------------- #
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Τουρνουα μεταξυ δυο ρυθμισεων της μηχανης")
+    parser.add_argument("--engine", nargs="+", action="append", required=True, metavar="KEY=VALUE",
+                        help="name, depth, time, nodes, hash, eval (module:function), tablebases (δυο φορες)")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--openings", help="Αρχειο PGN/FEN με ανοιγματα (αλλιως τυχαια ανοιγματα)")
+    parser.add_argument("--opening-plies", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=config.search_workers)
+    parser.add_argument("--pgn", help="Αρχειο οπου προστιθενται οι παρτιδες μολις τελειωσουν")
+    parser.add_argument("--max-plies", type=int, default=Adjudication.max_plies)
+    parser.add_argument("--no-tablebases", action="store_true", help="Χωρις ληξη απο τα tablebases")
+    parser.add_argument("--sprt", nargs=2, type=float, metavar=("ELO0", "ELO1"))
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    if len(args.engine) != 2:
+        parser.error("Χρειαζονται ακριβως δυο --engine")
+    first, second = (EngineConfig.parse(items) for items in args.engine)
+    if first.name == second.name:
+        second = replace(second, name=second.name + "-2")
+
+    if args.openings:
+        openings = load_openings(args.openings, args.opening_plies)
+    else:
+        openings = random_openings((args.games + 1) // 2, args.opening_plies, args.seed)
+    if not openings:
+        parser.error("Δεν βρεθηκαν ανοιγματα")
+    adjudication = Adjudication(max_plies=args.max_plies, tablebases=not args.no_tablebases)
+    sprt = (args.sprt[0], args.sprt[1], args.alpha, args.beta) if args.sprt else None
+
+    start = time.perf_counter()
+
+    def report(game: GameResult, score: Score):
+        elo, margin = elo_difference(score.wins, score.draws, score.losses)
+        line = (f"Παρτιδα {game.index + 1:4d}: {game.white} - {game.black} {game.result:7s} ({game.reason})  "
+                f"{score.first}: +{score.wins} ={score.draws} -{score.losses}  Elo {elo:+.1f} ± {margin:.1f}")
+        if sprt:
+            line += f"  LLR {sprt_llr(score.wins, score.draws, score.losses, sprt[0], sprt[1]):+.2f}"
+        print(line, flush=True)
+
+    score = run_tournament(first, second, openings, args.games, adjudication, args.workers, args.pgn, sprt, report)
+
+    elapsed = time.perf_counter() - start
+    elo, margin = elo_difference(score.wins, score.draws, score.losses)
+    print(f"\n{first.name} - {second.name}: +{score.wins} ={score.draws} -{score.losses} ({score.games} παρτιδες)")
+    print(f"Elo {elo:+.1f} ± {margin:.1f} (95%)")
+    print("Ληξη: " + ", ".join(f"{reason} {count}" for reason, count in score.reasons.most_common()))
+    print(f"{score.games / elapsed * 60:.1f} παρτιδες/λεπτο με {args.workers} διεργασιες")
+    if sprt:
+        llr = sprt_llr(score.wins, score.draws, score.losses, sprt[0], sprt[1])
+        low, high = sprt_bounds(args.alpha, args.beta)
+        verdict = {"H1": "H1 (βελτιωση)", "H0": "H0 (χωρις βελτιωση)", None: "χωρις αποφαση"}[score.decision]
+        print(f"SPRT [{sprt[0]:g}, {sprt[1]:g}]: LLR {llr:+.2f} ({low:+.2f}, {high:+.2f}) -> {verdict}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
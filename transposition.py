@@ -0,0 +1,98 @@
+from typing import NamedTuple, Optional
+
+import config
+
+# Ειδος τιμης που αποθηκευεται (για alpha-beta)
+EXACT = 0 # Ακριβης τιμη
+LOWER = 1 # Κατω οριο (η αναζητηση εκοψε με beta cutoff)
+UPPER = 2 # Ανω οριο (καμια κινηση δεν ξεπερασε το alpha)
+
+# Εκτιμωμενη μνημη (bytes) μιας εγγραφης στην Python (tuple + ακεραιοι + θεση στη λιστα)
+ENTRY_BYTES = 128
+
+
+# --------------------------------------------------------------------- #
+#  Εγγραφη του πινακα
+# --------------------------------------------------------------------- #
+class Entry(NamedTuple):
+    key: int # Πληρες κλειδι Zobrist (για ελεγχο συγκρουσεων)
+    depth: int # Βαθος αναζητησης που παρηγαγε την τιμη
+    score: int # Τιμη (αξιολογηση, πληθος κομβων perft κλπ)
+    flag: int # EXACT / LOWER / UPPER
+    move: Optional[int] # Καλυτερη κινηση (ή None)
+    age: int # Γενια αναζητησης στην οποια αποθηκευτηκε
+
+
+# --------------------------------------------------------------------- #
+#  Πινακας μεταθεσεων σταθερου μεγεθους
+#  Οι θεσεις επιλεγονται απο τα χαμηλα bits του κλειδιου. Πολιτικες αντικαταστασης:
+#  "depth": κραταει την εγγραφη με το μεγαλυτερο βαθος, εκτος αν ειναι απο παλιοτερη γενια
+#  "always": η νεα εγγραφη αντικαθιστα παντα την παλια
+# --------------------------------------------------------------------- #
+class TranspositionTable:
+    def __init__(self, size_mb: float = None, replacement: str = None):
+        size_mb = config.tt_size_mb if size_mb is None else size_mb
+        self.replacement = replacement or config.tt_replacement
+        if self.replacement not in ("depth", "always"):
+            raise ValueError(f"Αγνωστη πολιτικη αντικαταστασης: {self.replacement!r}")
+
+        # Μεγαλυτερη δυναμη του 2 που χωραει στο οριο μνημης
+        slots = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.size = 1 << (slots.bit_length() - 1)
+        self.mask = self.size - 1
+        self.entries: list[Optional[Entry]] = [None] * self.size
+
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    # Νεα αναζητηση: οι παλιες εγγραφες γινονται πρωτες υποψηφιες για αντικατασταση
+    def new_search(self):
+        self.age = (self.age + 1) & 0xFF
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.age = 0
+        self.hits = self.misses = self.stores = self.overwrites = 0
+
+    # Επιστρεφει την εγγραφη της θεσης (ή None)
+    def probe(self, key: int) -> Optional[Entry]:
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, score: int, flag: int = EXACT, move: Optional[int] = None):
+        index = key & self.mask
+        old = self.entries[index]
+        if old is not None and old.key != key:
+            # Με "depth" κραταμε μια βαθυτερη εγγραφη αλλης θεσης, αν ειναι απο την τρεχουσα αναζητηση
+            if self.replacement == "depth" and old.age == self.age and old.depth > depth:
+                return
+            self.overwrites += 1
+        elif old is not None and move is None:
+            # Ιδια θεση χωρις νεα κινηση: κραταμε την παλια καλυτερη κινηση
+            move = old.move
+        self.entries[index] = Entry(key, depth, score, flag, move, self.age)
+        self.stores += 1
+
+    # Ποσοστο (στα χιλια) των θεσεων του πινακα που ειναι γεματες, απο δειγμα των πρωτων θεσεων
+    def hashfull(self) -> int:
+        sample = self.entries[:1000]
+        return sum(1 for entry in sample if entry is not None and entry.age == self.age) * 1000 // len(sample)
+
+    def stats(self) -> dict:
+        probes = self.hits + self.misses
+        return {
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "hashfull": self.hashfull(),
+        }
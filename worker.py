@@ -0,0 +1,91 @@
+import multiprocessing as mp
+import queue
+from typing import Optional
+
+import config
+from board import Board
+from bitboard import BitBoard
+from engine import Engine
+from book import open_book
+from tablebase import open_tablebases
+from transposition import TranspositionTable
+
+# Κλαση σκακιερας που χρησιμοποιει η διεργασια της μηχανης
+BOARD = BitBoard if config.board_backend == "bitboard" else Board
+
+
+# --------------------------------------------------------------------- #
+#  Κυριος βροχος της διεργασιας: περιμενει αιτηματα αναζητησης και
+#  στελνει την προοδο (("info", id, SearchResult)) και το αποτελεσμα
+#  (("done", id, SearchResult)) στην ουρα results
+# --------------------------------------------------------------------- #
+def _worker_main(requests, results, current, table_mb):
+    engine = Engine(table=TranspositionTable(table_mb), book=open_book(), tablebases=open_tablebases())
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        search_id, snapshot, max_depth, time_limit, use_book = request
+
+        board = BOARD.from_snapshot(snapshot)
+
+        # Αιτημα που ακυρωθηκε πριν ξεκινησει (π.χ. stop οσο φορτωνονται βιβλιο και tablebases): το GUI
+        # μπορει ακομη να περιμενει το "done", αρα στελνεται αποτελεσμα απο αναζητηση βαθους 1
+        if current.value != search_id:
+            engine.should_stop = None
+            results.put(("done", search_id, engine.search(board, 1, use_book=use_book)))
+            continue
+
+        # Η αναζητηση σταματα μολις το GUI ξεκινησει αλλη ή ζητησει διακοπη
+        engine.should_stop = lambda: current.value != search_id
+        result = engine.search(board, max_depth, time_limit,
+                               on_info=lambda info: results.put(("info", search_id, info)), use_book=use_book)
+        results.put(("done", search_id, result))
+
+
+# --------------------------------------------------------------------- #
+#  EngineWorker: η μηχανη τρεχει σε ξεχωριστη διεργασια ωστε το GUI
+#  να μην "παγωνει" (και να μην την επιβραδυνει το GIL)
+# --------------------------------------------------------------------- #
+class EngineWorker:
+    def __init__(self, table_mb: float = None):
+        ctx = mp.get_context("spawn")
+        self.requests = ctx.Queue()
+        self.results = ctx.Queue()
+
+        # Ταυτοτητα της αναζητησης που επιτρεπεται να τρεχει (οτιδηποτε αλλο διακοπτεται)
+        self.current = ctx.Value("i", 0, lock=False)
+        self.search_id = 0
+
+        table_mb = config.tt_size_mb if table_mb is None else table_mb
+        self.process = ctx.Process(target=_worker_main, args=(self.requests, self.results, self.current, table_mb), daemon=True)
+        self.process.start()
+
+    # Ξεκιναει αναζητηση για τη θεση της board και επιστρεφει την ταυτοτητα της
+    # (η θεση στελνεται συμπαγως με τη Board.snapshot). use_book: πρωτα το βιβλιο ανοιγματων
+    def start(self, board: Board, max_depth: Optional[int] = None, time_limit: Optional[float] = None,
+              use_book: bool = False) -> int:
+        self.search_id += 1
+        self.current.value = self.search_id
+        self.requests.put((self.search_id, board.snapshot(), max_depth, time_limit, use_book))
+        return self.search_id
+
+    # Διακοπη της αναζητησης που τρεχει (στελνει "done" με την καλυτερη κινηση μεχρι τωρα)
+    def stop(self):
+        self.current.value = 0
+
+    # Μηνυματα που εχουν φτασει απο τη διεργασια (χωρις αναμονη)
+    def poll(self) -> list:
+        messages = []
+        while True:
+            try:
+                messages.append(self.results.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def close(self):
+        self.stop()
+        self.requests.put(None)
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
@@ -0,0 +1,20 @@
+import random
+
+# --------------------------------------------------------------------- #
+#  Τυχαιοι αριθμοι Zobrist (64 bit)
+#  Η γεννητρια εχει σταθερο seed ωστε τα κλειδια να ειναι ιδια σε καθε
+#  εκτελεση και διεργασια (απαραιτητο για αρχεια που αποθηκευουν κλειδια)
+# --------------------------------------------------------------------- #
+_rng = random.Random(0x5EED_C4E55)
+
+# Ενας αριθμος για καθε κομματι (δεικτης απο board.PIECE_INDEX) σε καθε τετραγωνο
+PIECE_KEYS = [[_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+
+# Προστιθεται οταν παιζουν τα μαυρα
+TURN_KEY = _rng.getrandbits(64)
+
+# Ενας αριθμος για καθε συνδυασμο δικαιωματων ροκε (4 bits) - μηδεν χωρις δικαιωματα
+CASTLING_KEYS = [0] + [_rng.getrandbits(64) for _ in range(15)]
+
+# Ενας αριθμος για καθε στηλη του τετραγωνου en passant
+EN_PASSANT_KEYS = [_rng.getrandbits(64) for _ in range(8)]